@@ -0,0 +1,105 @@
+from typing import List
+
+import numpy as np
+from ultralytics.engine.results import Boxes
+from ultralytics.trackers.byte_tracker import BYTETracker
+from ultralytics.utils import IterableSimpleNamespace, yaml_load
+from ultralytics.utils.checks import check_yaml
+
+from src.adapters.native_track_adapter import BatchedDetector
+from src.models.data_models import DetectionBatch
+from src.setup.config import ModelConfig
+from src.utils.geometry import calcular_iou_matriz
+
+
+class CascadeTrackAdapter:
+    """
+    Cascata de dois detectores alimentando um único tracker (ByteTrack).
+
+    O modelo leve roda em todo frame; o pesado (MODELO_YOLO) roda a cada
+    CASCADE_HEAVY_INTERVAL frames, quando o leve tem baixa confiança ou quando
+    surge um objeto que não corresponde a nenhum track ativo. Nesses frames as
+    detecções do pesado substituem as do leve que se sobrepõem a elas.
+
+    Mesma interface de TrackZoneAdapter: track(frame) -> DetectionBatch.
+    """
+
+    def __init__(self, light_model, heavy_model, region: List[List[int]], model_config: ModelConfig, fps: float):
+        self.light_detector = BatchedDetector(light_model, region, model_config)
+        self.heavy_detector = BatchedDetector(heavy_model, region, model_config)
+        self.model = heavy_model
+        self.config = model_config
+
+        tracker_args = IterableSimpleNamespace(**yaml_load(check_yaml('bytetrack.yaml')))
+        self.tracker = BYTETracker(tracker_args, frame_rate=max(1, int(round(fps))))
+
+        self.track_id_offset = 0
+        self.max_track_id = 0
+        self.model_names = getattr(self.model, 'names', {})
+        if not self.model_names:
+            raise ValueError("O modelo YOLO carregado não contém o atributo 'names' com os nomes das classes. Verifique se o arquivo do modelo está correto e completo.")
+
+        self._frames_since_heavy = None
+        self._last_boxes = np.empty((0, 4), dtype=np.float32)
+
+        self.total_frames = 0
+        self.heavy_frames = 0
+        self.heavy_reasons = {'periodic': 0, 'low_conf': 0, 'new_object': 0}
+
+    def _heavy_reason(self, light: np.ndarray):
+        if self._frames_since_heavy is None or self._frames_since_heavy + 1 >= self.config.CASCADE_HEAVY_INTERVAL:
+            return 'periodic'
+        if len(light) and light[:, 4].min() < self.config.CASCADE_LOW_CONF:
+            return 'low_conf'
+        if len(light):
+            if not len(self._last_boxes):
+                return 'new_object'
+            max_iou = calcular_iou_matriz(light[:, :4], self._last_boxes).max(axis=1)
+            if (max_iou < self.config.CASCADE_NEW_TRACK_IOU).any():
+                return 'new_object'
+        return None
+
+    def _fuse(self, heavy: np.ndarray, light: np.ndarray) -> np.ndarray:
+        if not len(heavy) or not len(light):
+            return heavy if len(heavy) else light
+        # Mantém do leve apenas o que o pesado não detectou
+        overlap = calcular_iou_matriz(light[:, :4], heavy[:, :4]).max(axis=1)
+        return np.concatenate([heavy, light[overlap < self.config.CASCADE_FUSION_IOU]])
+
+    def track(self, frame) -> DetectionBatch:
+        detections = self.light_detector.detect(frame)
+
+        reason = self._heavy_reason(detections)
+        self.total_frames += 1
+        if reason:
+            detections = self._fuse(self.heavy_detector.detect(frame), detections)
+            self.heavy_frames += 1
+            self.heavy_reasons[reason] += 1
+            self._frames_since_heavy = 0
+        else:
+            self._frames_since_heavy += 1
+
+        # Linhas [x1, y1, x2, y2, id, conf, cls, idx]
+        tracks = np.asarray(self.tracker.update(Boxes(detections, frame.shape[:2]), frame), dtype=np.float32)
+        if tracks.size == 0:
+            tracks = tracks.reshape(0, 8)
+        self._last_boxes = tracks[:, :4].copy()
+
+        track_ids = tracks[:, 4].astype(np.int64) + self.track_id_offset
+        if len(track_ids):
+            self.max_track_id = max(self.max_track_id, int(track_ids.max()))
+        return DetectionBatch.from_arrays(
+            track_ids=track_ids,
+            boxes=tracks[:, :4],
+            class_ids=tracks[:, 6],
+            confs=tracks[:, 5],
+            class_names=self.model_names
+        )
+
+    def get_stats(self) -> dict:
+        return {
+            'total_frames': self.total_frames,
+            'heavy_frames': self.heavy_frames,
+            'heavy_ratio': self.heavy_frames / self.total_frames if self.total_frames else 0.0,
+            'heavy_reasons': dict(self.heavy_reasons)
+        }
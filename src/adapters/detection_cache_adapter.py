@@ -0,0 +1,213 @@
+import bisect
+import hashlib
+import json
+import os
+import shutil
+from dataclasses import asdict
+from typing import List
+
+import numpy as np
+
+from src.models.data_models import DetectionBatch
+from src.setup.config import AppConfig
+from src.utils.filesystem import calcular_hash_arquivo
+
+META_FILENAME = "meta.json"
+CACHE_FORMAT_VERSION = 2
+FRAMES_PER_CHUNK = 1000
+VIDEO_HASH_SAMPLE_BYTES = 16 * 1024 * 1024
+
+
+def build_detection_cache_key(app_config: AppConfig) -> str:
+    """Chave do cache: tudo o que altera a saída do detector/tracker, e nada além disso."""
+    model_config = app_config.MODEL_CONFIG
+    general_config = app_config.GENERAL_CONFIG
+    image_config = app_config.IMAGE_PROCESSING_CONFIG
+    motion_config = app_config.MOTION_GATE_CONFIG
+
+    parametros = {
+        'version': CACHE_FORMAT_VERSION,
+        'video': calcular_hash_arquivo(app_config.IO_CONFIG.VIDEO_INPUT, VIDEO_HASH_SAMPLE_BYTES),
+        'model': calcular_hash_arquivo(model_config.MODELO_YOLO),
+        'backend': model_config.INFERENCE_BACKEND,
+        'imgsz': model_config.INFERENCE_IMGSZ,
+        'cascade': {
+            'light_model': calcular_hash_arquivo(model_config.CASCADE_LIGHT_MODEL),
+            'heavy_interval': model_config.CASCADE_HEAVY_INTERVAL,
+            'low_conf': model_config.CASCADE_LOW_CONF,
+            'new_track_iou': model_config.CASCADE_NEW_TRACK_IOU,
+            'fusion_iou': model_config.CASCADE_FUSION_IOU,
+        } if model_config.CASCADE_LIGHT_MODEL else None,
+        'tracker': {
+            'engine': model_config.TRACKER_ENGINE,
+            'low_conf': model_config.NATIVE_TRACK_LOW_CONF,
+            'match_iou': model_config.NATIVE_MATCH_IOU,
+            'track_buffer': model_config.NATIVE_TRACK_BUFFER,
+        } if model_config.TRACKER_ENGINE == 'native' else None,
+        'conf': model_config.TRACKZONE_CONF,
+        'iou': model_config.TRACKZONE_IOU,
+        'classes': model_config.TRACKZONE_CLASSES,
+        'region': app_config.GEOMETRY_CONFIG.REGIAO_1,
+        'resize_width': general_config.INFERENCE_RESIZE_WIDTH,
+        'stride': general_config.DETECTION_STRIDE,
+        'crop_margin': general_config.INFERENCE_CROP_MARGIN if general_config.INFERENCE_CROP_TO_REGION else None,
+        'preprocessing': asdict(image_config) if image_config.ENABLE_PREPROCESSING else None,
+        'motion_gate': asdict(motion_config) if motion_config.ENABLE_MOTION_GATE else None,
+    }
+    serializado = json.dumps(parametros, sort_keys=True, default=str)
+    return hashlib.sha256(serializado.encode()).hexdigest()[:24]
+
+
+def is_cache_complete(cache_dir: str) -> bool:
+    meta_path = os.path.join(cache_dir, META_FILENAME)
+    if not os.path.exists(meta_path):
+        return False
+    with open(meta_path, 'r') as f:
+        return bool(json.load(f).get('complete'))
+
+
+class DetectionCacheWriter:
+    """Grava a saída do tracker (coordenadas de inferência) em blocos .npz."""
+
+    def __init__(self, cache_dir: str, key: str):
+        self.cache_dir = cache_dir
+        self.key = key
+        self.complete = False
+        self.closed = False
+
+        if os.path.exists(cache_dir):
+            shutil.rmtree(cache_dir)
+        os.makedirs(cache_dir)
+
+        self.class_names: List[str] = []
+        self._class_index = {}
+        self.chunks: List[dict] = []
+        self.total_detections = 0
+        self._reset_chunk()
+
+    def _reset_chunk(self) -> None:
+        self._frame_ids = []
+        self._counts = []
+        self._track_ids = []
+        self._boxes = []
+        self._class_ids = []
+        self._confs = []
+
+    def record(self, frame_id: int, detections: DetectionBatch) -> None:
+        self._frame_ids.append(frame_id)
+        self._counts.append(len(detections))
+
+        if len(detections):
+            # IDs de classe do modelo -> índices estáveis em class_names do cache
+            class_ids = np.empty(len(detections), dtype=np.int16)
+            for class_id in np.unique(detections.class_ids):
+                name = detections.class_name(class_id)
+                if name not in self._class_index:
+                    self._class_index[name] = len(self.class_names)
+                    self.class_names.append(name)
+                class_ids[detections.class_ids == class_id] = self._class_index[name]
+
+            self._track_ids.append(detections.track_ids)
+            self._boxes.append(detections.boxes)
+            self._class_ids.append(class_ids)
+            self._confs.append(detections.confs)
+
+        if len(self._frame_ids) >= FRAMES_PER_CHUNK:
+            self._write_chunk()
+
+    @staticmethod
+    def _concat(arrays: List[np.ndarray], dtype) -> np.ndarray:
+        if not arrays:
+            return np.empty(0, dtype=dtype)
+        return np.concatenate(arrays).astype(dtype, copy=False)
+
+    def _write_chunk(self) -> None:
+        if not self._frame_ids:
+            return
+
+        filename = f"chunk_{len(self.chunks):05d}.npz"
+        np.savez(
+            os.path.join(self.cache_dir, filename),
+            frame_ids=np.asarray(self._frame_ids, dtype=np.int64),
+            offsets=np.concatenate(([0], np.cumsum(self._counts))).astype(np.int64),
+            track_ids=self._concat(self._track_ids, np.int64),
+            boxes=self._concat(self._boxes, np.float32).reshape(-1, 4),
+            class_ids=self._concat(self._class_ids, np.int16),
+            confs=self._concat(self._confs, np.float32)
+        )
+        self.chunks.append({
+            'file': filename,
+            'first_frame': int(self._frame_ids[0]),
+            'last_frame': int(self._frame_ids[-1])
+        })
+        self.total_detections += int(sum(self._counts))
+        self._reset_chunk()
+
+    def mark_complete(self) -> None:
+        self.complete = True
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self._write_chunk()
+
+        meta = {
+            'version': CACHE_FORMAT_VERSION,
+            'key': self.key,
+            'complete': self.complete,
+            'class_names': self.class_names,
+            'chunks': self.chunks,
+            'total_detections': self.total_detections
+        }
+        with open(os.path.join(self.cache_dir, META_FILENAME), 'w') as f:
+            json.dump(meta, f, indent=2)
+        self.closed = True
+
+        estado = "completo" if self.complete else "incompleto (será regravado)"
+        print(f"💾 Cache de detecções {estado}: {self.cache_dir} ({self.total_detections} detecções)")
+
+
+class DetectionCacheReader:
+    """Reproduz detecções gravadas por DetectionCacheWriter, frame a frame."""
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        with open(os.path.join(cache_dir, META_FILENAME), 'r') as f:
+            meta = json.load(f)
+
+        if not meta.get('complete'):
+            raise ValueError(f"Cache de detecções incompleto: {cache_dir}")
+
+        self.class_names: List[str] = meta['class_names']
+        self.chunks: List[dict] = meta['chunks']
+        self._first_frames = [chunk['first_frame'] for chunk in self.chunks]
+        self._loaded_index = None
+        self._loaded = None
+
+    def _load_chunk(self, index: int) -> None:
+        if self._loaded_index == index:
+            return
+        with np.load(os.path.join(self.cache_dir, self.chunks[index]['file'])) as data:
+            self._loaded = {name: data[name] for name in data.files}
+        self._loaded_index = index
+
+    def read(self, frame_id: int) -> DetectionBatch:
+        class_names = dict(enumerate(self.class_names))
+        index = bisect.bisect_right(self._first_frames, frame_id) - 1
+        if index < 0 or frame_id > self.chunks[index]['last_frame']:
+            return DetectionBatch.empty(class_names)
+
+        self._load_chunk(index)
+        frame_ids = self._loaded['frame_ids']
+        pos = int(np.searchsorted(frame_ids, frame_id))
+        if pos >= len(frame_ids) or frame_ids[pos] != frame_id:
+            return DetectionBatch.empty(class_names)
+
+        inicio, fim = self._loaded['offsets'][pos], self._loaded['offsets'][pos + 1]
+        return DetectionBatch.from_arrays(
+            track_ids=self._loaded['track_ids'][inicio:fim],
+            boxes=self._loaded['boxes'][inicio:fim],
+            class_ids=self._loaded['class_ids'][inicio:fim],
+            confs=self._loaded['confs'][inicio:fim],
+            class_names=class_names
+        )
@@ -1,51 +1,195 @@
 import cv2
 import numpy as np
-from typing import Iterator, Tuple
+import queue
+import threading
+import time
+from typing import Iterator, Optional, Tuple
+
+# Sentinela enviada pela thread de decodificação ao fim do vídeo
+_FIM_DO_VIDEO = object()
+
 
 class VideoInputAdapter:
-    
-    def __init__(self, video_path: str):
+
+    def __init__(
+        self,
+        video_path: str,
+        prefetch_size: int = 0,
+        start_frame: int = 0,
+        end_frame: Optional[int] = None
+    ):
         self.video_path = video_path
         self.cap = cv2.VideoCapture(video_path)
-        
+
         if not self.cap.isOpened():
             raise IOError(f"Erro ao abrir vídeo: {video_path}")
-        
+
+        if prefetch_size < 0:
+            raise ValueError(f"prefetch_size deve ser >= 0, recebido: {prefetch_size}")
+
         self.width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
         self.height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
         self.fps = self.cap.get(cv2.CAP_PROP_FPS)
         self.total_frames = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        
+
         if self.fps <= 0:
             self.cap.release()
             raise ValueError(
                 f"FPS inválido ({self.fps}) no vídeo '{video_path}'. "
                 "O arquivo pode estar corrompido."
             )
-        
-        self._frame_count = 0
-    
+
+        if start_frame < 0 or (end_frame is not None and end_frame <= start_frame):
+            self.cap.release()
+            raise ValueError(f"Intervalo de frames inválido: [{start_frame}, {end_frame})")
+
+        # 0 = leitura síncrona; > 0 = profundidade da fila de read-ahead
+        self.prefetch_size = prefetch_size
+        # Intervalo [start_frame, end_frame) a ser lido; IDs de frame são absolutos
+        self.start_frame = start_frame
+        self.end_frame = end_frame
+        self._frame_count = start_frame
+
+        self._decoder_thread = None
+        self._stop_event = threading.Event()
+        self._decoder_error = None
+        self._reset_stats()
+
+    def _reset_stats(self) -> None:
+        self._decoded_frames = 0
+        self._decode_time = 0.0
+        self._wait_time = 0.0
+        self._queue_samples = 0
+        self._queue_occupancy_sum = 0
+        self._queue_occupancy_max = 0
+
+    def _read_frame(self):
+        inicio = time.perf_counter()
+        success, frame = self.cap.read()
+        self._decode_time += time.perf_counter() - inicio
+        if success:
+            self._decoded_frames += 1
+        return success, frame
+
+    def _seek_start(self) -> None:
+        if self.start_frame > 0:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, self.start_frame)
+        elif self.cap.get(cv2.CAP_PROP_POS_FRAMES) > 0:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+
+    def _frames_remaining(self, frames_lidos: int) -> bool:
+        if self.end_frame is None:
+            return True
+        return self.start_frame + frames_lidos < self.end_frame
+
     def __iter__(self) -> Iterator[Tuple[int, np.ndarray]]:
-        self._frame_count = 0
-        
-        while True:
-            success, frame = self.cap.read()
-            
+        self._frame_count = self.start_frame
+        self._reset_stats()
+        self._seek_start()
+
+        if self.prefetch_size > 0:
+            yield from self._iter_prefetch()
+            return
+
+        while self._frames_remaining(self._decoded_frames):
+            success, frame = self._read_frame()
+
             if not success:
                 break
-            
+
             yield self._frame_count, frame
             self._frame_count += 1
-    
+
+    def _iter_prefetch(self) -> Iterator[Tuple[int, np.ndarray]]:
+        fila = queue.Queue(maxsize=self.prefetch_size)
+        self._stop_event.clear()
+        self._decoder_error = None
+
+        self._decoder_thread = threading.Thread(
+            target=self._decode_loop, args=(fila,),
+            name="VideoInputDecoder", daemon=True
+        )
+        self._decoder_thread.start()
+
+        try:
+            while True:
+                ocupacao = fila.qsize()
+                self._queue_samples += 1
+                self._queue_occupancy_sum += ocupacao
+                self._queue_occupancy_max = max(self._queue_occupancy_max, ocupacao)
+
+                inicio = time.perf_counter()
+                frame = fila.get()
+                self._wait_time += time.perf_counter() - inicio
+
+                if frame is _FIM_DO_VIDEO:
+                    break
+
+                yield self._frame_count, frame
+                self._frame_count += 1
+
+            if self._decoder_error is not None:
+                raise IOError(
+                    f"Erro na decodificação de '{self.video_path}': {self._decoder_error}"
+                ) from self._decoder_error
+        finally:
+            self._stop_decoder()
+
+    def _decode_loop(self, fila: queue.Queue) -> None:
+        try:
+            while not self._stop_event.is_set() and self._frames_remaining(self._decoded_frames):
+                success, frame = self._read_frame()
+                if not success:
+                    break
+                # Back-pressure: bloqueia enquanto a fila estiver cheia
+                if not self._put(fila, frame):
+                    return
+        except Exception as e:
+            self._decoder_error = e
+        self._put(fila, _FIM_DO_VIDEO)
+
+    def _put(self, fila: queue.Queue, item) -> bool:
+        while not self._stop_event.is_set():
+            try:
+                fila.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _stop_decoder(self) -> None:
+        if self._decoder_thread is None:
+            return
+        self._stop_event.set()
+        self._decoder_thread.join()
+        self._decoder_thread = None
+
     def get_properties(self) -> dict:
         return {
             'width': self.width,
             'height': self.height,
             'fps': self.fps,
-            'total_frames': self.total_frames
+            'total_frames': self.total_frames,
+            'start_frame': self.start_frame,
+            'end_frame': self.end_frame if self.end_frame is not None else self.total_frames
         }
-    
+
+    def get_stats(self) -> dict:
+        decoded = self._decoded_frames
+        samples = self._queue_samples
+        return {
+            'prefetch_size': self.prefetch_size,
+            'decoded_frames': decoded,
+            'decode_time_s': self._decode_time,
+            'decode_ms_per_frame': (self._decode_time / decoded * 1000) if decoded else 0.0,
+            'consumer_wait_s': self._wait_time,
+            'queue_occupancy_avg': (self._queue_occupancy_sum / samples) if samples else 0.0,
+            'queue_occupancy_max': self._queue_occupancy_max
+        }
+
     def close(self) -> None:
+        # A thread de decodificação precisa parar antes de liberar o VideoCapture
+        self._stop_decoder()
         if self.cap:
             self.cap.release()
-            print(f"📹 VideoCapture fechado: {self.video_path}")
\ No newline at end of file
+            print(f"📹 VideoCapture fechado: {self.video_path}")
@@ -0,0 +1,90 @@
+from typing import List, Optional
+
+import cv2
+import numpy as np
+
+from src.models.data_models import DetectionBatch
+from src.pipelines.byte_tracker import ByteTracker
+from src.setup.config import ModelConfig
+
+
+class BatchedDetector:
+    """Executa o YOLO (somente detecção) sobre lotes de frames mascarados pela região."""
+
+    def __init__(self, model, region: List[List[int]], model_config: ModelConfig, conf: Optional[float] = None):
+        self.model = model
+        self.region = np.array(region, dtype=np.int32)
+        self.config = model_config
+        self.conf = model_config.TRACKZONE_CONF if conf is None else conf
+        self._mask = None
+
+    def _masked(self, frame: np.ndarray) -> np.ndarray:
+        # Mesmo recorte do TrackZone: apenas o interior da região chega ao detector
+        if self._mask is None or self._mask.shape != frame.shape[:2]:
+            self._mask = np.zeros(frame.shape[:2], dtype=np.uint8)
+            cv2.fillPoly(self._mask, [self.region], 255)
+        return cv2.bitwise_and(frame, frame, mask=self._mask)
+
+    def detect_batch(self, frames: List[np.ndarray]) -> List[np.ndarray]:
+        """Detecções (N, 6) [x1, y1, x2, y2, conf, cls] de cada frame, numa única passada."""
+        if not frames:
+            return []
+        results = self.model.predict(
+            [self._masked(frame) for frame in frames],
+            conf=self.conf,
+            iou=self.config.TRACKZONE_IOU,
+            classes=self.config.TRACKZONE_CLASSES,
+            device=self.config.TRACKZONE_DEVICE,
+            verbose=False
+        )
+        return [r.boxes.data.cpu().numpy().astype(np.float32).reshape(-1, 6) for r in results]
+
+    def detect(self, frame: np.ndarray) -> np.ndarray:
+        return self.detect_batch([frame])[0]
+
+
+class NativeTrackAdapter:
+    """
+    Detector em lote + ByteTracker do projeto, com a interface de TrackZoneAdapter.
+
+    track_batch() envia B frames ao modelo numa passada e atualiza o tracker
+    frame a frame, em ordem.
+    """
+
+    def __init__(self, model, region: List[List[int]], model_config: ModelConfig):
+        self.model = model
+        # O tracker usa as detecções de baixa confiança na segunda etapa de associação
+        self.detector = BatchedDetector(model, region, model_config, conf=model_config.NATIVE_TRACK_LOW_CONF)
+        self.tracker = ByteTracker(
+            high_conf=model_config.TRACKZONE_CONF,
+            low_conf=model_config.NATIVE_TRACK_LOW_CONF,
+            match_iou=model_config.NATIVE_MATCH_IOU,
+            track_buffer=model_config.NATIVE_TRACK_BUFFER
+        )
+
+        self.track_id_offset = 0
+        self.max_track_id = 0
+        self.model_names = getattr(self.model, 'names', {})
+        if not self.model_names:
+            raise ValueError("O modelo YOLO carregado não contém o atributo 'names' com os nomes das classes. Verifique se o arquivo do modelo está correto e completo.")
+
+    def _to_batch(self, tracks: np.ndarray) -> DetectionBatch:
+        track_ids = tracks[:, 4].astype(np.int64) + self.track_id_offset
+        if len(track_ids):
+            self.max_track_id = max(self.max_track_id, int(track_ids.max()))
+        return DetectionBatch.from_arrays(
+            track_ids=track_ids,
+            boxes=tracks[:, :4],
+            class_ids=tracks[:, 6],
+            confs=tracks[:, 5],
+            class_names=self.model_names
+        )
+
+    def track_batch(self, frames: List[np.ndarray]) -> List[DetectionBatch]:
+        return [
+            self._to_batch(self.tracker.update(frame_detections))
+            for frame_detections in self.detector.detect_batch(frames)
+        ]
+
+    def track(self, frame) -> DetectionBatch:
+        return self.track_batch([frame])[0]
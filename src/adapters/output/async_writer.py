@@ -0,0 +1,146 @@
+import queue
+import threading
+import time
+
+from src.adapters.output.output_buffer import CSV_RECORD_BYTES
+from src.models.data_models import FrameTrackData
+
+# Sentinela que encerra a thread de escrita
+_FIM_DA_ESCRITA = object()
+
+
+class _FlushRequest:
+    def __init__(self):
+        self.done = threading.Event()
+
+
+class AsyncOutputWriter:
+    """
+    Executa um OutputBuffer numa thread de escrita dedicada, alimentada por
+    uma fila limitada em bytes; mesma interface de OutputBuffer.
+
+    O tamanho de cada item é o do frame anotado mais a estimativa dos
+    registros (CSV_RECORD_BYTES cada), de modo que o limite vale tanto para
+    vídeo 4K quanto para execuções só de CSV. A ordem dos frames é preservada
+    (uma única thread consome a fila em ordem), add() bloqueia enquanto o
+    item não couber em max_queue_bytes (um item maior que o limite entra
+    sozinho, com a fila vazia) e um erro na thread de escrita é relançado na
+    próxima chamada feita pelo loop principal.
+    """
+
+    def __init__(self, output_buffer, max_queue_bytes: int):
+        if max_queue_bytes <= 0:
+            raise ValueError(f"max_queue_bytes deve ser > 0, recebido: {max_queue_bytes}")
+
+        self.output_buffer = output_buffer
+        self.csv_adapter = output_buffer.csv_adapter
+        self.video_adapter = output_buffer.video_adapter
+        self.max_queue_bytes = max_queue_bytes
+
+        self._fila = queue.Queue()
+        self._queued_bytes = 0
+        self._queue_changed = threading.Condition()
+        self._writer_error = None
+        self._closed = False
+        self._write_time = 0.0
+        self._producer_wait = 0.0
+        self._queue_peak_bytes = 0
+
+        self._writer_thread = threading.Thread(
+            target=self._write_loop, name="OutputWriter", daemon=True
+        )
+        self._writer_thread.start()
+
+    @staticmethod
+    def _item_bytes(item) -> int:
+        if not isinstance(item, FrameTrackData):
+            return 0
+        nbytes = len(item.registros_csv or ()) * CSV_RECORD_BYTES
+        if item.frame_anotado is not None:
+            nbytes += item.frame_anotado.nbytes
+        return nbytes
+
+    def _write_loop(self) -> None:
+        while True:
+            item, nbytes = self._fila.get()
+            if item is _FIM_DA_ESCRITA:
+                return
+            if isinstance(item, _FlushRequest):
+                if self._writer_error is None:
+                    self._run(self.output_buffer.flush)
+                item.done.set()
+                continue
+            if self._writer_error is None:
+                # Após um erro os itens restantes são descartados
+                self._run(self.output_buffer.add, item)
+            with self._queue_changed:
+                self._queued_bytes -= nbytes
+                self._queue_changed.notify()
+
+    def _run(self, func, *args) -> None:
+        inicio = time.perf_counter()
+        try:
+            func(*args)
+        except Exception as e:
+            self._writer_error = e
+        self._write_time += time.perf_counter() - inicio
+
+    def _raise_writer_error(self) -> None:
+        if self._writer_error is not None:
+            raise IOError(f"Erro na thread de escrita: {self._writer_error}") from self._writer_error
+
+    def _put(self, item) -> None:
+        # Back-pressure: bloqueia enquanto o item não couber no limite, sem travar se a thread parar
+        nbytes = self._item_bytes(item)
+        inicio = time.perf_counter()
+        with self._queue_changed:
+            while self._queued_bytes > 0 and self._queued_bytes + nbytes > self.max_queue_bytes:
+                if not self._writer_thread.is_alive():
+                    self._raise_writer_error()
+                    raise RuntimeError("Thread de escrita encerrada")
+                self._queue_changed.wait(timeout=0.1)
+            if not self._writer_thread.is_alive():
+                self._raise_writer_error()
+                raise RuntimeError("Thread de escrita encerrada")
+            self._queued_bytes += nbytes
+            self._queue_peak_bytes = max(self._queue_peak_bytes, self._queued_bytes)
+            self._fila.put((item, nbytes))
+        self._producer_wait += time.perf_counter() - inicio
+
+    def add(self, frame_data: FrameTrackData) -> None:
+        self._raise_writer_error()
+        self._put(frame_data)
+
+    def flush(self) -> None:
+        """Aguarda a escrita de tudo o que foi enfileirado (usado pelo checkpoint)."""
+        if self._closed:
+            return
+        request = _FlushRequest()
+        self._put(request)
+        while not request.done.wait(timeout=0.1):
+            if not self._writer_thread.is_alive():
+                break
+        self._raise_writer_error()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+
+        if self._writer_thread.is_alive():
+            self._fila.put((_FIM_DA_ESCRITA, 0))
+            self._writer_thread.join()
+
+        # Os adapters são fechados mesmo após erro, e o erro é relançado em seguida
+        self.output_buffer.close()
+        self._raise_writer_error()
+
+    def get_stats(self) -> dict:
+        stats = self.output_buffer.get_stats()
+        stats.update({
+            'queue_max_bytes': self.max_queue_bytes,
+            'queue_peak_bytes': self._queue_peak_bytes,
+            'write_time_s': self._write_time,
+            'producer_wait_s': self._producer_wait
+        })
+        return stats
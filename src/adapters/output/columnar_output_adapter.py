@@ -0,0 +1,225 @@
+import glob
+import os
+import re
+import shutil
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+
+# Colunas e tipos da saída colunar; a cor BGR é separada em três colunas (-1 = sem cor)
+COLUMNS = {
+    'frame_id': np.int64,
+    'track_id': np.int64,
+    'classe': str,
+    'confianca': np.float32,
+    'box_x1': np.float32,
+    'box_y1': np.float32,
+    'box_x2': np.float32,
+    'box_y2': np.float32,
+    'velocidade_kmh': np.float32,
+    'faixa': str,
+    'cor_b': np.int16,
+    'cor_g': np.int16,
+    'cor_r': np.int16,
+    'interpolado': np.bool_
+}
+
+_CAMPOS_DIRETOS = [
+    'frame_id', 'track_id', 'classe', 'confianca', 'box_x1', 'box_y1', 'box_x2', 'box_y2',
+    'velocidade_kmh', 'faixa', 'interpolado'
+]
+
+
+class ColumnarOutputAdapter:
+    """
+    Resultados por frame em formato colunar binário, num diretório
+    <base_path>_colunas com arquivos parte_NNNNN.
+
+    Com pyarrow disponível grava arquivos Parquet com um row group a cada
+    row_group_size linhas, e um novo arquivo a cada checkpoint (sync); sem
+    pyarrow grava um .npz por bloco. Os valores são acumulados coluna a coluna
+    e convertidos para arrays tipados uma vez por bloco, sem a conversão e
+    formatação campo a campo do CSV.
+
+    Na retomada (resume_frame) os resultados vão para
+    <base_path>_retomada_<resume_frame>_colunas; as partes gravadas após o
+    checkpoint (índice >= resume_parts['chunks_written']) e as saídas de
+    retomadas abandonadas posteriores ao checkpoint são removidas.
+    """
+
+    def __init__(
+        self,
+        base_path: str,
+        row_group_size: int = 65536,
+        resume_frame: Optional[int] = None,
+        resume_parts: Optional[dict] = None
+    ):
+        if row_group_size <= 0:
+            raise ValueError(f"row_group_size deve ser > 0, recebido: {row_group_size}")
+
+        self.row_group_size = row_group_size
+        self.use_parquet = pq is not None
+        self._extension = "parquet" if self.use_parquet else "npz"
+        self._writer = None
+
+        # Uma execução nova descarta todas as retomadas anteriores; uma retomada, as posteriores ao checkpoint
+        for directory, frame in _resumed_dirs(base_path):
+            if resume_frame is None or frame >= resume_frame:
+                shutil.rmtree(directory)
+        if resume_frame is None:
+            self.filepath = f"{base_path}_colunas"
+        else:
+            if resume_parts:
+                _discard_parts(resume_parts['path'], resume_parts['chunks_written'])
+            self.filepath = f"{base_path}_retomada_{resume_frame}_colunas"
+        os.makedirs(self.filepath, exist_ok=True)
+        _discard_parts(self.filepath, 0)
+
+        self._columns: Dict[str, list] = {name: [] for name in COLUMNS}
+        self._pending = 0
+        self._chunks_written = 0
+        self.rows_written = 0
+        self._closed = False
+
+    def save_records(self, records: List[dict]) -> None:
+        if self._closed:
+            raise RuntimeError("Adapter colunar já foi fechado")
+
+        columns = self._columns
+        for name in _CAMPOS_DIRETOS:
+            columns[name].extend(record[name] for record in records)
+        for record in records:
+            color = record['cor_dominante_bgr']
+            if color is None:
+                color = (-1, -1, -1)
+            columns['cor_b'].append(color[0])
+            columns['cor_g'].append(color[1])
+            columns['cor_r'].append(color[2])
+
+        self._pending += len(records)
+        if self._pending >= self.row_group_size:
+            self.flush()
+
+    def _to_arrays(self) -> Dict[str, np.ndarray]:
+        arrays = {}
+        for name, dtype in COLUMNS.items():
+            values = self._columns[name]
+            if dtype is str:
+                arrays[name] = np.array([str(v) if v is not None else '' for v in values], dtype=str)
+            else:
+                arrays[name] = np.array(
+                    [np.nan if v is None else v for v in values] if dtype is np.float32 else values,
+                    dtype=dtype
+                )
+        return arrays
+
+    def _part_path(self, index: int) -> str:
+        return os.path.join(self.filepath, f"parte_{index:05d}.{self._extension}")
+
+    def flush(self) -> None:
+        """Grava as linhas pendentes como um row group (Parquet) ou um bloco .npz."""
+        if not self._pending:
+            return
+
+        arrays = self._to_arrays()
+        if self.use_parquet:
+            table = pa.table({name: pa.array(values) for name, values in arrays.items()})
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self._part_path(self._chunks_written), table.schema)
+            self._writer.write_table(table)
+        else:
+            np.savez(self._part_path(self._chunks_written), **arrays)
+            self._chunks_written += 1
+
+        self.rows_written += self._pending
+        self._pending = 0
+        for values in self._columns.values():
+            values.clear()
+
+    def _close_part(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+            self._chunks_written += 1
+
+    def sync(self) -> dict:
+        """
+        Grava as linhas pendentes e fecha a parte Parquet em aberto, de modo que
+        nenhuma parte já completa receba linhas posteriores ao checkpoint.
+        Retorna o estado usado na retomada.
+        """
+        self.flush()
+        self._close_part()
+        return {'path': self.filepath, 'chunks_written': self._chunks_written, 'rows_written': self.rows_written}
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self.flush()
+        self._closed = True
+        self._close_part()
+        print(f"📦 Resultados colunares salvos: {self.filepath} ({self.rows_written} linhas)")
+
+
+def _part_index(part_path: str) -> int:
+    return int(os.path.basename(part_path).split('_')[1].split('.')[0])
+
+
+def _list_parts(directory: str) -> List[str]:
+    parts = glob.glob(os.path.join(directory, "parte_*.npz")) + glob.glob(os.path.join(directory, "parte_*.parquet"))
+    return sorted(parts, key=_part_index)
+
+
+def _discard_parts(directory: str, first_index: int) -> None:
+    for part in _list_parts(directory):
+        if _part_index(part) >= first_index:
+            os.remove(part)
+
+
+def _resumed_dirs(base_path: str) -> List[Tuple[str, int]]:
+    # Diretórios <base_path>_retomada_<frame>_colunas, em ordem de frame
+    pattern = re.compile(re.escape(os.path.basename(base_path)) + r"_retomada_(\d+)_colunas$")
+    resumed = []
+    for directory in glob.glob(f"{glob.escape(base_path)}_retomada_*_colunas"):
+        match = pattern.match(os.path.basename(directory))
+        if match and os.path.isdir(directory):
+            resumed.append((directory, int(match.group(1))))
+    return sorted(resumed, key=lambda item: item[1])
+
+
+def load_columnar_results(path: str):
+    """
+    Carrega a saída de ColumnarOutputAdapter (diretório <base>_colunas com
+    partes .parquet ou .npz) num DataFrame do pandas, incluindo, em ordem, os
+    diretórios <base>_retomada_<frame>_colunas gravados após retomadas.
+    """
+    import pandas as pd
+
+    if not os.path.isdir(path):
+        return pd.read_parquet(path)
+
+    path = os.path.normpath(path)
+    directories = [path]
+    if path.endswith("_colunas"):
+        directories += [directory for directory, _ in _resumed_dirs(path[:-len("_colunas")])]
+
+    frames = []
+    for directory in directories:
+        for part in _list_parts(directory):
+            if part.endswith(".parquet"):
+                frames.append(pd.read_parquet(part))
+            else:
+                with np.load(part) as data:
+                    frames.append(pd.DataFrame({name: data[name] for name in data.files}))
+
+    if not frames:
+        return pd.DataFrame({name: pd.Series(dtype=object if dtype is str else dtype) for name, dtype in COLUMNS.items()})
+    return pd.concat(frames, ignore_index=True)
@@ -1,23 +1,31 @@
 import csv
+from typing import Optional
 
 class CSVOutputAdapter:
     
     FIELDNAMES = [
         'frame_id', 'track_id', 'classe', 'confianca',
         'box_x1', 'box_y1', 'box_x2', 'box_y2', 
-        'velocidade_kmh', 'faixa', 'cor_dominante_bgr'
+        'velocidade_kmh', 'faixa', 'cor_dominante_bgr', 'interpolado'
     ]
     
-    def __init__(self, filepath: str, batch_size: int = 50):
+    def __init__(self, filepath: str, batch_size: int = 50, resume_offset: Optional[int] = None):
         self.filepath = filepath
         self.batch_size = batch_size
         self.buffer = []
         self.saved_track_ids = set()  # Para estatísticas
         
         try:
-            self.csvfile = open(filepath, 'w', newline='', encoding='utf-8')
-            self.writer = csv.DictWriter(self.csvfile, fieldnames=self.FIELDNAMES)
-            self.writer.writeheader()
+            if resume_offset is None:
+                self.csvfile = open(filepath, 'w', newline='', encoding='utf-8')
+                self.writer = csv.DictWriter(self.csvfile, fieldnames=self.FIELDNAMES)
+                self.writer.writeheader()
+            else:
+                # Retomada: descarta o que foi escrito após o último checkpoint
+                self.csvfile = open(filepath, 'r+', newline='', encoding='utf-8')
+                self.csvfile.seek(resume_offset)
+                self.csvfile.truncate()
+                self.writer = csv.DictWriter(self.csvfile, fieldnames=self.FIELDNAMES)
         except IOError as e:
             raise IOError(f"Erro ao criar arquivo CSV '{filepath}': {e}")
     
@@ -53,7 +61,8 @@ class CSVOutputAdapter:
             'box_y2': round(self._convert_value(record.get('box_y2', 0.0)), 2),
             'velocidade_kmh': self._format_velocity(record.get('velocidade_kmh')),
             'faixa': str(record.get('faixa', '')),
-            'cor_dominante_bgr': self._format_color(record.get('cor_dominante_bgr'))
+            'cor_dominante_bgr': self._format_color(record.get('cor_dominante_bgr')),
+            'interpolado': int(bool(record.get('interpolado', False)))
         }
         
         return processed
@@ -90,6 +99,12 @@ class CSVOutputAdapter:
         except IOError as e:
             print(f"⚠️ Erro ao escrever batch no CSV: {e}")
     
+    def sync(self) -> int:
+        """Grava o buffer em disco e retorna o offset atual do arquivo."""
+        self._flush_internal()
+        self.csvfile.flush()
+        return self.csvfile.tell()
+
     def get_unique_track_count(self) -> int:
         return len(self.saved_track_ids)
     
@@ -0,0 +1,125 @@
+import shutil
+import subprocess
+import tempfile
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+class FFmpegVideoOutputAdapter:
+    """
+    Vídeo anotado codificado por um processo ffmpeg local, alimentado com
+    frames BGR crus pelo stdin; mesma interface de VideoOutputAdapter.
+
+    Opcionalmente reduz a resolução (largura output_width, proporção mantida)
+    e grava apenas um a cada `decimation` frames, com o fps ajustado para que a
+    duração do vídeo se mantenha.
+    """
+
+    def __init__(
+        self,
+        filepath: str,
+        fps: float,
+        frame_size: Tuple[int, int],
+        codec: str = "libx264",
+        preset: str = "veryfast",
+        crf: Optional[int] = 23,
+        threads: int = 0,
+        output_width: int = 0,
+        decimation: int = 1
+    ):
+        self.filepath = filepath
+        self.fps = fps
+        self.frame_size = frame_size
+        self.decimation = max(1, int(decimation))
+
+        if fps <= 0:
+            raise ValueError(f"FPS deve ser > 0, recebido: {fps}")
+
+        if frame_size[0] <= 0 or frame_size[1] <= 0:
+            raise ValueError(f"frame_size inválido: {frame_size}")
+
+        ffmpeg = shutil.which("ffmpeg")
+        if ffmpeg is None:
+            raise IOError("Executável 'ffmpeg' não encontrado no PATH.")
+
+        width, height = frame_size
+        if 0 < output_width < width:
+            height = round(height * output_width / width)
+            width = output_width
+        # yuv420p exige dimensões pares
+        self.output_size = (width - width % 2, height - height % 2)
+
+        command = [
+            ffmpeg, "-hide_banner", "-loglevel", "error", "-y",
+            "-f", "rawvideo", "-pix_fmt", "bgr24",
+            "-s", f"{self.output_size[0]}x{self.output_size[1]}",
+            "-r", f"{fps / self.decimation:.6f}",
+            "-i", "-",
+            "-an", "-c:v", codec, "-preset", preset,
+            "-threads", str(threads), "-pix_fmt", "yuv420p"
+        ]
+        if crf is not None:
+            command += ["-crf", str(crf)]
+        command.append(filepath)
+
+        # stderr em arquivo temporário: um pipe não lido poderia bloquear o ffmpeg
+        self._stderr = tempfile.TemporaryFile()
+        try:
+            self.process = subprocess.Popen(command, stdin=subprocess.PIPE, stderr=self._stderr)
+        except OSError as e:
+            self._stderr.close()
+            raise IOError(f"Erro ao iniciar ffmpeg para '{filepath}': {e}")
+
+        self.frame_count = 0
+        self.received_frames = 0
+
+    def _ffmpeg_error(self) -> str:
+        self._stderr.seek(0)
+        return self._stderr.read().decode("utf-8", errors="replace").strip()[-2000:]
+
+    def write_frame(self, frame: np.ndarray) -> None:
+
+        if self.process is None or self.process.stdin is None:
+            raise RuntimeError("Processo ffmpeg não está aberto")
+
+        if frame.shape[:2][::-1] != self.frame_size:
+            raise ValueError(
+                f"Frame com dimensões incorretas. "
+                f"Esperado: {self.frame_size}, "
+                f"Recebido: {frame.shape[:2][::-1]}"
+            )
+
+        self.received_frames += 1
+        if (self.received_frames - 1) % self.decimation != 0:
+            return
+
+        if frame.shape[:2][::-1] != self.output_size:
+            frame = cv2.resize(frame, self.output_size, interpolation=cv2.INTER_AREA)
+
+        try:
+            self.process.stdin.write(np.ascontiguousarray(frame).tobytes())
+        except (BrokenPipeError, OSError) as e:
+            self.process.wait()
+            raise IOError(f"ffmpeg encerrou durante a escrita de '{self.filepath}': {self._ffmpeg_error() or e}")
+        self.frame_count += 1
+
+    def close(self) -> None:
+        """Fecha o stdin e aguarda o ffmpeg finalizar o arquivo."""
+        if self.process is None:
+            return
+
+        process, self.process = self.process, None
+        try:
+            if process.stdin:
+                process.stdin.close()
+        except (BrokenPipeError, OSError):
+            pass
+        returncode = process.wait()
+        error = self._ffmpeg_error()
+        self._stderr.close()
+
+        if returncode != 0:
+            raise IOError(f"ffmpeg terminou com código {returncode} para '{self.filepath}': {error}")
+        print(f"🎥 Vídeo salvo: {self.filepath} ({self.frame_count} frames)")
@@ -1,65 +1,86 @@
 from typing import List
-import numpy as np
 
 from src.models.data_models import FrameTrackData
 
+# Estimativa do tamanho em memória de um registro CSV (dict com 12 campos)
+CSV_RECORD_BYTES = 640
+
 
 class OutputBuffer:
-    
+    """
+    Encaminha as saídas de cada frame para os adapters.
+
+    O frame anotado vai direto para o adapter de vídeo (acumular frames não
+    acelera o encoder e custa ~6 MB por frame em 1080p); apenas os registros
+    são acumulados, até max_buffer_bytes, e gravados no CSV e/ou na saída
+    colunar.
+    """
+
     def __init__(
-        self, 
-        csv_adapter=None, 
-        video_adapter=None, 
-        batch_size: int = 100
+        self,
+        csv_adapter=None,
+        video_adapter=None,
+        max_buffer_bytes: int = 4 * 1024 * 1024,
+        columnar_adapter=None
     ):
-        if batch_size <= 0:
-            raise ValueError(f"batch_size deve ser > 0, recebido: {batch_size}")
-        
+        if max_buffer_bytes <= 0:
+            raise ValueError(f"max_buffer_bytes deve ser > 0, recebido: {max_buffer_bytes}")
+
         self.csv_adapter = csv_adapter
         self.video_adapter = video_adapter
-        self.batch_size = batch_size
-        
-        self.buffer: List[FrameTrackData] = []
+        self.columnar_adapter = columnar_adapter
+        self.max_buffer_bytes = max_buffer_bytes
+
+        self.registros: List[dict] = []
+        self.buffered_bytes = 0
+        self.peak_buffered_bytes = 0
         self.frame_count = 0
-    
+
     def add(self, frame_data: FrameTrackData) -> None:
 
-        self.buffer.append(frame_data)
         self.frame_count += 1
-        
-        if len(self.buffer) >= self.batch_size:
-            self.flush()
-    
+
+        if self.video_adapter and frame_data.frame_anotado is not None:
+            self.video_adapter.write_frame(frame_data.frame_anotado)
+
+        if (self.csv_adapter or self.columnar_adapter) and frame_data.registros_csv:
+            self.registros.extend(frame_data.registros_csv)
+            self.buffered_bytes += len(frame_data.registros_csv) * CSV_RECORD_BYTES
+            self.peak_buffered_bytes = max(self.peak_buffered_bytes, self.buffered_bytes)
+
+            if self.buffered_bytes >= self.max_buffer_bytes:
+                self.flush()
+
     def flush(self) -> None:
-        if not self.buffer:
+        if not self.registros:
             return
-        
-        # Persiste CSV (se configurado)
+
         if self.csv_adapter:
-            for frame_data in self.buffer:
-                for registro in frame_data.registros_csv:
-                    self.csv_adapter.save_record(registro)
-        
-        # Persiste vídeo (se configurado)
-        if self.video_adapter:
-            for frame_data in self.buffer:
-                self.video_adapter.write_frame(frame_data.frame_anotado)
-        
-        # Limpa buffer
-        self.buffer.clear()
-    
+            for registro in self.registros:
+                self.csv_adapter.save_record(registro)
+
+        if self.columnar_adapter:
+            self.columnar_adapter.save_records(self.registros)
+
+        self.registros.clear()
+        self.buffered_bytes = 0
+
     def close(self) -> None:
         self.flush()
-        
+
         if self.csv_adapter:
             self.csv_adapter.close()
-        
+
         if self.video_adapter:
             self.video_adapter.close()
-    
+
+        if self.columnar_adapter:
+            self.columnar_adapter.close()
+
     def get_stats(self) -> dict:
         return {
             'total_frames': self.frame_count,
-            'buffer_size': len(self.buffer),
-            'batch_size': self.batch_size
-        }
\ No newline at end of file
+            'buffered_bytes': self.buffered_bytes,
+            'peak_buffered_bytes': self.peak_buffered_bytes,
+            'max_buffer_bytes': self.max_buffer_bytes
+        }
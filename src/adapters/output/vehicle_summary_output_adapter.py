@@ -0,0 +1,57 @@
+import csv
+from typing import Optional, Sequence
+
+
+class VehicleSummaryOutputAdapter:
+    """CSV com uma linha por veículo, escrito à medida que os tracks são finalizados."""
+
+    def __init__(self, filepath: str, percentiles: Sequence[int] = (50, 85), resume_offset: Optional[int] = None):
+        self.filepath = filepath
+        self.fieldnames = [
+            'track_id', 'classe', 'frame_entrada', 'frame_saida', 'frames_observados',
+            'sequencia_faixas', 'velocidade_min_kmh', 'velocidade_media_kmh', 'velocidade_max_kmh'
+        ] + [f'velocidade_p{p}_kmh' for p in percentiles] + ['cor_dominante_bgr']
+        self.rows_written = 0
+
+        try:
+            if resume_offset is None:
+                self.csvfile = open(filepath, 'w', newline='', encoding='utf-8')
+                self.writer = csv.DictWriter(self.csvfile, fieldnames=self.fieldnames)
+                self.writer.writeheader()
+            else:
+                # Retomada: descarta os veículos finalizados após o último checkpoint
+                self.csvfile = open(filepath, 'r+', newline='', encoding='utf-8')
+                self.csvfile.seek(resume_offset)
+                self.csvfile.truncate()
+                self.writer = csv.DictWriter(self.csvfile, fieldnames=self.fieldnames)
+        except IOError as e:
+            raise IOError(f"Erro ao criar arquivo de resumo por veículo '{filepath}': {e}")
+
+    def write_row(self, row: dict) -> None:
+        if self.csvfile is None:
+            raise RuntimeError("Adapter de resumo por veículo já foi fechado")
+
+        formatted = {}
+        for key, value in row.items():
+            if value is None:
+                formatted[key] = ''
+            elif isinstance(value, float):
+                formatted[key] = round(value, 2)
+            elif key == 'cor_dominante_bgr':
+                formatted[key] = f"{value[0]},{value[1]},{value[2]}"
+            else:
+                formatted[key] = value
+        self.writer.writerow(formatted)
+        self.rows_written += 1
+
+    def sync(self) -> int:
+        """Grava em disco e retorna o offset atual do arquivo."""
+        self.csvfile.flush()
+        return self.csvfile.tell()
+
+    def close(self) -> None:
+        if self.csvfile is None:
+            return
+        self.csvfile.close()
+        self.csvfile = None
+        print(f"🚗 Resumo por veículo salvo: {self.filepath} ({self.rows_written} veículos)")
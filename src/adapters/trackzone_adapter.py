@@ -1,57 +1,62 @@
-from typing import List
-from src.models.data_models import Detection
+import numpy as np
+
+from src.models.data_models import DetectionBatch
 
 class TrackZoneAdapter:
     def __init__(self, trackzone_instance, model):
         self.trackzone = trackzone_instance
         self.model = model
+        # Deslocamento somado aos IDs do tracker (IDs únicos entre segmentos/retomadas)
+        self.track_id_offset = 0
+        self.max_track_id = 0
         self.model_names = getattr(self.model, 'names', {})
         if not self.model_names:
             raise ValueError("O modelo YOLO carregado não contém o atributo 'names' com os nomes das classes. Verifique se o arquivo do modelo está correto e completo.")
 
-    def track(self, frame) -> List[Detection]:
+    @staticmethod
+    def _to_numpy(values, dtype) -> np.ndarray:
+        # Uma única transferência dispositivo -> host por campo
+        if hasattr(values, 'cpu'):
+            values = values.cpu().numpy()
+        return np.asarray(values, dtype=dtype)
+
+    def track(self, frame) -> DetectionBatch:
         self.trackzone(frame)
         if not (hasattr(self.trackzone, 'track_ids') and self.trackzone.track_ids is not None and
                 hasattr(self.trackzone, 'boxes') and self.trackzone.boxes is not None and
                 hasattr(self.trackzone, 'clss') and self.trackzone.clss is not None and
                 hasattr(self.trackzone, 'confs') and self.trackzone.confs is not None):
-            return []
+            return DetectionBatch.empty(self.model_names)
 
         num_tracks = len(self.trackzone.track_ids)
         if not (len(self.trackzone.boxes) == num_tracks and len(self.trackzone.clss) == num_tracks and len(self.trackzone.confs) == num_tracks):
             print(f"⚠️ Aviso: Dados do tracker inconsistentes - IDs:{len(self.trackzone.track_ids)}, "
                   f"Boxes:{len(self.trackzone.boxes)}, Classes:{len(self.trackzone.clss)}, "
                   f"Confs:{len(self.trackzone.confs)}")
-            return []
-        detections = []
-
-        for i in range(num_tracks):
-            track_id = int(self.trackzone.track_ids[i])
-            class_id = int(self.trackzone.clss[i])
-            class_name = self.model_names.get(class_id, f"class_{class_id}")
-
-            box_array = self.trackzone.boxes[i].cpu().numpy().copy()
-            if box_array.shape != (4,):
-                print(f"⚠️ Aviso [track_id={track_id}]: Box com formato inválido ignorada: {box_array.shape}")
-                continue
-
-            conf_value = self.trackzone.confs[i]
-            if hasattr(conf_value, 'item'):
-                if conf_value.numel() != 1:
-                    print(f"⚠️ Aviso [track_id={track_id}]: Tensor de confiança com formato inválido ignorado: {conf_value.shape}")
-                    continue
-                confidence = conf_value.item()
-            else:
-                try:
-                    confidence = float(conf_value)
-                except (ValueError, TypeError):
-                    print(f"⚠️ Aviso [track_id={track_id}]: Valor de confiança não numérico ignorado: {conf_value}")
-                    continue
-
-            detections.append(Detection(
-                track_id=track_id,
-                box=box_array,
-                class_name=class_name,
-                confidence=confidence
-            ))
-        return detections
\ No newline at end of file
+            return DetectionBatch.empty(self.model_names)
+
+        boxes = self._to_numpy(self.trackzone.boxes, np.float32)
+        if boxes.shape != (num_tracks, 4):
+            print(f"⚠️ Aviso: Boxes com formato inválido ignoradas: {boxes.shape}")
+            return DetectionBatch.empty(self.model_names)
+
+        try:
+            confs = self._to_numpy(self.trackzone.confs, np.float32).reshape(-1)
+        except (ValueError, TypeError):
+            print(f"⚠️ Aviso: Valores de confiança não numéricos ignorados: {self.trackzone.confs}")
+            return DetectionBatch.empty(self.model_names)
+        if len(confs) != num_tracks:
+            print(f"⚠️ Aviso: Tensor de confiança com formato inválido ignorado: {confs.shape}")
+            return DetectionBatch.empty(self.model_names)
+
+        track_ids = self._to_numpy(self.trackzone.track_ids, np.int64) + self.track_id_offset
+        if num_tracks:
+            self.max_track_id = max(self.max_track_id, int(track_ids.max()))
+
+        return DetectionBatch.from_arrays(
+            track_ids=track_ids,
+            boxes=boxes,
+            class_ids=self._to_numpy(self.trackzone.clss, np.int64),
+            confs=confs,
+            class_names=self.model_names
+        )
@@ -1,5 +1,5 @@
-from dataclasses import dataclass
-from typing import List
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
 import numpy as np
 
 
@@ -11,9 +11,77 @@ class Detection:
     confidence: float
 
 
+@dataclass
+class DetectionBatch:
+    """Detecções de um frame em arrays contíguos: uma linha por track."""
+    track_ids: np.ndarray                 # (N,) int64
+    boxes: np.ndarray                     # (N, 4) float32, xyxy
+    class_ids: np.ndarray                 # (N,) int64
+    confs: np.ndarray                     # (N,) float32
+    class_names: Dict[int, str] = field(default_factory=dict)
+
+    @classmethod
+    def empty(cls, class_names: Optional[Dict[int, str]] = None) -> 'DetectionBatch':
+        return cls(
+            track_ids=np.empty(0, dtype=np.int64),
+            boxes=np.empty((0, 4), dtype=np.float32),
+            class_ids=np.empty(0, dtype=np.int64),
+            confs=np.empty(0, dtype=np.float32),
+            class_names=class_names or {}
+        )
+
+    @classmethod
+    def from_arrays(cls, track_ids, boxes, class_ids, confs, class_names: Dict[int, str]) -> 'DetectionBatch':
+        return cls(
+            track_ids=np.ascontiguousarray(track_ids, dtype=np.int64).reshape(-1),
+            boxes=np.ascontiguousarray(boxes, dtype=np.float32).reshape(-1, 4),
+            class_ids=np.ascontiguousarray(class_ids, dtype=np.int64).reshape(-1),
+            confs=np.ascontiguousarray(confs, dtype=np.float32).reshape(-1),
+            class_names=class_names
+        )
+
+    def __len__(self) -> int:
+        return len(self.track_ids)
+
+    def class_name(self, class_id: int) -> str:
+        return self.class_names.get(int(class_id), f"class_{int(class_id)}")
+
+    def select(self, index) -> 'DetectionBatch':
+        """Subconjunto por máscara booleana ou índices."""
+        return DetectionBatch(
+            track_ids=self.track_ids[index],
+            boxes=self.boxes[index],
+            class_ids=self.class_ids[index],
+            confs=self.confs[index],
+            class_names=self.class_names
+        )
+
+    def scaled(self, scale_factor: float, offset: Tuple[int, int] = (0, 0)) -> 'DetectionBatch':
+        """Caixas do frame de inferência para o frame original (desfaz escala e recorte)."""
+        if scale_factor == 1.0 and offset == (0, 0):
+            return self
+        boxes = self.boxes / np.float32(scale_factor)
+        boxes += np.array([offset[0], offset[1], offset[0], offset[1]], dtype=np.float32)
+        return DetectionBatch(self.track_ids, boxes, self.class_ids, self.confs, self.class_names)
+
+    def to_detections(self) -> List[Detection]:
+        return [
+            Detection(
+                track_id=int(track_id),
+                box=box,
+                class_name=self.class_name(class_id),
+                confidence=float(conf)
+            )
+            for track_id, box, class_id, conf in zip(
+                self.track_ids.tolist(), self.boxes, self.class_ids.tolist(), self.confs.tolist()
+            )
+        ]
+
+
 @dataclass
 class FrameTrackData:
     frame_id: int
-    frame_anotado: np.ndarray
+    # None quando não há vídeo anotado nem janela de exibição
+    frame_anotado: Optional[np.ndarray]
     registros_csv: List[dict]
     fps: float
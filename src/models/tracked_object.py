@@ -8,10 +8,14 @@ class TrackedObject:
         self.dominant_color = None
         self.histogram = None
         self.last_feature_update = -1
+        # Amostras de cor (cor, área visível) até a estimativa estabilizar
+        self.color_samples = []
+        self.color_frozen = False
         self.velocidade_kmh = None
         self.faixa = None
+        self.confidence = None
 
-    def to_csv_record(self, frame_id: int, confidence: float) -> dict:
+    def to_csv_record(self, frame_id: int, confidence: float, interpolado: bool = False) -> dict:
         return {
             'frame_id': frame_id,
             'track_id': self.id,
@@ -23,7 +27,8 @@ class TrackedObject:
             'box_y2': self.box[3],
             'velocidade_kmh': self.velocidade_kmh if self.velocidade_kmh is not None else 0.0,
             'faixa': self.faixa if self.faixa else '',
-            'cor_dominante_bgr': self.dominant_color
+            'cor_dominante_bgr': self.dominant_color,
+            'interpolado': interpolado
         }
 
     def to_annotation_data(self) -> dict:
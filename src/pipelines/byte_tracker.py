@@ -0,0 +1,190 @@
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+
+from src.utils.geometry import calcular_iou_matriz
+
+# Matrizes do modelo de velocidade constante para o estado [cx, cy, w, h, vx, vy, vw, vh]
+_F = np.eye(8, dtype=np.float64)
+_F[:4, 4:] = np.eye(4)
+_H = np.eye(4, 8, dtype=np.float64)
+
+STD_WEIGHT_POSITION = 1.0 / 20
+STD_WEIGHT_VELOCITY = 1.0 / 160
+
+
+def _xyxy_to_xywh(boxes: np.ndarray) -> np.ndarray:
+    wh = boxes[:, 2:4] - boxes[:, 0:2]
+    return np.concatenate([boxes[:, 0:2] + wh / 2, wh], axis=1)
+
+
+def _xywh_to_xyxy(boxes: np.ndarray) -> np.ndarray:
+    half = boxes[:, 2:4] / 2
+    return np.concatenate([boxes[:, 0:2] - half, boxes[:, 0:2] + half], axis=1)
+
+
+def _linear_assignment(iou: np.ndarray, min_iou: float):
+    """Atribuição ótima com IoU mínimo. Retorna (linhas, colunas) dos pares aceitos."""
+    if iou.size == 0:
+        return np.empty(0, dtype=int), np.empty(0, dtype=int)
+    cost = np.where(iou >= min_iou, 1.0 - iou, 1e6)
+    rows, cols = linear_sum_assignment(cost)
+    valid = iou[rows, cols] >= min_iou
+    return rows[valid], cols[valid]
+
+
+class ByteTracker:
+    """
+    Tracker estilo ByteTrack com estado em arrays (struct-of-arrays).
+
+    O filtro de Kalman de todos os tracks é previsto e corrigido em lote, e a
+    associação usa a matriz de IoU completa com atribuição húngara:
+      1. tracks confirmados (ativos e perdidos) x detecções de alta confiança;
+      2. tracks ativos restantes x detecções de baixa confiança;
+      3. tracks tentativos x detecções de alta confiança restantes.
+    Detecções de alta confiança não associadas criam tracks tentativos, que só
+    recebem ID (e aparecem na saída) ao serem associados no frame seguinte.
+    """
+
+    def __init__(self, high_conf: float, low_conf: float, match_iou: float, track_buffer: int):
+        self.high_conf = high_conf
+        self.low_conf = low_conf
+        self.match_iou = match_iou
+        self.track_buffer = track_buffer
+        self.next_id = 1
+        self._reset_arrays()
+
+    def _reset_arrays(self) -> None:
+        self.ids = np.empty(0, dtype=np.int64)          # 0 = tentativo, ainda sem ID
+        self.mean = np.empty((0, 8), dtype=np.float64)
+        self.cov = np.empty((0, 8, 8), dtype=np.float64)
+        self.classes = np.empty(0, dtype=np.int64)
+        self.frames_lost = np.empty(0, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _initiate(self, boxes_xywh: np.ndarray):
+        w, h = boxes_xywh[:, 2], boxes_xywh[:, 3]
+        std = np.stack([
+            2 * STD_WEIGHT_POSITION * w, 2 * STD_WEIGHT_POSITION * h,
+            2 * STD_WEIGHT_POSITION * w, 2 * STD_WEIGHT_POSITION * h,
+            10 * STD_WEIGHT_VELOCITY * w, 10 * STD_WEIGHT_VELOCITY * h,
+            10 * STD_WEIGHT_VELOCITY * w, 10 * STD_WEIGHT_VELOCITY * h
+        ], axis=1)
+        mean = np.concatenate([boxes_xywh, np.zeros_like(boxes_xywh)], axis=1)
+        cov = np.zeros((len(boxes_xywh), 8, 8))
+        cov[:, np.arange(8), np.arange(8)] = std ** 2
+        return mean, cov
+
+    def _predict(self) -> None:
+        if not len(self):
+            return
+        w, h = self.mean[:, 2], self.mean[:, 3]
+        std = np.stack([
+            STD_WEIGHT_POSITION * w, STD_WEIGHT_POSITION * h,
+            STD_WEIGHT_POSITION * w, STD_WEIGHT_POSITION * h,
+            STD_WEIGHT_VELOCITY * w, STD_WEIGHT_VELOCITY * h,
+            STD_WEIGHT_VELOCITY * w, STD_WEIGHT_VELOCITY * h
+        ], axis=1)
+        self.mean = self.mean @ _F.T
+        self.cov = _F @ self.cov @ _F.T
+        self.cov[:, np.arange(8), np.arange(8)] += std ** 2
+
+    def _correct(self, idx: np.ndarray, boxes_xywh: np.ndarray) -> None:
+        if not len(idx):
+            return
+        mean, cov = self.mean[idx], self.cov[idx]
+        w, h = mean[:, 2], mean[:, 3]
+        std = np.stack([
+            STD_WEIGHT_POSITION * w, STD_WEIGHT_POSITION * h,
+            STD_WEIGHT_POSITION * w, STD_WEIGHT_POSITION * h
+        ], axis=1)
+
+        pht = cov @ _H.T                                  # (K, 8, 4)
+        s = _H @ pht                                      # (K, 4, 4)
+        s[:, np.arange(4), np.arange(4)] += std ** 2
+        gain = np.linalg.solve(s, pht.transpose(0, 2, 1)).transpose(0, 2, 1)
+        innovation = boxes_xywh - mean[:, :4]
+
+        self.mean[idx] = mean + (gain @ innovation[:, :, None])[:, :, 0]
+        self.cov[idx] = cov - gain @ s @ gain.transpose(0, 2, 1)
+
+    def _keep(self, mask: np.ndarray) -> None:
+        self.ids = self.ids[mask]
+        self.mean = self.mean[mask]
+        self.cov = self.cov[mask]
+        self.classes = self.classes[mask]
+        self.frames_lost = self.frames_lost[mask]
+
+    def update(self, detections: np.ndarray) -> np.ndarray:
+        """
+        Args:
+            detections: (N, 6) no formato [x1, y1, x2, y2, conf, cls]
+
+        Returns:
+            np.ndarray: (M, 7) [x1, y1, x2, y2, id, conf, cls] dos tracks confirmados neste frame
+        """
+        detections = np.asarray(detections, dtype=np.float64).reshape(-1, 6)
+        detections = detections[detections[:, 4] >= self.low_conf]
+        det_xywh = _xyxy_to_xywh(detections[:, :4])
+        high = np.flatnonzero(detections[:, 4] >= self.high_conf)
+        low = np.flatnonzero(detections[:, 4] < self.high_conf)
+
+        self._predict()
+        track_boxes = _xywh_to_xyxy(self.mean[:, :4])
+        iou = calcular_iou_matriz(track_boxes, detections[:, :4])
+
+        matched_tracks, matched_dets = [], []
+        confirmed = np.flatnonzero(self.ids > 0)
+
+        # 1. Confirmados x alta confiança
+        rows, cols = _linear_assignment(iou[np.ix_(confirmed, high)], self.match_iou)
+        matched_tracks.append(confirmed[rows])
+        matched_dets.append(high[cols])
+        free_high = np.setdiff1d(high, high[cols])
+
+        # 2. Ativos ainda livres x baixa confiança
+        active_free = np.setdiff1d(confirmed[self.frames_lost[confirmed] == 0], confirmed[rows])
+        rows, cols = _linear_assignment(iou[np.ix_(active_free, low)], self.match_iou)
+        matched_tracks.append(active_free[rows])
+        matched_dets.append(low[cols])
+
+        # 3. Tentativos x alta confiança restante
+        tentative = np.flatnonzero(self.ids == 0)
+        rows, cols = _linear_assignment(iou[np.ix_(tentative, free_high)], self.match_iou)
+        matched_tracks.append(tentative[rows])
+        matched_dets.append(free_high[cols])
+        new_dets = np.setdiff1d(free_high, free_high[cols])
+
+        matched_tracks = np.concatenate(matched_tracks).astype(int)
+        matched_dets = np.concatenate(matched_dets).astype(int)
+
+        self._correct(matched_tracks, det_xywh[matched_dets])
+        self.classes[matched_tracks] = detections[matched_dets, 5].astype(np.int64)
+        self.frames_lost += 1
+        self.frames_lost[matched_tracks] = 0
+
+        promote = matched_tracks[self.ids[matched_tracks] == 0]
+        self.ids[promote] = np.arange(self.next_id, self.next_id + len(promote))
+        self.next_id += len(promote)
+
+        output = np.concatenate([
+            _xywh_to_xyxy(self.mean[matched_tracks, :4]),
+            self.ids[matched_tracks, None].astype(np.float64),
+            detections[matched_dets, 4:5],
+            detections[matched_dets, 5:6]
+        ], axis=1)
+
+        # Tentativos não confirmados e perdidos além do buffer são descartados
+        keep = np.where(self.ids == 0, self.frames_lost == 0, self.frames_lost <= self.track_buffer)
+        self._keep(keep)
+
+        if len(new_dets):
+            mean, cov = self._initiate(det_xywh[new_dets])
+            self.ids = np.concatenate([self.ids, np.zeros(len(new_dets), dtype=np.int64)])
+            self.mean = np.concatenate([self.mean, mean])
+            self.cov = np.concatenate([self.cov, cov])
+            self.classes = np.concatenate([self.classes, detections[new_dets, 5].astype(np.int64)])
+            self.frames_lost = np.concatenate([self.frames_lost, np.zeros(len(new_dets), dtype=np.int64)])
+
+        return output
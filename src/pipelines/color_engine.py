@@ -0,0 +1,135 @@
+import math
+from typing import List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from src.pipelines.feature_extractor import FeatureExtractor
+from src.setup.config import ColorConfig
+
+COLOR_ENGINES = ('kmeans', 'histogram')
+
+
+class BatchedColorExtractor:
+    """
+    Cor dominante de várias caixas de um mesmo frame numa única chamada.
+
+    Os pixels de cada caixa são amostrados numa grade regular limitada a
+    COLOR_PIXEL_BUDGET e concatenados com o índice da caixa de origem. O engine
+    "histogram" descarta os pixels próximos das cores de fundo, quantiza o
+    restante em COLOR_QUANT_BITS por canal e toma, por caixa, a média dos pixels
+    do bin mais populoso; tudo com operações vetorizadas sobre o lote. O engine
+    "kmeans" mantém o k-means por caixa de FeatureExtractor, sobre os pixels
+    amostrados.
+    """
+
+    def __init__(self, color_config: ColorConfig, ignore_colors: Optional[list] = None):
+        if color_config.COLOR_ENGINE not in COLOR_ENGINES:
+            raise ValueError(
+                f"COLOR_ENGINE inválido: '{color_config.COLOR_ENGINE}'. Use um de {COLOR_ENGINES}."
+            )
+        self.config = color_config
+        self.ignore_colors = ignore_colors
+        self._ignore = (
+            np.array(ignore_colors, dtype=np.float32).reshape(-1, 3) if ignore_colors else None
+        )
+
+    def _sample_pixels(self, frame: np.ndarray, boxes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Pixels BGR amostrados (M, 3) e o índice da caixa de cada um (M,)."""
+        h, w = frame.shape[:2]
+        budget = self.config.COLOR_PIXEL_BUDGET
+        pixels = []
+        owners = []
+
+        for index, (x1, y1, x2, y2) in enumerate(boxes.tolist()):
+            if not all(math.isfinite(v) for v in (x1, y1, x2, y2)):
+                continue
+            x1, y1 = max(0, int(x1)), max(0, int(y1))
+            x2, y2 = min(w, int(x2)), min(h, int(y2))
+            if x1 >= x2 or y1 >= y2:
+                continue
+
+            area = (x2 - x1) * (y2 - y1)
+            step = max(1, math.ceil(math.sqrt(area / budget))) if budget > 0 else 1
+            roi = frame[y1:y2:step, x1:x2:step].reshape(-1, 3)
+            pixels.append(roi)
+            owners.append(np.full(len(roi), index, dtype=np.int64))
+
+        if not pixels:
+            return np.empty((0, 3), dtype=np.uint8), np.empty(0, dtype=np.int64)
+        return np.concatenate(pixels), np.concatenate(owners)
+
+    def _histogram_mode(self, pixels: np.ndarray, owners: np.ndarray, count: int) -> List[Optional[tuple]]:
+        result: List[Optional[tuple]] = [None] * count
+
+        if self._ignore is not None and len(pixels):
+            # Distância de cada pixel a cada cor de fundo: (M, B)
+            diff = pixels.astype(np.float32)[:, None, :] - self._ignore[None, :, :]
+            foreground = (np.einsum('mbc,mbc->mb', diff, diff) >= self.config.COLOR_THRESHOLD ** 2).all(axis=1)
+            pixels, owners = pixels[foreground], owners[foreground]
+
+        if not len(pixels):
+            return result
+
+        bits = self.config.COLOR_QUANT_BITS
+        shift = 8 - bits
+        q = (pixels >> shift).astype(np.int64)
+        codes = (q[:, 0] << (2 * bits)) | (q[:, 1] << bits) | q[:, 2]
+        nbins = 1 << (3 * bits)
+
+        keys = owners * nbins + codes
+        counts = np.bincount(keys, minlength=count * nbins).reshape(count, nbins)
+        mode = counts.argmax(axis=1)
+        mode_counts = counts[np.arange(count), mode]
+
+        # Média dos pixels do bin dominante de cada caixa
+        in_mode = codes == mode[owners]
+        sums = np.stack([
+            np.bincount(owners[in_mode], weights=pixels[in_mode, c], minlength=count)
+            for c in range(3)
+        ], axis=1)
+
+        for index in np.flatnonzero(mode_counts).tolist():
+            result[index] = tuple(int(v) for v in sums[index] / mode_counts[index])
+        return result
+
+    def _kmeans(self, pixels: np.ndarray, owners: np.ndarray, count: int) -> List[Optional[tuple]]:
+        result: List[Optional[tuple]] = [None] * count
+        if not len(pixels):
+            return result
+
+        # owners já vem agrupado por caixa, em ordem crescente
+        present, starts = np.unique(owners, return_index=True)
+        ends = np.append(starts[1:], len(owners))
+        for index, start, end in zip(present.tolist(), starts.tolist(), ends.tolist()):
+            try:
+                result[index] = FeatureExtractor.dominant_color_from_pixels(
+                    pixels[start:end],
+                    k=self.config.KMEANS_K_CLUSTERS,
+                    max_iter=self.config.KMEANS_MAX_ITER,
+                    epsilon=self.config.KMEANS_EPSILON,
+                    attempts=self.config.KMEANS_ATTEMPTS,
+                    ignore_colors=self.ignore_colors,
+                    color_threshold=self.config.COLOR_THRESHOLD
+                )
+            except (cv2.error, ValueError) as e:
+                print(f"[BatchedColorExtractor] Erro ao extrair cor dominante da caixa {index}: {e}")
+        return result
+
+    def dominant_colors(self, frame: np.ndarray, boxes: Sequence) -> List[Optional[tuple]]:
+        """
+        Args:
+            frame: frame BGR
+            boxes: (N, 4) xyxy em coordenadas do frame
+
+        Returns:
+            list: cor BGR de cada caixa, ou None quando não há pixels válidos
+        """
+        boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+        if not len(boxes):
+            return []
+
+        pixels, owners = self._sample_pixels(frame, boxes)
+        if self.config.COLOR_ENGINE == 'histogram':
+            return self._histogram_mode(pixels, owners, len(boxes))
+        return self._kmeans(pixels, owners, len(boxes))
@@ -1,6 +1,6 @@
 import cv2
 import numpy as np
-from typing import Tuple
+from typing import List, Optional, Tuple
 from src.utils.image_utils import preprocess_frame
 from src.setup.config import ImageProcessingConfig
 
@@ -11,19 +11,40 @@ class FramePreprocessor:
         self,
         original_size: Tuple[int, int],
         inference_size: Tuple[int, int],
-        image_processing_config: ImageProcessingConfig
+        image_processing_config: ImageProcessingConfig,
+        crop_rect: Optional[Tuple[int, int, int, int]] = None
     ):
         self.original_size = original_size
-        self.inference_size = inference_size
         self.config = image_processing_config
         
         # Calcula escala uma vez
         orig_w = original_size[0]
         inf_w = inference_size[0]
         self.scale_factor = inf_w / orig_w if orig_w > 0 else 1.0
+
+        # Recorte (x, y, w, h) em coordenadas do frame original; a escala é mantida
+        self.crop_rect = crop_rect
+        self.offset = (0, 0)
+        self.inference_size = inference_size
+        if crop_rect is not None:
+            x, y, w, h = crop_rect
+            self.offset = (x, y)
+            self.inference_size = (
+                max(1, int(round(w * self.scale_factor))),
+                max(1, int(round(h * self.scale_factor)))
+            )
         self.needs_resize = (self.scale_factor != 1.0)
     
+    def to_inference_coords(self, points: List[List[int]]) -> List[List[int]]:
+        """Converte pontos do frame original para o frame de inferência (recorte + escala)."""
+        pts = (np.array(points, dtype=np.float32) - np.array(self.offset, dtype=np.float32)) * self.scale_factor
+        return np.round(pts).astype(int).tolist()
+
     def prepare_for_inference(self, frame: np.ndarray) -> np.ndarray:
+        if self.crop_rect is not None:
+            x, y, w, h = self.crop_rect
+            frame = frame[y:y + h, x:x + w]
+
         if self.needs_resize:
             frame = cv2.resize(frame, self.inference_size, interpolation=cv2.INTER_AREA)
 
@@ -0,0 +1,81 @@
+from typing import Dict, Iterable, List
+
+
+class IdentityMap:
+    """
+    Union-find dos IDs do tracker: cada ID aponta para o ID final (raiz) da
+    identidade, seguindo cadeias de reassociação de qualquer comprimento.
+
+    find() comprime o caminho; em union() a raiz do track perdido permanece
+    como raiz, de modo que o ID final de um veículo nunca muda. IDs sem
+    entrada são raízes de si mesmos e não ocupam memória.
+    """
+
+    def __init__(self):
+        self._parent: Dict[int, int] = {}
+        self._last_seen: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._parent)
+
+    def find(self, track_id: int) -> int:
+        root = track_id
+        parent = self._parent.get(root)
+        while parent is not None and parent != root:
+            root = parent
+            parent = self._parent.get(root)
+
+        # Compressão de caminho: todos os nós percorridos passam a apontar para a raiz
+        while track_id != root:
+            next_id = self._parent[track_id]
+            self._parent[track_id] = root
+            track_id = next_id
+        return root
+
+    def union(self, new_id: int, lost_id: int) -> int:
+        """Liga a identidade de new_id à de lost_id; retorna a raiz (a do track perdido)."""
+        lost_root = self.find(lost_id)
+        new_root = self.find(new_id)
+        if new_root != lost_root:
+            self._parent[new_root] = lost_root
+            self._parent.setdefault(lost_root, lost_root)
+            self._last_seen[lost_root] = max(
+                self._last_seen.get(lost_root, -1), self._last_seen.get(new_root, -1)
+            )
+        return lost_root
+
+    def touch(self, track_ids: Iterable[int], frame_count: int) -> None:
+        """Marca os IDs (e suas raízes) como vistos no frame."""
+        for track_id in track_ids:
+            self._last_seen[track_id] = frame_count
+            if track_id in self._parent:
+                self._last_seen[self.find(track_id)] = frame_count
+
+    def resident_count(self) -> int:
+        return len(self._parent) + len(self._last_seen)
+
+    def collect(self, frame_count: int, max_frames_lost: int, keep: Iterable[int] = ()) -> List[int]:
+        """
+        Remove os IDs não vistos há mais de max_frames_lost frames (exceto os de
+        keep) e os retorna. Como touch() também renova a raiz, uma raiz nunca
+        morre antes dos seus filhos; os caminhos dos sobreviventes são
+        comprimidos antes, para que nenhum aponte para um nó removido.
+        """
+        limite = frame_count - max_frames_lost
+        keep = set(keep)
+        dead = [
+            track_id for track_id in set(self._parent) | set(self._last_seen)
+            if self._last_seen.get(track_id, -1) < limite and track_id not in keep
+        ]
+        if not dead:
+            return []
+
+        dead_set = set(dead)
+        for track_id in list(self._parent):
+            if track_id not in dead_set:
+                self.find(track_id)
+
+        for track_id in dead:
+            self._parent.pop(track_id, None)
+            self._last_seen.pop(track_id, None)
+        return dead
@@ -0,0 +1,110 @@
+import math
+from typing import Dict, List, Sequence, Set, Tuple
+
+import numpy as np
+
+
+class LostTrackIndex:
+    """
+    Grade uniforme (células de cell_size pixels) com os tracks perdidos,
+    indexados pelo centro da caixa prevista.
+
+    A reassociação consulta apenas as células ao redor de cada caixa nova, em
+    vez de comparar todos os tracks perdidos com todos os novos. O raio da
+    consulta considera a maior caixa atualmente indexada, de modo que nenhum
+    par com sobreposição (IoU > 0) fica de fora; o máximo é recalculado quando
+    a maior caixa é removida ou encolhe.
+    """
+
+    def __init__(self, cell_size: float):
+        self.cell_size = float(cell_size)
+        self._cells: Dict[Tuple[int, int], Set[int]] = {}
+        self._cell_of: Dict[int, Tuple[int, int]] = {}
+        self._extent_of: Dict[int, float] = {}
+        self._max_extent = 0.0
+        self._max_stale = False
+
+    def __len__(self) -> int:
+        return len(self._cell_of)
+
+    def _discard(self, track_id: int, cell: Tuple[int, int]) -> None:
+        members = self._cells.get(cell)
+        if members is not None:
+            members.discard(track_id)
+            if not members:
+                del self._cells[cell]
+
+    def update(self, track_ids: Sequence[int], boxes: np.ndarray) -> None:
+        """Insere ou move os tracks para as células dos centros das caixas xyxy (N, 4)."""
+        boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+        if not len(boxes):
+            return
+        extents = np.maximum(boxes[:, 2] - boxes[:, 0], boxes[:, 3] - boxes[:, 1])
+
+        centers = np.column_stack([(boxes[:, 0] + boxes[:, 2]) / 2, (boxes[:, 1] + boxes[:, 3]) / 2])
+        cells = np.floor(centers / self.cell_size)
+        for track_id, (cx, cy), extent in zip(track_ids, cells.astype(np.int64).tolist(), extents.tolist()):
+            self._set_extent(track_id, extent)
+            cell = (cx, cy)
+            old_cell = self._cell_of.get(track_id)
+            if old_cell == cell:
+                continue
+            if old_cell is not None:
+                self._discard(track_id, old_cell)
+            self._cells.setdefault(cell, set()).add(track_id)
+            self._cell_of[track_id] = cell
+
+    def _set_extent(self, track_id: int, extent: float) -> None:
+        old_extent = self._extent_of.get(track_id)
+        self._extent_of[track_id] = extent
+        if extent >= self._max_extent:
+            self._max_extent = extent
+        elif old_extent is not None and old_extent >= self._max_extent:
+            self._max_stale = True
+
+    def _current_max_extent(self) -> float:
+        # Recalculado só quando a maior caixa saiu ou encolheu desde a última consulta
+        if self._max_stale:
+            self._max_extent = max(self._extent_of.values(), default=0.0)
+            self._max_stale = False
+        return self._max_extent
+
+    def remove(self, track_id: int) -> None:
+        cell = self._cell_of.pop(track_id, None)
+        if cell is not None:
+            self._discard(track_id, cell)
+        extent = self._extent_of.pop(track_id, None)
+        if extent is not None and extent >= self._max_extent:
+            self._max_stale = True
+
+    def clear(self) -> None:
+        self._cells.clear()
+        self._cell_of.clear()
+        self._extent_of.clear()
+        self._max_extent = 0.0
+        self._max_stale = False
+
+    def query(self, boxes: List[np.ndarray]) -> Set[int]:
+        """Tracks indexados que podem se sobrepor a alguma das caixas xyxy."""
+        candidates: Set[int] = set()
+        max_extent = self._current_max_extent()
+        for x1, y1, x2, y2 in boxes:
+            cx = math.floor((x1 + x2) / 2 / self.cell_size)
+            cy = math.floor((y1 + y2) / 2 / self.cell_size)
+            # Centros a menos de (dimensão nova + maior dimensão indexada) / 2
+            reach = (max(x2 - x1, y2 - y1) + max_extent) / 2
+            radius = max(1, math.ceil(reach / self.cell_size))
+
+            if (2 * radius + 1) ** 2 >= len(self._cells):
+                # Vizinhança maior que a grade ocupada: percorre só as células existentes
+                for (gx, gy), members in self._cells.items():
+                    if abs(gx - cx) <= radius and abs(gy - cy) <= radius:
+                        candidates |= members
+                continue
+
+            for gx in range(cx - radius, cx + radius + 1):
+                for gy in range(cy - radius, cy + radius + 1):
+                    members = self._cells.get((gx, gy))
+                    if members:
+                        candidates |= members
+        return candidates
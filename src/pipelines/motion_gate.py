@@ -0,0 +1,68 @@
+import cv2
+import numpy as np
+from typing import List, Tuple
+
+from src.setup.config import MotionGateConfig
+
+
+class MotionGate:
+    """
+    Decide, em baixa resolução, se algo se moveu dentro da região de tracking.
+
+    Mantém um fundo por média móvel (cv2.accumulateWeighted) e mede a fração
+    de pixels da região que diferem dele.
+    """
+
+    def __init__(self, region: List[List[int]], frame_size: Tuple[int, int], config: MotionGateConfig):
+        self.config = config
+
+        width, height = frame_size
+        scale = config.GATE_RESIZE_WIDTH / width if width > 0 else 1.0
+        self.small_size = (max(1, int(width * scale)), max(1, int(height * scale)))
+
+        region_small = (np.array(region, dtype=np.float32) * scale).astype(np.int32)
+        self.mask = np.zeros((self.small_size[1], self.small_size[0]), dtype=np.uint8)
+        cv2.fillPoly(self.mask, [region_small.reshape((-1, 1, 2))], 255)
+        self.mask_area = max(1, cv2.countNonZero(self.mask))
+
+        ksize = config.GATE_BLUR_KSIZE | 1  # GaussianBlur exige tamanho ímpar
+        self.blur_ksize = (ksize, ksize)
+        self.background = None
+
+        self.evaluated_frames = 0
+        self.skipped_frames = 0
+        self.last_changed_ratio = 0.0
+
+    def has_motion(self, frame: np.ndarray) -> bool:
+        small = cv2.resize(frame, self.small_size, interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        gray = cv2.GaussianBlur(gray, self.blur_ksize, 0)
+
+        if self.background is None:
+            self.background = gray.astype(np.float32)
+            return True
+
+        diff = cv2.absdiff(gray, cv2.convertScaleAbs(self.background))
+        _, changed = cv2.threshold(diff, self.config.GATE_PIXEL_THRESHOLD, 255, cv2.THRESH_BINARY)
+        changed = cv2.bitwise_and(changed, self.mask)
+        self.last_changed_ratio = cv2.countNonZero(changed) / self.mask_area
+
+        cv2.accumulateWeighted(gray, self.background, self.config.GATE_BACKGROUND_ALPHA)
+        return self.last_changed_ratio >= self.config.GATE_MIN_CHANGED_RATIO
+
+    def should_skip(self, frame: np.ndarray, has_active_tracks: bool) -> bool:
+        # O fundo é atualizado em todo frame, mesmo quando há tracks ativos
+        motion = self.has_motion(frame)
+        skip = not motion and not has_active_tracks
+
+        self.evaluated_frames += 1
+        if skip:
+            self.skipped_frames += 1
+        return skip
+
+    def get_stats(self) -> dict:
+        return {
+            'evaluated_frames': self.evaluated_frames,
+            'skipped_frames': self.skipped_frames,
+            'skipped_ratio': self.skipped_frames / self.evaluated_frames if self.evaluated_frames else 0.0
+        }
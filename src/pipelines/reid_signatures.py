@@ -0,0 +1,100 @@
+from collections import OrderedDict
+from typing import List, Optional, Sequence
+
+import cv2
+import numpy as np
+
+
+class SignatureStore:
+    """
+    Assinaturas de re-identificação por track, com número máximo de entradas.
+
+    Interface de dict; ao exceder max_entries a assinatura escrita há mais
+    tempo é descartada. O TrackingManager remove explicitamente as assinaturas
+    dos tracks perdidos que expiram ou são reassociados.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max(1, int(max_entries))
+        self._data: "OrderedDict[int, np.ndarray]" = OrderedDict()
+
+    def __setitem__(self, track_id: int, signature: np.ndarray) -> None:
+        self._data[track_id] = signature
+        self._data.move_to_end(track_id)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def __getitem__(self, track_id: int) -> np.ndarray:
+        return self._data[track_id]
+
+    def __contains__(self, track_id: int) -> bool:
+        return track_id in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, track_id: int, default=None):
+        return self._data.get(track_id, default)
+
+    def pop(self, track_id: int, default=None):
+        return self._data.pop(track_id, default)
+
+    def items(self):
+        return self._data.items()
+
+    def nbytes(self) -> int:
+        return sum(signature.nbytes for signature in self._data.values())
+
+
+class ReidSignatureExtractor:
+    """
+    Histogramas H-S compactos (float16) para a reassociação de tracks.
+
+    Guarda o frame corrente e o anterior; cada um é convertido para HSV no
+    máximo uma vez, e só quando alguma assinatura é pedida nele. As ROIs são
+    recortadas da imagem HSV já convertida.
+    """
+
+    def __init__(self, bins: Sequence[int] = (16, 16)):
+        self.bins = [int(b) for b in bins]
+        self._frames = [None, None]      # [anterior, corrente]
+        self._hsv = [None, None]
+
+    def begin_frame(self, frame: np.ndarray) -> None:
+        self._frames = [self._frames[1], frame]
+        self._hsv = [self._hsv[1], None]
+
+    def _hsv_frame(self, index: int) -> Optional[np.ndarray]:
+        if self._hsv[index] is None and self._frames[index] is not None:
+            self._hsv[index] = cv2.cvtColor(self._frames[index], cv2.COLOR_BGR2HSV)
+        return self._hsv[index]
+
+    def _compute(self, index: int, boxes: List[np.ndarray]) -> List[Optional[np.ndarray]]:
+        if not boxes:
+            return []
+        hsv = self._hsv_frame(index)
+        if hsv is None:
+            return [None] * len(boxes)
+
+        h, w = hsv.shape[:2]
+        signatures = []
+        for box in boxes:
+            x1, y1, x2, y2 = map(int, box)
+            x1, y1 = max(0, x1), max(0, y1)
+            x2, y2 = min(w, x2), min(h, y2)
+            if x1 >= x2 or y1 >= y2:
+                signatures.append(None)
+                continue
+
+            hist = cv2.calcHist([hsv[y1:y2, x1:x2]], [0, 1], None, self.bins, [0, 180, 0, 256])
+            cv2.normalize(hist, hist, 0, 255, cv2.NORM_MINMAX)
+            signatures.append(hist.astype(np.float16))
+        return signatures
+
+    def compute_current(self, boxes: List[np.ndarray]) -> List[Optional[np.ndarray]]:
+        """Assinaturas das caixas no frame corrente (tracks recém-aparecidos)."""
+        return self._compute(1, boxes)
+
+    def compute_previous(self, boxes: List[np.ndarray]) -> List[Optional[np.ndarray]]:
+        """Assinaturas das caixas no frame anterior (tracks recém-perdidos, vistos por último nele)."""
+        return self._compute(0, boxes)
@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+from scipy.optimize import linear_sum_assignment
+
+from src.utils.geometry import calcular_iou_matriz
+
+BOX_COLUMNS = ['box_x1', 'box_y1', 'box_x2', 'box_y2']
+
+
+class SegmentStitcher:
+    """
+    Une os CSVs de segmentos processados em paralelo num único resultado.
+
+    Segmentos consecutivos compartilham os frames de sobreposição
+    [start_frame, nominal_start). Nesses frames, os tracks do segmento seguinte
+    são associados aos do anterior com as mesmas regras de
+    TrackingManager._reassociate_tracks: mesma classe, IoU >= iou_threshold
+    e atribuição ótima pelo algoritmo húngaro.
+    """
+
+    def __init__(self, iou_threshold: float):
+        self.iou_threshold = iou_threshold
+
+    def stitch(self, segments: list[dict]) -> tuple[pd.DataFrame, int]:
+        """
+        Args:
+            segments: Segmentos em ordem, com 'csv_path', 'start_frame' e 'nominal_start'
+
+        Returns:
+            tuple: DataFrame unificado e número de IDs costurados entre segmentos
+        """
+        merged = None
+        total_stitched = 0
+
+        for segment in segments:
+            df = pd.read_csv(segment['csv_path'])
+
+            if merged is not None and not df.empty:
+                id_map = self._match_boundary(
+                    merged, df, segment['start_frame'], segment['nominal_start']
+                )
+                total_stitched += len(id_map)
+                if id_map:
+                    df['track_id'] = df['track_id'].map(lambda tid: id_map.get(tid, tid))
+
+            # O segmento anterior é a referência para os frames de sobreposição
+            df = df[df['frame_id'] >= segment['nominal_start']]
+            merged = df if merged is None else pd.concat([merged, df], ignore_index=True)
+
+        if merged is None:
+            merged = pd.DataFrame()
+        return merged, total_stitched
+
+    def _match_boundary(
+        self,
+        anterior: pd.DataFrame,
+        atual: pd.DataFrame,
+        overlap_start: int,
+        overlap_end: int
+    ) -> dict[int, int]:
+        prev_overlap = anterior[(anterior['frame_id'] >= overlap_start) & (anterior['frame_id'] < overlap_end)]
+        cur_overlap = atual[(atual['frame_id'] >= overlap_start) & (atual['frame_id'] < overlap_end)]
+
+        if prev_overlap.empty or cur_overlap.empty:
+            return {}
+
+        prev_ids = list(prev_overlap['track_id'].unique())
+        cur_ids = list(cur_overlap['track_id'].unique())
+        prev_index = {tid: i for i, tid in enumerate(prev_ids)}
+        cur_index = {tid: j for j, tid in enumerate(cur_ids)}
+
+        iou_sum = np.zeros((len(prev_ids), len(cur_ids)))
+        cur_frames = cur_overlap.groupby('track_id').size()
+        prev_by_frame = dict(tuple(prev_overlap.groupby('frame_id')))
+
+        for frame_id, cur_rows in cur_overlap.groupby('frame_id'):
+            prev_rows = prev_by_frame.get(frame_id)
+            if prev_rows is None:
+                continue
+
+            prev_rows_idx = prev_rows['track_id'].map(prev_index).to_numpy()
+            cur_rows_idx = cur_rows['track_id'].map(cur_index).to_numpy()
+            iou = calcular_iou_matriz(
+                prev_rows[BOX_COLUMNS].to_numpy(dtype=np.float32),
+                cur_rows[BOX_COLUMNS].to_numpy(dtype=np.float32)
+            )
+            mesma_classe = prev_rows['classe'].to_numpy()[:, None] == cur_rows['classe'].to_numpy()[None, :]
+            valido = mesma_classe & (iou >= self.iou_threshold)
+
+            rows, cols = np.nonzero(valido)
+            np.add.at(iou_sum, (prev_rows_idx[rows], cur_rows_idx[cols]), iou[rows, cols])
+
+        # Custo = 1 - IoU médio sobre os frames em que o track novo aparece
+        frames_por_track = np.array([cur_frames[tid] for tid in cur_ids], dtype=float)
+        cost_matrix = np.where(iou_sum > 0, 1 - iou_sum / frames_por_track[np.newaxis, :], np.inf)
+
+        if not np.isfinite(cost_matrix).any():
+            return {}
+
+        finite_cost = np.where(np.isfinite(cost_matrix), cost_matrix, 1e6)
+        row_indices, col_indices = linear_sum_assignment(finite_cost)
+
+        id_map = {}
+        for row, col in zip(row_indices, col_indices):
+            if np.isinf(cost_matrix[row, col]):
+                continue
+            id_map[cur_ids[col]] = prev_ids[row]
+        return id_map
@@ -1,75 +1,210 @@
 import cv2
 import numpy as np
 import math
-from typing import Optional
+from typing import Dict, List, Optional, Sequence
 
 from src.setup.config import CalculationConfig, TrackingConfig
 
+INITIAL_CAPACITY = 64
+MIN_UPDATES_FOR_STABLE_SPEED = 3
+
+
 class SpeedCalculator:
+    """
+    Banco de filtros de Kalman (velocidade constante, estado [x, y, vx, vy] no
+    plano métrico) para todos os tracks, em arrays struct-of-arrays.
+
+    Cada track ocupa um slot de _state (N, 4) e _cov (N, 4, 4); slots liberados
+    por remove_filter voltam para a lista livre. Predição e correção de todos os
+    tracks de um frame são feitas numa única operação vetorizada, com uma única
+    chamada de homografia.
+    """
+
     def __init__(self, fps: float, matriz_perspectiva: np.ndarray, calculation_config: CalculationConfig, kalman_config: TrackingConfig):
         self.fps = fps
-        self.filtros_kalman = {}
-        self.update_counts = {} 
         self.calculation_config = calculation_config
         self.kalman_config = kalman_config
         self.matriz_perspectiva = matriz_perspectiva
+        self.matriz_inversa = np.linalg.inv(matriz_perspectiva)
 
-    def _criar_filtro_kalman(self):
-        kf = cv2.KalmanFilter(4, 2)
         dt = 1.0 / self.fps
-        kf.transitionMatrix = np.array([[1, 0, dt, 0], [0, 1, 0, dt], [0, 0, 1, 0], [0, 0, 0, 1]], np.float32)
-        kf.measurementMatrix = np.array([[1, 0, 0, 0], [0, 1, 0, 0]], np.float32)
-        kf.processNoiseCov = np.eye(4, dtype=np.float32) * self.kalman_config.KALMAN_PROCESS_NOISE
-        kf.measurementNoiseCov = np.eye(2, dtype=np.float32) * self.kalman_config.KALMAN_MEASUREMENT_NOISE
-        return kf
+        self._F = np.array([[1, 0, dt, 0], [0, 1, 0, dt], [0, 0, 1, 0], [0, 0, 0, 1]], np.float64)
+        self._Q = np.eye(4) * self.kalman_config.KALMAN_PROCESS_NOISE
+        self._R = np.eye(2) * self.kalman_config.KALMAN_MEASUREMENT_NOISE
 
-    def update_position(self, track_id: int, ponto_central: tuple):
+        self._slots: Dict[int, int] = {}
+        self._allocate(INITIAL_CAPACITY)
 
-        if ponto_central is None:
-            return
-        
-        px, py = ponto_central
-        if not (math.isfinite(px) and math.isfinite(py)):
+    def _allocate(self, capacity: int) -> None:
+        self._state = np.zeros((capacity, 4))
+        self._cov = np.zeros((capacity, 4, 4))
+        self._counts = np.zeros(capacity, dtype=np.int64)
+        # Predições sem medição aplicadas desde a última correção de cada slot
+        self._steps = np.zeros(capacity, dtype=np.int64)
+        self._free: List[int] = list(range(capacity - 1, -1, -1))
+
+    def _grow(self) -> None:
+        old_capacity = len(self._state)
+        capacity = old_capacity * 2
+        self._state = np.concatenate([self._state, np.zeros((old_capacity, 4))])
+        self._cov = np.concatenate([self._cov, np.zeros((old_capacity, 4, 4))])
+        self._counts = np.concatenate([self._counts, np.zeros(old_capacity, dtype=np.int64)])
+        self._steps = np.concatenate([self._steps, np.zeros(old_capacity, dtype=np.int64)])
+        self._free.extend(range(capacity - 1, old_capacity - 1, -1))
+
+    def _acquire_slot(self, track_id: int) -> int:
+        if not self._free:
+            self._grow()
+        slot = self._free.pop()
+        self._slots[track_id] = slot
+        return slot
+
+    def _predict(self, slots: np.ndarray) -> None:
+        self._state[slots] = self._state[slots] @ self._F.T
+        self._cov[slots] = self._F @ self._cov[slots] @ self._F.T + self._Q
+
+    def _correct(self, slots: np.ndarray, medicoes: np.ndarray) -> None:
+        cov = self._cov[slots]
+        s = cov[:, :2, :2] + self._R                                    # (K, 2, 2)
+        gain = np.linalg.solve(s, cov[:, :2, :]).transpose(0, 2, 1)    # (K, 4, 2)
+        innovation = medicoes - self._state[slots, :2]
+
+        self._state[slots] += (gain @ innovation[:, :, None])[:, :, 0]
+        self._cov[slots] = cov - gain @ cov[:, :2, :]
+
+    def update_positions(self, track_ids: Sequence[int], pontos_centrais: np.ndarray) -> None:
+        """Atualiza os filtros de vários tracks com os pontos de ancoragem (pixels) do frame."""
+        if len(track_ids) == 0:
             return
 
-        ponto_np = np.array([[[ponto_central[0], ponto_central[1]]]], dtype=np.float32)
-        ponto_transformado = cv2.perspectiveTransform(ponto_np, self.matriz_perspectiva)[0][0]
+        pontos = np.asarray(pontos_centrais, dtype=np.float32).reshape(-1, 2)
+        validos = np.isfinite(pontos).all(axis=1)
+        transformados = np.full(pontos.shape, np.nan, dtype=np.float32)
+        if validos.any():
+            transformados[validos] = cv2.perspectiveTransform(
+                pontos[validos].reshape(-1, 1, 2), self.matriz_perspectiva
+            ).reshape(-1, 2)
+        validos &= np.isfinite(transformados).all(axis=1)
 
-        if not np.all(np.isfinite(ponto_transformado)):
+        slots = []
+        for track_id, medicao, valido in zip(track_ids, transformados, validos):
+            if not valido:
+                continue
+            slot = self._slots.get(track_id)
+            if slot is None:
+                # Filtro novo: parte da própria medição, com velocidade e covariância nulas
+                slot = self._acquire_slot(track_id)
+                self._state[slot] = (medicao[0], medicao[1], 0.0, 0.0)
+                self._cov[slot] = 0.0
+                self._counts[slot] = 1
+            slots.append(slot)
+
+        if not slots:
             return
+        slots = np.asarray(slots, dtype=np.int64)
+        self._counts[slots] += 1
+        self._steps[slots] = 0
+        self._predict(slots)
+        self._correct(slots, transformados[validos].astype(np.float64))
+
+    def update_position(self, track_id: int, ponto_central: tuple):
+        if ponto_central is None:
+            return
+        self.update_positions([track_id], np.array([ponto_central], dtype=np.float32))
+
+    def predict_positions(self, track_ids: Sequence[int]) -> List[Optional[tuple]]:
+        """Avança os filtros um frame sem medição e retorna os pontos previstos em pixels."""
+        resultado: List[Optional[tuple]] = [None] * len(track_ids)
+        indices = [i for i, track_id in enumerate(track_ids) if track_id in self._slots]
+        if not indices:
+            return resultado
+
+        slots = np.array([self._slots[track_ids[i]] for i in indices], dtype=np.int64)
+        self._predict(slots)
+        self._steps[slots] += 1
+        pontos = self._state[slots, :2].astype(np.float32).reshape(-1, 1, 2)
+        pixels = cv2.perspectiveTransform(pontos, self.matriz_inversa).reshape(-1, 2)
 
-        medicao = np.array([ponto_transformado[0], ponto_transformado[1]], dtype=np.float32)
+        for i, ponto_pixel in zip(indices, pixels):
+            if np.all(np.isfinite(ponto_pixel)):
+                resultado[i] = (float(ponto_pixel[0]), float(ponto_pixel[1]))
+        return resultado
 
-        if track_id not in self.filtros_kalman:
-            kf = self._criar_filtro_kalman()
-            kf.statePost = np.array([medicao[0], medicao[1], 0, 0], dtype=np.float32)
-            self.filtros_kalman[track_id] = kf
-            self.update_counts[track_id] = 1
-        
-        kf = self.filtros_kalman[track_id]
+    def extrapolate_positions(self, track_ids: Sequence[int], frames_ahead: np.ndarray) -> np.ndarray:
+        """
+        Posições (pixels) a frames_ahead frames da última medição, por
+        velocidade constante, sem alterar os filtros. Os passos já aplicados por
+        predict_positions desde a medição são descontados. NaN para tracks sem
+        filtro.
+        """
+        resultado = np.full((len(track_ids), 2), np.nan, dtype=np.float32)
+        indices = [i for i, track_id in enumerate(track_ids) if track_id in self._slots]
+        if not indices:
+            return resultado
 
-        self.update_counts[track_id] = self.update_counts.get(track_id, 0) + 1
+        slots = np.array([self._slots[track_ids[i]] for i in indices], dtype=np.int64)
+        passos = np.asarray(frames_ahead, dtype=np.float64).reshape(-1)[indices] - self._steps[slots]
+        passos = np.maximum(passos, 0.0) / self.fps
+        estados = self._state[slots]
+        pontos = estados[:, :2] + estados[:, 2:] * passos[:, None]
+        resultado[indices] = cv2.perspectiveTransform(
+            pontos.astype(np.float32).reshape(-1, 1, 2), self.matriz_inversa
+        ).reshape(-1, 2)
+        return resultado
 
-        kf.predict()
-        kf.correct(medicao)
+    def predict_position(self, track_id: int) -> Optional[tuple]:
+        return self.predict_positions([track_id])[0]
 
     def get_speed(self, track_id: int) -> Optional[float]:
-        min_updates_for_stable_speed = 3
-        if track_id not in self.filtros_kalman or self.update_counts.get(track_id, 0) < min_updates_for_stable_speed:
+        slot = self._slots.get(track_id)
+        if slot is None or self._counts[slot] < MIN_UPDATES_FOR_STABLE_SPEED:
             return None
 
-        kf = self.filtros_kalman[track_id]
-        _, _, vx, vy = kf.statePost.flatten()
+        _, _, vx, vy = self._state[slot]
 
         velocidade_mmps = math.hypot(vx, vy)
         velocidade_mps = velocidade_mmps / self.calculation_config.MMPS_TO_MPS_CONVERSION
         velocidade_kmh = velocidade_mps * self.calculation_config.MPS_TO_KMH_CONVERSION
-        
+
         if self.calculation_config.SPEED_MIN_KMH < velocidade_kmh < self.calculation_config.SPEED_MAX_KMH:
             return velocidade_kmh
-        
+
         return None
 
+    def get_state(self) -> dict:
+        track_ids = list(self._slots.keys())
+        slots = np.array([self._slots[track_id] for track_id in track_ids], dtype=np.int64)
+        return {
+            'track_ids': track_ids,
+            'states': self._state[slots].copy(),
+            'covs': self._cov[slots].copy(),
+            'counts': self._counts[slots].copy(),
+            'steps': self._steps[slots].copy()
+        }
+
+    def load_state(self, state: dict) -> None:
+        track_ids = state['track_ids']
+        capacity = INITIAL_CAPACITY
+        while capacity < len(track_ids):
+            capacity *= 2
+
+        self._slots = {}
+        self._allocate(capacity)
+        for track_id, estado, cov, count, steps in zip(
+            track_ids, state['states'], state['covs'], state['counts'], state['steps']
+        ):
+            slot = self._acquire_slot(track_id)
+            self._state[slot] = estado
+            self._cov[slot] = cov
+            self._counts[slot] = count
+            self._steps[slot] = steps
+
     def remove_filter(self, track_id: int):
-        self.filtros_kalman.pop(track_id, None)
-        self.update_counts.pop(track_id, None)
+        slot = self._slots.pop(track_id, None)
+        if slot is not None:
+            self._counts[slot] = 0
+            self._steps[slot] = 0
+            self._free.append(slot)
+
+    def active_count(self) -> int:
+        return len(self._slots)
@@ -9,7 +9,8 @@ class TrackDataCollector:
         tracked_obj: TrackedObject,
         det: Detection,
         frame_count: int,
+        interpolado: bool = False,
     ) -> tuple[dict, dict]:
-        registro_data = tracked_obj.to_csv_record(frame_count, det.confidence)
+        registro_data = tracked_obj.to_csv_record(frame_count, det.confidence, interpolado)
         annotation_data = tracked_obj.to_annotation_data()
         return registro_data, annotation_data
@@ -2,12 +2,13 @@ import numpy as np
 from typing import Dict, Optional, Tuple, List
 
 from src.models.tracked_object import TrackedObject
-from src.models.data_models import Detection
-from src.utils.geometry import check_bbox_in_masks
+from src.models.data_models import Detection, DetectionBatch
 from src.pipelines.tracking_manager import TrackingManager
 from src.pipelines.speed_calculator import SpeedCalculator
 from src.pipelines.track_processor import TrackProcessor
 from src.pipelines.track_data_collector import TrackDataCollector
+from src.pipelines.zone_raster import ZoneRaster, ZONA_VALIDACAO
+from src.pipelines.vehicle_summary import VehicleSummaryAggregator
 from src.setup.config import GeometryConfig
 
 
@@ -17,29 +18,37 @@ class TrackLifecycleManager:
         self,
         tracking_manager: TrackingManager,
         geometry_config: GeometryConfig,
+        zone_raster: ZoneRaster,
         speed_calc: Optional[SpeedCalculator] = None,
         track_processor: Optional[TrackProcessor] = None,
         track_data_collector: Optional[TrackDataCollector] = None,
+        vehicle_summary: Optional[VehicleSummaryAggregator] = None,
     ):
         self.tracking_manager = tracking_manager
         self.geometry_config = geometry_config
+        self.zone_raster = zone_raster
         self.speed_calc = speed_calc
         self.track_processor = track_processor
         self.track_data_collector = track_data_collector
+        self.vehicle_summary = vehicle_summary
 
         self.tracked_objects: Dict[int, TrackedObject] = {}
+        self.last_detection_frame: Optional[int] = None
 
     def process_all_tracks(
         self,
-        scaled_detections: list[Detection],
+        scaled_detections: DetectionBatch,
         frame: np.ndarray,
         frame_count: int,
         histogram_map: dict[int, np.ndarray],
     ) -> Tuple[List[dict], List[dict]]:
 
-        final_detections = self.tracking_manager.resolve_detection_collisions(
+        self.last_detection_frame = frame_count
+        final_ids, resolved = self.tracking_manager.resolve_detection_collisions(
             scaled_detections
         )
+        # Objetos Detection apenas para os tracks que seguem para o processamento individual
+        final_detections = dict(zip(final_ids.tolist(), resolved.to_detections()))
 
         histogram_by_final_id = {
             final_id: histogram_map[det.track_id]
@@ -47,51 +56,116 @@ class TrackLifecycleManager:
             if det.track_id in histogram_map
         }
 
+        tracked = []
+        for final_id, det in final_detections.items():
+            tracked_obj = self._get_or_create_tracked_object(
+                final_id, det, det.box, frame_count
+            )
+            self._update_continuous_tracking(tracked_obj, det.box, frame_count)
+            tracked_obj.confidence = det.confidence
+            tracked.append((tracked_obj, det))
+
+        if self.speed_calc:
+            # Ponto de ancoragem (centro da base) de todos os tracks: uma atualização do banco de Kalman
+            boxes = resolved.boxes
+            anchors = np.column_stack([(boxes[:, 0] + boxes[:, 2]) / 2, boxes[:, 3]])
+            self.speed_calc.update_positions(final_ids.tolist(), anchors)
+
+        # Faixa e zona de todos os tracks numa única consulta ao raster
+        lane_labels, zone_flags = self.zone_raster.lookup(resolved.boxes)
+
         all_csv_records = []
         all_annotation_data = []
 
-        for final_id, det in final_detections.items():
-            csv_record, annotation_data = self._process_single_track(
-                final_id, det, frame, frame_count,
-                histogram_by_final_id
-            )
-            if csv_record:
-                all_csv_records.append(csv_record)
-            if annotation_data:
-                all_annotation_data.append(annotation_data)
-        
+        in_zone = []
+        for (tracked_obj, det), lane_label, flags in zip(tracked, lane_labels.tolist(), zone_flags.tolist()):
+            if self.track_processor and flags & ZONA_VALIDACAO:
+                self.track_processor.process_track(
+                    tracked_obj, frame_count, histogram_by_final_id,
+                    self.zone_raster.lane_name(lane_label)
+                )
+                in_zone.append((tracked_obj, det))
+            else:
+                tracked_obj.velocidade_kmh = None
+
+        if in_zone:
+            # Cor dominante de todos os tracks vencidos numa única passada sobre o frame
+            self.track_processor.update_features([obj for obj, _ in in_zone], frame, frame_count)
+
+        if self.vehicle_summary:
+            for tracked_obj, _ in in_zone:
+                self.vehicle_summary.update(tracked_obj, frame_count)
+
+        if self.track_data_collector:
+            for tracked_obj, det in in_zone:
+                csv_record, annotation_data = self.track_data_collector.collect_data(
+                    tracked_obj, det, frame_count
+                )
+                if csv_record:
+                    all_csv_records.append(csv_record)
+                if annotation_data:
+                    all_annotation_data.append(annotation_data)
+
         return all_csv_records, all_annotation_data
 
-    def _process_single_track(
+    def predict_all_tracks(
         self,
-        final_id: int,
-        det: Detection,
-        frame: np.ndarray,
         frame_count: int,
-        histogram_by_final_id: dict[int, np.ndarray],
-    ) -> Tuple[Optional[dict], Optional[dict]]:
-        
-        tracked_obj = self._get_or_create_tracked_object(
-            final_id, det, det.box, frame_count
-        )
+    ) -> Tuple[List[dict], List[dict]]:
+        """Preenche um frame sem detecção com as posições previstas pelo Kalman."""
 
-        self._update_continuous_tracking(tracked_obj, det.box, final_id, frame_count)
+        all_csv_records = []
+        all_annotation_data = []
+
+        # Apenas tracks visíveis na última detecção são extrapolados
+        visiveis = [
+            tracked_obj for tracked_obj in self.tracked_objects.values()
+            if tracked_obj.last_seen_frame == self.last_detection_frame
+        ]
+        if self.speed_calc:
+            pontos_previstos = self.speed_calc.predict_positions([obj.id for obj in visiveis])
+        else:
+            pontos_previstos = [None] * len(visiveis)
 
-        if self.track_processor and self._is_in_validation_zone(tracked_obj.box):
+        for tracked_obj, ponto_previsto in zip(visiveis, pontos_previstos):
+            self._predict_box(tracked_obj, ponto_previsto)
 
-            self.track_processor.process_track(
-                tracked_obj, frame, frame_count, histogram_by_final_id
-            )
+        boxes = np.array([obj.box for obj in visiveis], dtype=np.float32).reshape(-1, 4)
+        lane_labels, zone_flags = self.zone_raster.lookup(boxes)
 
-            if self.track_data_collector:
-                return self.track_data_collector.collect_data(
-                    tracked_obj, det, frame_count
+        for tracked_obj, lane_label, flags in zip(visiveis, lane_labels.tolist(), zone_flags.tolist()):
+            if self.track_processor and flags & ZONA_VALIDACAO:
+                self.track_processor.process_predicted_track(
+                    tracked_obj, self.zone_raster.lane_name(lane_label)
                 )
-        else:
+                if self.vehicle_summary:
+                    self.vehicle_summary.update(tracked_obj, frame_count)
+
+                if self.track_data_collector:
+                    det = Detection(
+                        track_id=tracked_obj.id,
+                        box=tracked_obj.box,
+                        class_name=tracked_obj.classe,
+                        confidence=tracked_obj.confidence
+                    )
+                    csv_record, annotation_data = self.track_data_collector.collect_data(
+                        tracked_obj, det, frame_count, interpolado=True
+                    )
+                    all_csv_records.append(csv_record)
+                    all_annotation_data.append(annotation_data)
+            else:
+                tracked_obj.velocidade_kmh = None
 
-            tracked_obj.velocidade_kmh = None
+        return all_csv_records, all_annotation_data
 
-        return None, None
+    def _predict_box(self, tracked_obj: TrackedObject, ponto_previsto: Optional[tuple]) -> None:
+        if ponto_previsto is None:
+            return
+
+        box = tracked_obj.box
+        dx = ponto_previsto[0] - (box[0] + box[2]) / 2
+        dy = ponto_previsto[1] - box[3]
+        tracked_obj.box = box + np.array([dx, dy, dx, dy], dtype=box.dtype)
 
     def _get_or_create_tracked_object(self, final_id: int, det: Detection, box: np.ndarray, frame_count: int) -> TrackedObject:
         if final_id not in self.tracked_objects:
@@ -102,26 +176,13 @@ class TrackLifecycleManager:
         return self.tracked_objects[final_id]
 
     def _update_continuous_tracking(
-        self, tracked_obj: TrackedObject, box: np.ndarray, final_id: int, frame_count: int
+        self, tracked_obj: TrackedObject, box: np.ndarray, frame_count: int
     ) -> None:
         
         tracked_obj.box = box.copy()
         tracked_obj.last_seen_frame = frame_count
 
-        if self.speed_calc:
-            x_centro = (box[0] + box[2]) / 2
-            y_base = box[3]
-            ponto_central = (x_centro, y_base)
-            self.speed_calc.update_position(final_id, ponto_central)
-
-    def _is_in_validation_zone(self, box: np.ndarray) -> bool:
-
-        if not self.geometry_config.ZONA_DE_VALIDACAO:
-            return False
-        validation_mask = {'validation': self.geometry_config.ZONA_DE_VALIDACAO}
-        return check_bbox_in_masks(box, validation_mask)
-
-    def clear_stale_objects(self, frame_count: int, current_detections: list[Detection]) -> None:
+    def clear_stale_objects(self, frame_count: int, current_detections: DetectionBatch) -> None:
 
         stale_ids = self.tracking_manager.get_stale_track_ids(
             current_detections=current_detections,
@@ -132,11 +193,30 @@ class TrackLifecycleManager:
         for stale_id in stale_ids:
             if stale_id in self.tracked_objects:
                 del self.tracked_objects[stale_id]
+            if self.vehicle_summary:
+                self.vehicle_summary.finalize(stale_id)
             if self.speed_calc:
                 self.speed_calc.remove_filter(stale_id)
 
+    def get_state(self) -> dict:
+        return {
+            'tracked_objects': self.tracked_objects,
+            'last_detection_frame': self.last_detection_frame,
+            'vehicle_summary': self.vehicle_summary.get_state() if self.vehicle_summary else None
+        }
+
+    def load_state(self, state: dict) -> None:
+        self.tracked_objects = state['tracked_objects']
+        self.last_detection_frame = state['last_detection_frame']
+        if self.vehicle_summary and state.get('vehicle_summary'):
+            self.vehicle_summary.load_state(state['vehicle_summary'])
+
     def cleanup_all_tracking(self) -> None:
 
+        # Encerramento: veículos ainda ativos são finalizados no resumo
+        if self.vehicle_summary:
+            self.vehicle_summary.finalize_all()
+
         if self.speed_calc:
             for track_id in list(self.tracked_objects.keys()):
                 self.speed_calc.remove_filter(track_id)
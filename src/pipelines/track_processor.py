@@ -1,9 +1,8 @@
 import numpy as np
-from typing import Optional
+from typing import List, Optional
 
 from src.models.tracked_object import TrackedObject
-from src.utils.geometry import check_bbox_in_masks
-from src.pipelines.feature_extractor import FeatureExtractor
+from src.pipelines.color_engine import BatchedColorExtractor
 from src.pipelines.speed_calculator import SpeedCalculator
 from src.setup.config import GeometryConfig, ColorConfig
 
@@ -20,24 +19,33 @@ class TrackProcessor:
         self.color_config = color_config
         self.background_color_to_ignore = background_color_to_ignore
         self.speed_calc = speed_calc
+        self.color_extractor = BatchedColorExtractor(color_config, background_color_to_ignore)
+
+        # Contadores da política de recálculo de cor
+        self.color_computations = 0
+        self.color_skipped_frozen = 0
+        self.frozen_tracks = 0
 
     def process_track(
         self,
         tracked_obj: TrackedObject,
-        frame: np.ndarray,
         frame_count: int,
         histogram_by_id: dict[int, np.ndarray],
+        faixa: Optional[str],
     ) -> None:
-        self._update_lane(tracked_obj)
+        # A cor é atualizada depois, em lote, por update_features
+        self._update_lane(tracked_obj, faixa)
         self._update_histogram(tracked_obj, histogram_by_id)
-        self._update_features(tracked_obj, frame, frame_count)
         self._update_speed(tracked_obj)
 
-    def _update_lane(self, tracked_obj: TrackedObject) -> None:
-        tracked_obj.faixa = check_bbox_in_masks(
-            tracked_obj.box,
-            self.geometry_config.MASCARAS_FAIXAS
-        )
+    def process_predicted_track(self, tracked_obj: TrackedObject, faixa: Optional[str]) -> None:
+        # Frames sem detecção: apenas faixa e velocidade, sem extração de cor
+        self._update_lane(tracked_obj, faixa)
+        self._update_speed(tracked_obj)
+
+    def _update_lane(self, tracked_obj: TrackedObject, faixa: Optional[str]) -> None:
+        # A faixa vem da consulta em lote ao ZoneRaster feita pelo TrackLifecycleManager
+        tracked_obj.faixa = faixa
 
     def _update_histogram(
         self,
@@ -48,29 +56,76 @@ class TrackProcessor:
         if tracked_obj.id in histogram_by_id:
             tracked_obj.histogram = histogram_by_id[tracked_obj.id]
 
-    def _update_features(
-        self, tracked_obj: TrackedObject, frame: np.ndarray, frame_count: int
-    ) -> None:
+    def _is_feature_update_due(self, tracked_obj: TrackedObject, frame_count: int) -> bool:
         is_first_update = tracked_obj.last_feature_update == -1
         interval_passed = (is_first_update is False) and \
                           ((frame_count - tracked_obj.last_feature_update) >= self.color_config.RECALCULATION_INTERVAL)
+        return is_first_update or interval_passed
+
+    def update_features(
+        self, tracked_objs: List[TrackedObject], frame: np.ndarray, frame_count: int
+    ) -> None:
+        """Recalcula a cor dominante de todos os tracks vencidos do frame numa única chamada."""
+        due = []
+        for tracked_obj in tracked_objs:
+            if not self._is_feature_update_due(tracked_obj, frame_count):
+                continue
+            if tracked_obj.color_frozen:
+                # Cor já estabilizada: o recálculo periódico é evitado
+                self.color_skipped_frozen += 1
+                tracked_obj.last_feature_update = frame_count
+                continue
+            due.append(tracked_obj)
+        if not due:
+            return
 
-        if is_first_update or interval_passed:
-            new_color = FeatureExtractor.get_dominant_color(
-                frame, tracked_obj.box,
-                k=self.color_config.KMEANS_K_CLUSTERS,
-                max_iter=self.color_config.KMEANS_MAX_ITER,
-                epsilon=self.color_config.KMEANS_EPSILON,
-                attempts=self.color_config.KMEANS_ATTEMPTS,
-                ignore_colors=self.background_color_to_ignore,
-                color_threshold=self.color_config.COLOR_THRESHOLD
-            )
+        boxes = np.array([obj.box for obj in due], dtype=np.float32).reshape(-1, 4)
+        new_colors = self.color_extractor.dominant_colors(frame, boxes)
+        self.color_computations += len(due)
 
+        # Área da caixa dentro do frame: caixas cortadas pela borda valem menos
+        h, w = frame.shape[:2]
+        visible_w = np.clip(boxes[:, 2], 0, w) - np.clip(boxes[:, 0], 0, w)
+        visible_h = np.clip(boxes[:, 3], 0, h) - np.clip(boxes[:, 1], 0, h)
+        visible_areas = (np.maximum(visible_w, 0) * np.maximum(visible_h, 0)).tolist()
+
+        for tracked_obj, new_color, area in zip(due, new_colors, visible_areas):
             if new_color is not None:
                 tracked_obj.dominant_color = new_color
+                self._register_color_sample(tracked_obj, new_color, area)
 
             tracked_obj.last_feature_update = frame_count
 
+    def _register_color_sample(self, tracked_obj: TrackedObject, color: tuple, area: float) -> None:
+        samples_needed = self.color_config.COLOR_STABLE_SAMPLES
+        if samples_needed <= 0:
+            return
+
+        tracked_obj.color_samples.append((color, area))
+        del tracked_obj.color_samples[:-samples_needed]
+        if len(tracked_obj.color_samples) < samples_needed:
+            return
+
+        colors = np.array([c for c, _ in tracked_obj.color_samples], dtype=np.float32)
+        spread = np.linalg.norm(colors[:, None, :] - colors[None, :, :], axis=2).max()
+        if spread > self.color_config.COLOR_STABLE_DISTANCE:
+            return
+
+        # Estimativa estável: fica a amostra da caixa mais visível
+        tracked_obj.dominant_color = max(tracked_obj.color_samples, key=lambda sample: sample[1])[0]
+        tracked_obj.color_frozen = True
+        tracked_obj.color_samples = []
+        self.frozen_tracks += 1
+
+    def get_color_stats(self) -> dict:
+        requested = self.color_computations + self.color_skipped_frozen
+        return {
+            'color_computations': self.color_computations,
+            'color_skipped_frozen': self.color_skipped_frozen,
+            'frozen_tracks': self.frozen_tracks,
+            'skipped_ratio': self.color_skipped_frozen / requested if requested else 0.0
+        }
+
     def _update_speed(self, tracked_obj: TrackedObject) -> None:
 
         if self.speed_calc:
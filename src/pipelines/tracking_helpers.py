@@ -1,42 +1,30 @@
 import numpy as np
 
-from src.models.data_models import Detection
-from src.utils.geometry import scale_bounding_box
+from src.models.data_models import DetectionBatch
 
-def scale_detections(detections: list[Detection], scale_factor: float) -> list[Detection]:
-    if scale_factor == 1.0:
-        return detections
-    
-    scaled_detections = []
-    for det in detections:
-        scaled_box = scale_bounding_box(det.box, scale_factor)
-        scaled_det = Detection(
-            track_id=det.track_id,
-            box=scaled_box,
-            confidence=det.confidence,
-            class_name=det.class_name
-        )
-        scaled_detections.append(scaled_det)
-    
-    return scaled_detections
+def scale_detections(
+    detections: DetectionBatch,
+    scale_factor: float,
+    offset: tuple[int, int] = (0, 0)
+) -> DetectionBatch:
+    # offset: canto superior esquerdo do recorte de inferência no frame original
+    return detections.scaled(scale_factor, offset)
 
 
 def prepare_tracking_data(
-    scaled_detections: list[Detection], 
+    scaled_detections: DetectionBatch, 
     frame: np.ndarray
 ) -> tuple[dict[int, dict], dict[int, np.ndarray]]:
 
     current_tracks: dict[int, dict] = {}
     histogram_map: dict[int, np.ndarray] = {}
 
-    for det in scaled_detections:
-        original_id: int = det.track_id
-        box: np.ndarray = det.box
-        classe_nome: str = det.class_name
-
+    for original_id, box, class_id in zip(
+        scaled_detections.track_ids.tolist(), scaled_detections.boxes, scaled_detections.class_ids.tolist()
+    ):
         current_tracks[original_id] = {
             'box': box,
-            'classe': classe_nome,
+            'classe': scaled_detections.class_name(class_id),
             'histogram': None 
         }
         
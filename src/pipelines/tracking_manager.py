@@ -1,23 +1,56 @@
+import heapq
 import numpy as np
+from typing import Optional
 from scipy.optimize import linear_sum_assignment
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components
 
 from src.pipelines.feature_extractor import FeatureExtractor
-from src.utils.geometry import calcular_iou
-from src.models.data_models import Detection
+from src.pipelines.reid_signatures import ReidSignatureExtractor, SignatureStore
+from src.pipelines.lost_track_index import LostTrackIndex
+from src.pipelines.identity_map import IdentityMap
+from src.pipelines.speed_calculator import SpeedCalculator
+from src.utils.geometry import calcular_iou_matriz
+from src.models.data_models import DetectionBatch
+
+# Custo dos pares incompatíveis na atribuição (acima de qualquer custo válido, que é <= 1)
+INVALID_PAIR_COST = 1e6
 
 class TrackingManager:
-    def __init__(self, max_frames_lost: int, iou_threshold: float, color_weight: float):
-        self.id_map = {}
+    def __init__(
+        self,
+        max_frames_lost: int,
+        iou_threshold: float,
+        color_weight: float,
+        signature_extractor: Optional[ReidSignatureExtractor] = None,
+        max_signatures: int = 2048,
+        speed_calc: Optional[SpeedCalculator] = None,
+        lost_index: Optional[LostTrackIndex] = None
+    ):
+        self.id_map = IdentityMap()
         self.track_class_map = {}
-        self.track_histogram_map = {}
+        # Com assinaturas de re-id o armazenamento é limitado; sem elas, dict como antes
+        self.signature_extractor = signature_extractor
+        self.track_histogram_map = SignatureStore(max_signatures) if signature_extractor else {}
         self.lost_tracks = {}
         self.previous_tracks = {}
+        self.previous_frame_count: Optional[int] = None
+        self.last_gc_frame: Optional[int] = None
+
+        # Expiração dos tracks perdidos: min-heap de (frame da perda, id), com remoção preguiçosa
+        self._lost_heap = []
+        # Índice espacial opcional; as posições previstas usam a velocidade do SpeedCalculator
+        self.speed_calc = speed_calc
+        self.lost_index = lost_index
 
         self.max_frames_lost = max_frames_lost
         self.iou_threshold = iou_threshold
         self.color_weight = color_weight
 
-    def update_tracks(self, current_tracks_data: dict, frame_count: int):
+    def update_tracks(self, current_tracks_data: dict, frame_count: int, frame: Optional[np.ndarray] = None):
+
+        if self.signature_extractor and frame is not None:
+            self.signature_extractor.begin_frame(frame)
 
         for track_id, data in current_tracks_data.items():
             if data.get('histogram') is not None:
@@ -28,91 +61,146 @@ class TrackingManager:
 
         previous_ids = set(self.previous_tracks.keys())
         current_ids = set(current_tracks.keys())
-
-        self._handle_lost_tracks(previous_ids, current_ids, frame_count)
+        self.id_map.touch(current_ids, frame_count)
 
         new_ids = current_ids - previous_ids
 
+        if self.signature_extractor and frame is not None:
+            self._compute_signatures(previous_ids - current_ids, new_ids, current_tracks)
+
+        self._handle_lost_tracks(previous_ids, current_ids, frame_count)
+
         if new_ids and self.lost_tracks:
-            self._reassociate_tracks(new_ids, current_tracks, current_track_classes)
+            self._reassociate_tracks(new_ids, current_tracks, current_track_classes, frame_count)
 
         self._cleanup_old_lost_tracks(frame_count)
+        self._maybe_collect_garbage(frame_count)
 
         self.previous_tracks = current_tracks
+        self.previous_frame_count = frame_count
+
+    def _compute_signatures(self, lost_ids: set, new_ids: set, current_tracks: dict):
+        # Só tracks recém-perdidos (no frame anterior, onde foram vistos por último) e recém-aparecidos
+        lost_ids = [tid for tid in lost_ids if tid not in self.lost_tracks]
+        lost_signatures = self.signature_extractor.compute_previous(
+            [self.previous_tracks[tid] for tid in lost_ids]
+        )
+        for track_id, signature in zip(lost_ids, lost_signatures):
+            if signature is not None:
+                self.track_histogram_map[track_id] = signature
+
+        if not self.lost_tracks and not lost_ids:
+            # Nenhum candidato à reassociação: assinaturas dos novos não seriam usadas
+            return
+        new_ids = list(new_ids)
+        new_signatures = self.signature_extractor.compute_current([current_tracks[tid] for tid in new_ids])
+        for track_id, signature in zip(new_ids, new_signatures):
+            if signature is not None:
+                self.track_histogram_map[track_id] = signature
 
     def _handle_lost_tracks(self, previous_ids: set, current_ids: set, frame_count: int):
         lost_ids = previous_ids - current_ids
+        last_seen = self.previous_frame_count if self.previous_frame_count is not None else frame_count - 1
+        newly_lost = []
         for lost_id in lost_ids:
             if lost_id not in self.lost_tracks:
                 final_id = self.get_final_id(lost_id)
                 self.lost_tracks[lost_id] = {
                     'box': self.previous_tracks[lost_id],
                     'frame': frame_count,
+                    'last_seen': last_seen,
                     'histogram': self.track_histogram_map.get(lost_id),
                     'classe': self.track_class_map.get(final_id)
                 }
+                heapq.heappush(self._lost_heap, (frame_count, lost_id))
+                newly_lost.append(lost_id)
 
-    def _reassociate_tracks(self, new_ids: set, current_tracks: dict, current_track_classes: dict):
-        new_id_list = list(new_ids)
-        new_boxes = [current_tracks[new_id] for new_id in new_id_list]
-        new_histograms = [self.track_histogram_map.get(new_id) for new_id in new_id_list]
-        new_classes = [current_track_classes.get(new_id) for new_id in new_id_list]
-
-        lost_ids_list = list(self.lost_tracks.keys())
-        lost_items = list(self.lost_tracks.values())
-        lost_boxes = [item['box'] for item in lost_items]
-        lost_histograms = [item['histogram'] for item in lost_items]
-        lost_classes = [item['classe'] for item in lost_items]
-
-        valid_pairs = []
-        for i, lost_class in enumerate(lost_classes):
-            if lost_class is None:
-                continue
-            for j, new_class in enumerate(new_classes):
-                if lost_class == new_class:
-                    valid_pairs.append((i, j))
-        
-        if not valid_pairs:
-            return
-        
-        cost_matrix = np.full((len(lost_boxes), len(new_boxes)), np.inf)
-        has_valid_assignment = False
+        if self.lost_index is not None and newly_lost:
+            self.lost_index.update(newly_lost, [self.lost_tracks[lost_id]['box'] for lost_id in newly_lost])
 
-        for i, j in valid_pairs:
-            lost_box = lost_boxes[i]
-            new_box = new_boxes[j]
+    def _refresh_lost_predictions(self, frame_count: int):
+        # Desloca a última caixa de cada track perdido até a posição extrapolada pelo Kalman;
+        # frames_ahead conta a partir da última detecção (last_seen), e o SpeedCalculator
+        # desconta as predições já aplicadas nos frames sem detecção (DETECTION_STRIDE > 1)
+        lost_ids = list(self.lost_tracks.keys())
+        lost_items = [self.lost_tracks[lost_id] for lost_id in lost_ids]
+        boxes = np.array([item['box'] for item in lost_items], dtype=np.float32).reshape(-1, 4)
 
-            iou = calcular_iou(lost_box, new_box)
-            if iou < self.iou_threshold:
-                continue
+        frames_ahead = np.array(
+            [frame_count - item.get('last_seen', item['frame']) for item in lost_items], dtype=np.float64
+        )
+        anchors = self.speed_calc.extrapolate_positions(
+            [self.get_final_id(lost_id) for lost_id in lost_ids], frames_ahead
+        )
+        shift = anchors - np.column_stack([(boxes[:, 0] + boxes[:, 2]) / 2, boxes[:, 3]])
+        shift[~np.isfinite(shift).all(axis=1)] = 0.0
+        boxes = boxes + np.hstack([shift, shift])
 
-            has_valid_assignment = True
-            lost_hist = lost_histograms[i]
-            new_hist = new_histograms[j]
-            
-            iou_cost = 1 - iou
-            hist_dist = FeatureExtractor.compare_histograms(lost_hist, new_hist)
+        for item, box in zip(lost_items, boxes):
+            item['predicted_box'] = box
+        self.lost_index.update(lost_ids, boxes)
 
-            combined_cost = (1 - self.color_weight) * iou_cost + self.color_weight * hist_dist
-            cost_matrix[i, j] = combined_cost
+    @staticmethod
+    def _class_codes(lost_classes: list, new_classes: list):
+        # Classes como inteiros para comparação vetorizada; sem classe = -1
+        codes = {}
+        def encode(classes):
+            return np.array(
+                [-1 if c is None else codes.setdefault(c, len(codes)) for c in classes],
+                dtype=np.int64
+            )
+        return encode(lost_classes), encode(new_classes)
 
-        if not has_valid_assignment:
+    def _reassociate_tracks(self, new_ids: set, current_tracks: dict, current_track_classes: dict, frame_count: int):
+        new_id_list = list(new_ids)
+
+        if self.lost_index is not None:
+            if self.speed_calc:
+                self._refresh_lost_predictions(frame_count)
+            # Apenas tracks perdidos nas células vizinhas das caixas novas
+            candidates = self.lost_index.query([current_tracks[new_id] for new_id in new_id_list])
+            lost_ids_list = [lost_id for lost_id in self.lost_tracks if lost_id in candidates]
+            if not lost_ids_list:
+                return
+        else:
+            lost_ids_list = list(self.lost_tracks.keys())
+        lost_items = [self.lost_tracks[lost_id] for lost_id in lost_ids_list]
+
+        lost_codes, new_codes = self._class_codes(
+            [item['classe'] for item in lost_items],
+            [current_track_classes.get(new_id) for new_id in new_id_list]
+        )
+        class_mask = (lost_codes[:, None] == new_codes[None, :]) & (lost_codes[:, None] >= 0)
+        if not class_mask.any():
             return
 
-        try:
-            row_indices, col_indices = linear_sum_assignment(cost_matrix)
-        except ValueError:
+        iou = calcular_iou_matriz(
+            np.array([item.get('predicted_box', item['box']) for item in lost_items], dtype=np.float32),
+            np.array([current_tracks[new_id] for new_id in new_id_list], dtype=np.float32)
+        )
+        valid = class_mask & (iou >= self.iou_threshold)
+        if not valid.any():
             return
 
-        reassociated_ids = set()
-        for row, col in zip(row_indices, col_indices):
-            if np.isinf(cost_matrix[row, col]):
-                continue
+        cost_matrix = np.full(valid.shape, np.inf)
+        rows, cols = np.nonzero(valid)
+        hist_dist = np.fromiter(
+            (
+                FeatureExtractor.compare_histograms(
+                    lost_items[i]['histogram'], self.track_histogram_map.get(new_id_list[j])
+                )
+                for i, j in zip(rows.tolist(), cols.tolist())
+            ),
+            dtype=np.float64, count=len(rows)
+        )
+        cost_matrix[rows, cols] = (1 - self.color_weight) * (1 - iou[rows, cols]) + self.color_weight * hist_dist
 
+        reassociated_ids = set()
+        for row, col in self._assign_by_component(valid, cost_matrix):
             lost_id = lost_ids_list[row]
             new_id = new_id_list[col]
             
-            self.id_map[new_id] = self.get_final_id(lost_id)
+            self.id_map.union(new_id, lost_id)
             
             if new_id in self.track_histogram_map:
                 self.track_histogram_map[self.get_final_id(lost_id)] = self.track_histogram_map[new_id]
@@ -122,17 +210,121 @@ class TrackingManager:
         for lost_id in reassociated_ids:
             if lost_id in self.lost_tracks:
                 del self.lost_tracks[lost_id]
+            if self.lost_index is not None:
+                self.lost_index.remove(lost_id)
+            self._evict_signature(lost_id)
+
+    @staticmethod
+    def _assign_by_component(valid: np.ndarray, cost_matrix: np.ndarray) -> list:
+        """
+        Atribuição húngara separada por componentes conexas do grafo bipartido
+        de pares válidos (perdido x novo). Componentes são independentes, então
+        o resultado equivale ao da matriz inteira a um custo bem menor.
+        """
+        num_lost, num_new = valid.shape
+        rows, cols = np.nonzero(valid)
+        graph = csr_matrix(
+            (np.ones(len(rows), dtype=np.int8), (rows, num_lost + cols)),
+            shape=(num_lost + num_new, num_lost + num_new)
+        )
+        _, labels = connected_components(graph, directed=False)
+        lost_labels, new_labels = labels[:num_lost], labels[num_lost:]
+
+        pairs = []
+        for component in np.unique(lost_labels[rows]).tolist():
+            comp_rows = np.flatnonzero(lost_labels == component)
+            comp_cols = np.flatnonzero(new_labels == component)
+            sub_valid = valid[np.ix_(comp_rows, comp_cols)]
+
+            if sub_valid.sum() == 1:
+                # Caso mais comum: um único par candidato
+                i, j = np.argwhere(sub_valid)[0]
+                pairs.append((int(comp_rows[i]), int(comp_cols[j])))
+                continue
+
+            # Custo finito alto nos pares inválidos: a atribuição é sempre viável
+            sub_cost = np.where(sub_valid, cost_matrix[np.ix_(comp_rows, comp_cols)], INVALID_PAIR_COST)
+            row_indices, col_indices = linear_sum_assignment(sub_cost)
+            for i, j in zip(row_indices.tolist(), col_indices.tolist()):
+                if sub_valid[i, j]:
+                    pairs.append((int(comp_rows[i]), int(comp_cols[j])))
+        return pairs
+
+    def _evict_signature(self, lost_id: int):
+        # A assinatura do track perdido vive em lost_tracks; o final_id mantém a sua própria
+        if self.signature_extractor and lost_id != self.get_final_id(lost_id):
+            self.track_histogram_map.pop(lost_id, None)
 
     def _cleanup_old_lost_tracks(self, frame_count: int):
-        ids_to_remove = [
-            lost_id for lost_id, data in self.lost_tracks.items()
-            if frame_count - data['frame'] > self.max_frames_lost
-        ]
-        for lost_id in ids_to_remove:
-            self.lost_tracks.pop(lost_id, None)
+        limite = frame_count - self.max_frames_lost
+        while self._lost_heap and self._lost_heap[0][0] < limite:
+            lost_frame, lost_id = heapq.heappop(self._lost_heap)
+            data = self.lost_tracks.get(lost_id)
+            if data is None or data['frame'] != lost_frame:
+                # Entrada obsoleta: o track foi reassociado (e talvez perdido de novo)
+                continue
+
+            del self.lost_tracks[lost_id]
+            if self.lost_index is not None:
+                self.lost_index.remove(lost_id)
+            if self.signature_extractor:
+                self.track_histogram_map.pop(lost_id, None)
+
+    def _maybe_collect_garbage(self, frame_count: int):
+        # Varredura a cada MAX_FRAMES_LOST frames: custo amortizado constante por frame
+        if self.last_gc_frame is None:
+            self.last_gc_frame = frame_count
+        if frame_count - self.last_gc_frame < self.max_frames_lost:
+            return
+        self.last_gc_frame = frame_count
+
+        keep = set(self.previous_tracks.keys())
+        for lost_id in self.lost_tracks:
+            keep.add(lost_id)
+            keep.add(self.get_final_id(lost_id))
+
+        for dead_id in self.id_map.collect(frame_count, self.max_frames_lost, keep):
+            self.track_class_map.pop(dead_id, None)
+            self.track_histogram_map.pop(dead_id, None)
+
+    def get_resident_counts(self) -> dict:
+        return {
+            'id_map': self.id_map.resident_count(),
+            'track_class_map': len(self.track_class_map),
+            'track_histogram_map': len(self.track_histogram_map),
+            'lost_tracks': len(self.lost_tracks)
+        }
+
+    def get_state(self) -> dict:
+        return {
+            'id_map': self.id_map,
+            'track_class_map': self.track_class_map,
+            'track_histogram_map': self.track_histogram_map,
+            'lost_tracks': self.lost_tracks,
+            'previous_tracks': self.previous_tracks,
+            'previous_frame_count': self.previous_frame_count,
+            'last_gc_frame': self.last_gc_frame
+        }
+
+    def load_state(self, state: dict) -> None:
+        self.id_map = state['id_map']
+        self.track_class_map = state['track_class_map']
+        self.track_histogram_map = state['track_histogram_map']
+        self.lost_tracks = state['lost_tracks']
+        self.previous_tracks = state['previous_tracks']
+        self.previous_frame_count = state.get('previous_frame_count')
+        self.last_gc_frame = state.get('last_gc_frame')
+
+        # Heap e índice espacial são derivados de lost_tracks
+        self._lost_heap = [(data['frame'], lost_id) for lost_id, data in self.lost_tracks.items()]
+        heapq.heapify(self._lost_heap)
+        if self.lost_index is not None:
+            self.lost_index.clear()
+            lost_ids = list(self.lost_tracks.keys())
+            self.lost_index.update(lost_ids, [self.lost_tracks[lost_id]['box'] for lost_id in lost_ids])
 
     def get_final_id(self, original_id: int) -> int:
-        return self.id_map.get(original_id, original_id)
+        return self.id_map.find(original_id)
 
     def get_or_set_class(self, track_id: int, class_name: str) -> str:
         if track_id not in self.track_class_map:
@@ -141,14 +333,14 @@ class TrackingManager:
     
     def get_stale_track_ids(
         self,
-        current_detections: list,
+        current_detections: DetectionBatch,
         tracked_objects: dict,
         frame_count: int
         ) -> list[int]:
 
         current_final_ids = {
-            self.get_final_id(det.track_id) 
-            for det in current_detections
+            self.get_final_id(track_id) 
+            for track_id in current_detections.track_ids.tolist()
         }
         
         absent_ids = set(tracked_objects.keys()) - current_final_ids
@@ -166,19 +358,30 @@ class TrackingManager:
         
     def resolve_detection_collisions(
         self,
-        detections: list[Detection]
-    ) -> dict[int, Detection]:
-    
-        final_id_map: dict[int, Detection] = {}
-        
-        for det in detections:
-            final_id: int = self.get_final_id(det.track_id)
-            
-            # Se já existe detecção para este final_id, mantém a de maior confiança
-            if final_id in final_id_map:
-                if det.confidence > final_id_map[final_id].confidence:
-                    final_id_map[final_id] = det
-            else:
-                final_id_map[final_id] = det
-        
-        return final_id_map
\ No newline at end of file
+        detections: DetectionBatch
+    ) -> tuple[np.ndarray, DetectionBatch]:
+        """
+        Uma detecção por final_id: mantém a de maior confiança (a primeira em
+        caso de empate), na ordem em que cada final_id aparece no frame.
+
+        Returns:
+            tuple: final_ids e as detecções correspondentes, alinhados
+        """
+        if not len(detections):
+            return np.empty(0, dtype=np.int64), detections
+
+        final_ids = np.fromiter(
+            (self.id_map.find(tid) for tid in detections.track_ids.tolist()),
+            dtype=np.int64, count=len(detections)
+        )
+
+        # Ordena por confiança decrescente (estável) e fica com a primeira de cada final_id
+        by_conf = np.argsort(-detections.confs, kind='stable')
+        _, first = np.unique(final_ids[by_conf], return_index=True)
+        winners = by_conf[first]
+
+        # Ordem de primeira aparição de cada final_id
+        _, first_seen = np.unique(final_ids, return_index=True)
+        winners = winners[np.argsort(first_seen)]
+
+        return final_ids[winners], detections.select(winners)
@@ -0,0 +1,95 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.models.tracked_object import TrackedObject
+
+
+@dataclass
+class VehicleAggregate:
+    track_id: int
+    classe: str
+    entry_frame: int
+    exit_frame: int
+    frames_observados: int = 0
+    faixas: List[str] = field(default_factory=list)
+    velocidades: List[float] = field(default_factory=list)
+    cor: Optional[tuple] = None
+
+
+class VehicleSummaryAggregator:
+    """
+    Uma linha por veículo, mantida incrementalmente a cada frame em que o
+    track está na zona de validação e finalizada quando o track é descartado
+    (clear_stale_objects) ou no encerramento.
+    """
+
+    def __init__(self, output_adapter, percentiles=(50, 85)):
+        self.output_adapter = output_adapter
+        self.percentiles = tuple(percentiles)
+        self.active: Dict[int, VehicleAggregate] = {}
+        self.finalized_count = 0
+
+    def update(self, tracked_obj: TrackedObject, frame_count: int) -> None:
+        agregado = self.active.get(tracked_obj.id)
+        if agregado is None:
+            agregado = VehicleAggregate(
+                track_id=tracked_obj.id,
+                classe=tracked_obj.classe,
+                entry_frame=frame_count,
+                exit_frame=frame_count
+            )
+            self.active[tracked_obj.id] = agregado
+
+        agregado.exit_frame = frame_count
+        agregado.frames_observados += 1
+        if tracked_obj.faixa and (not agregado.faixas or agregado.faixas[-1] != tracked_obj.faixa):
+            agregado.faixas.append(tracked_obj.faixa)
+        if tracked_obj.velocidade_kmh is not None:
+            agregado.velocidades.append(float(tracked_obj.velocidade_kmh))
+        if tracked_obj.dominant_color is not None:
+            agregado.cor = tracked_obj.dominant_color
+
+    def _to_row(self, agregado: VehicleAggregate) -> dict:
+        row = {
+            'track_id': agregado.track_id,
+            'classe': agregado.classe,
+            'frame_entrada': agregado.entry_frame,
+            'frame_saida': agregado.exit_frame,
+            'frames_observados': agregado.frames_observados,
+            'sequencia_faixas': '>'.join(agregado.faixas),
+            'velocidade_min_kmh': None,
+            'velocidade_media_kmh': None,
+            'velocidade_max_kmh': None,
+            'cor_dominante_bgr': agregado.cor
+        }
+        for p in self.percentiles:
+            row[f'velocidade_p{p}_kmh'] = None
+
+        if agregado.velocidades:
+            velocidades = np.asarray(agregado.velocidades, dtype=np.float64)
+            row['velocidade_min_kmh'] = float(velocidades.min())
+            row['velocidade_media_kmh'] = float(velocidades.mean())
+            row['velocidade_max_kmh'] = float(velocidades.max())
+            for p, valor in zip(self.percentiles, np.percentile(velocidades, self.percentiles)):
+                row[f'velocidade_p{p}_kmh'] = float(valor)
+        return row
+
+    def finalize(self, track_id: int) -> None:
+        agregado = self.active.pop(track_id, None)
+        if agregado is None:
+            return
+        self.output_adapter.write_row(self._to_row(agregado))
+        self.finalized_count += 1
+
+    def finalize_all(self) -> None:
+        for track_id in list(self.active.keys()):
+            self.finalize(track_id)
+
+    def get_state(self) -> dict:
+        return {'active': self.active, 'finalized_count': self.finalized_count}
+
+    def load_state(self, state: dict) -> None:
+        self.active = state['active']
+        self.finalized_count = state['finalized_count']
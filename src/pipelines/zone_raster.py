@@ -0,0 +1,79 @@
+import cv2
+import numpy as np
+from typing import List, Optional, Tuple
+
+from src.setup.config import GeometryConfig
+
+# Bits de zona_flags
+ZONA_VALIDACAO = 1
+ZONA_REGIAO_1 = 2
+
+
+class ZoneRaster:
+    """
+    Geometria de faixas e zonas compilada uma vez em imagens de rótulos.
+
+    lane_labels guarda, por pixel, 0 (nenhuma faixa) ou o índice + 1 da faixa em
+    MASCARAS_FAIXAS; em sobreposições vence a primeira faixa na ordem do dict.
+    zone_flags guarda os bits ZONA_VALIDACAO e ZONA_REGIAO_1. A consulta usa o
+    centro das caixas, como antes.
+
+    Os pixels da borda dos polígonos ficam fora (como no antigo
+    pointPolygonTest(...) > 0, estritamente interno): cv2.fillPoly inclui a
+    borda, então ela é apagada em seguida com cv2.polylines.
+    """
+
+    def __init__(self, geometry_config: GeometryConfig, frame_size: Tuple[int, int], downsample: int = 1):
+        self.downsample = max(1, int(downsample))
+        width, height = frame_size
+        self.shape = (-(-height // self.downsample), -(-width // self.downsample))
+
+        self.lane_names: List[Optional[str]] = [None] + list(geometry_config.MASCARAS_FAIXAS.keys())
+        self.lane_labels = np.zeros(self.shape, dtype=np.uint8 if len(self.lane_names) < 256 else np.uint16)
+        # Ordem inversa: a primeira faixa é desenhada por último e prevalece
+        for label in range(len(self.lane_names) - 1, 0, -1):
+            polygon = geometry_config.MASCARAS_FAIXAS[self.lane_names[label]]
+            self.lane_labels[self._interior(polygon)] = label
+
+        self.zone_flags = np.zeros(self.shape, dtype=np.uint8)
+        for polygon, flag in (
+            (geometry_config.ZONA_DE_VALIDACAO, ZONA_VALIDACAO),
+            (geometry_config.REGIAO_1, ZONA_REGIAO_1)
+        ):
+            if polygon:
+                self.zone_flags[self._interior(polygon)] |= flag
+
+    def _scaled(self, polygon: List[List[int]]) -> np.ndarray:
+        pts = np.array(polygon, dtype=np.float32) / self.downsample
+        return np.round(pts).astype(np.int32).reshape((-1, 1, 2))
+
+    def _interior(self, polygon: List[List[int]]) -> np.ndarray:
+        pts = self._scaled(polygon)
+        layer = np.zeros(self.shape, dtype=np.uint8)
+        cv2.fillPoly(layer, [pts], 1)
+        cv2.polylines(layer, [pts], isClosed=True, color=0, thickness=1)
+        return layer.astype(bool)
+
+    def lookup(self, boxes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Args:
+            boxes: (N, 4) xyxy em coordenadas do frame original
+
+        Returns:
+            tuple: rótulos de faixa (N,) e bits de zona (N,); 0 fora do frame
+        """
+        boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+        cx = ((boxes[:, 0] + boxes[:, 2]) / 2) / self.downsample
+        cy = ((boxes[:, 1] + boxes[:, 3]) / 2) / self.downsample
+
+        inside = np.isfinite(cx) & np.isfinite(cy)
+        inside &= (cx >= 0) & (cy >= 0) & (cx < self.shape[1]) & (cy < self.shape[0])
+        cols = np.where(inside, cx, 0).astype(np.int64)
+        rows = np.where(inside, cy, 0).astype(np.int64)
+
+        labels = np.where(inside, self.lane_labels[rows, cols], 0)
+        flags = np.where(inside, self.zone_flags[rows, cols], 0)
+        return labels, flags
+
+    def lane_name(self, label: int) -> Optional[str]:
+        return self.lane_names[int(label)]
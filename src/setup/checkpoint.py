@@ -0,0 +1,94 @@
+import os
+import pickle
+from typing import Optional
+
+CHECKPOINT_FILENAME = "checkpoint.pkl"
+CHECKPOINT_VERSION = 6
+
+
+class CheckpointManager:
+    """Salva e restaura periodicamente o estado do pipeline para retomada."""
+
+    def __init__(self, output_dir: str, interval_frames: int):
+        self.path = os.path.join(output_dir, CHECKPOINT_FILENAME)
+        self.interval_frames = interval_frames
+        self.last_saved_frame: Optional[int] = None
+
+    @staticmethod
+    def load(output_dir: str) -> dict:
+        path = os.path.join(output_dir, CHECKPOINT_FILENAME)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Checkpoint não encontrado em: {path}")
+
+        with open(path, 'rb') as f:
+            state = pickle.load(f)
+
+        if state.get('version') != CHECKPOINT_VERSION:
+            raise ValueError(
+                f"Versão de checkpoint incompatível ({state.get('version')}), "
+                f"esperada {CHECKPOINT_VERSION}: {path}"
+            )
+        return state
+
+    def maybe_save(self, frame_id: int, components: dict) -> bool:
+        if self.interval_frames <= 0:
+            return False
+        processed = frame_id - components['video_props']['start_frame'] + 1
+        if processed % self.interval_frames != 0:
+            return False
+
+        self.save(frame_id, components)
+        return True
+
+    def save(self, frame_id: int, components: dict) -> None:
+        # As saídas são descarregadas antes para que os offsets reflitam o frame salvo
+        components['output_buffer'].flush()
+        csv_offset = components['csv_adapter'].sync() if components['csv_adapter'] else None
+        summary_offset = components['summary_adapter'].sync() if components['summary_adapter'] else None
+        columnar_state = components['columnar_adapter'].sync() if components['columnar_adapter'] else None
+
+        speed_calc = components['speed_calc']
+        trackzone_adapter = components['trackzone_adapter']
+        state = {
+            'version': CHECKPOINT_VERSION,
+            'frame_id': frame_id,
+            'video_input': components['app_config'].IO_CONFIG.VIDEO_INPUT,
+            'total_frames': components['video_props']['total_frames'],
+            'max_track_id': trackzone_adapter.max_track_id if trackzone_adapter else 0,
+            'tracking_manager': components['tracking_manager'].get_state(),
+            'track_lifecycle_manager': components['track_lifecycle_manager'].get_state(),
+            'speed_calc': speed_calc.get_state() if speed_calc else None,
+            'csv_offset': csv_offset,
+            'summary_offset': summary_offset,
+            'columnar_state': columnar_state,
+            'csv_track_ids': set(components['csv_adapter'].saved_track_ids) if components['csv_adapter'] else set()
+        }
+
+        # Escrita atômica: um crash durante o save preserva o checkpoint anterior
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self.last_saved_frame = frame_id
+
+    @staticmethod
+    def restore(components: dict, state: dict) -> None:
+        video_input = components['app_config'].IO_CONFIG.VIDEO_INPUT
+        if state['video_input'] != video_input or state['total_frames'] != components['video_props']['total_frames']:
+            print(f"⚠️ Aviso: checkpoint gerado para '{state['video_input']}' "
+                  f"({state['total_frames']} frames); retomando em '{video_input}'")
+
+        # O tracker do YOLO recomeça do zero; os novos IDs não podem colidir com os antigos
+        trackzone_adapter = components['trackzone_adapter']
+        if trackzone_adapter:
+            trackzone_adapter.track_id_offset = state['max_track_id']
+            trackzone_adapter.max_track_id = state['max_track_id']
+
+        components['tracking_manager'].load_state(state['tracking_manager'])
+        components['track_lifecycle_manager'].load_state(state['track_lifecycle_manager'])
+        if components['speed_calc'] and state['speed_calc']:
+            components['speed_calc'].load_state(state['speed_calc'])
+        if components['csv_adapter']:
+            components['csv_adapter'].saved_track_ids = set(state['csv_track_ids'])
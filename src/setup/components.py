@@ -1,8 +1,17 @@
+import os
+import shutil
 import sys
-from ultralytics import solutions
+import tempfile
+import cv2
+from ultralytics import solutions, YOLO
 import torch
+from typing import List, Optional
 
-from src.setup.config import GeometryConfig, ModelConfig
+from src.setup.config import ModelConfig
+from src.utils.filesystem import calcular_hash_arquivo
+
+INFERENCE_BACKENDS = ('pytorch', 'onnx', 'openvino')
+TRACKER_ENGINES = ('trackzone', 'native')
 
 def extract_current_tracks(trackzone) -> dict:
 
@@ -26,10 +35,69 @@ def determine_yolo_device() -> str:
     else:
         return "cpu"
 
-def initialize_trackzone(model, geometry_config: GeometryConfig, model_config: ModelConfig):
+def configure_worker_threads(num_threads: int) -> None:
+    # Evita que vários processos disputem todos os núcleos com o paralelismo interno
+    cv2.setNumThreads(num_threads)
+    torch.set_num_threads(num_threads)
+
+def _exported_model_path(weights: str, model_config: ModelConfig) -> str:
+    # Artefato ao lado dos pesos, identificado pelo hash dos pesos e pelo tamanho de entrada
+    stem = os.path.splitext(os.path.basename(weights))[0]
+    weights_hash = calcular_hash_arquivo(weights)[:12]
+    name = f"{stem}_{weights_hash}_{model_config.INFERENCE_IMGSZ}"
+    if model_config.INFERENCE_BACKEND == 'onnx':
+        name += ".onnx"
+    else:
+        name += "_openvino_model"
+    return os.path.join(os.path.dirname(weights), name)
+
+def export_detection_model(model_config: ModelConfig, weights: Optional[str] = None) -> str:
+    """Exporta os pesos .pt para o backend configurado, reaproveitando o artefato em cache."""
+    weights = weights or model_config.MODELO_YOLO
+    target = _exported_model_path(weights, model_config)
+    if os.path.exists(target):
+        return target
+
+    print(f"Exportando modelo para {model_config.INFERENCE_BACKEND} (imgsz={model_config.INFERENCE_IMGSZ})...")
+    # Exporta num diretório temporário: processos concorrentes não disputam o mesmo arquivo
+    work_dir = tempfile.mkdtemp(prefix=".export_", dir=os.path.dirname(target))
+    try:
+        weights_copy = shutil.copy2(weights, work_dir)
+        exported = YOLO(weights_copy).export(
+            format=model_config.INFERENCE_BACKEND,
+            imgsz=model_config.INFERENCE_IMGSZ,
+            dynamic=False,
+            verbose=False
+        )
+        if not os.path.exists(target):
+            os.replace(exported, target)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print(f"Modelo exportado: {target}")
+    return target
+
+def load_detection_model(model_config: ModelConfig, weights: Optional[str] = None):
+    # weights: pesos alternativos (ex.: modelo leve da cascata); padrão MODELO_YOLO
+    weights = weights or model_config.MODELO_YOLO
+    backend = model_config.INFERENCE_BACKEND
+    if backend not in INFERENCE_BACKENDS:
+        raise ValueError(f"INFERENCE_BACKEND inválido: '{backend}'. Use um de: {', '.join(INFERENCE_BACKENDS)}")
+
+    if backend == 'pytorch':
+        model = YOLO(weights)
+    else:
+        model = YOLO(export_detection_model(model_config, weights), task='detect')
+
+    # O TrackZone não repassa imgsz ao predictor; os overrides do modelo são usados em track()
+    model.overrides['imgsz'] = model_config.INFERENCE_IMGSZ
+    return model
+
+def initialize_trackzone(model, region: List[List[int]], model_config: ModelConfig):
+    # region deve estar em coordenadas do frame de inferência
     return solutions.TrackZone(
         model=model,
-        region=geometry_config.REGIAO_1,
+        region=region,
         show=False,
         conf=model_config.TRACKZONE_CONF,
         iou=model_config.TRACKZONE_IOU,
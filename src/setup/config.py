@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Dict, Optional
 
 @dataclass
@@ -32,6 +32,21 @@ class ModelConfig:
     TRACKZONE_IOU: float
     TRACKZONE_CLASSES: List[int]
     TRACKZONE_DEVICE: str
+    # pytorch | onnx | openvino (exportado uma vez e reaproveitado)
+    INFERENCE_BACKEND: str = "pytorch"
+    INFERENCE_IMGSZ: int = 640
+    # Cascata: modelo leve em todo frame, MODELO_YOLO sob demanda (None = desabilitada)
+    CASCADE_LIGHT_MODEL: Optional[str] = None
+    CASCADE_HEAVY_INTERVAL: int = 10
+    CASCADE_LOW_CONF: float = 0.5
+    CASCADE_NEW_TRACK_IOU: float = 0.3
+    CASCADE_FUSION_IOU: float = 0.5
+    # trackzone (ultralytics, frame a frame) | native (ByteTracker do projeto, detecção em lotes)
+    TRACKER_ENGINE: str = "trackzone"
+    DETECTION_BATCH_SIZE: int = 1
+    NATIVE_TRACK_LOW_CONF: float = 0.1
+    NATIVE_MATCH_IOU: float = 0.2
+    NATIVE_TRACK_BUFFER: int = 30
 
 @dataclass
 class ImageProcessingConfig:
@@ -52,6 +67,13 @@ class TrackingConfig:
     KALMAN_PROCESS_NOISE: float
     KALMAN_MEASUREMENT_NOISE: float
     TRACKING_COLOR_WEIGHT: float
+    # Assinaturas de cor (histograma H-S) na reassociação de tracks perdidos
+    ENABLE_REID_SIGNATURES: bool = False
+    REID_HIST_BINS: List[int] = field(default_factory=lambda: [16, 16])
+    REID_MAX_SIGNATURES: int = 2048
+    # Grade espacial (células em pixels) dos tracks perdidos, pela posição prevista
+    ENABLE_LOST_TRACK_INDEX: bool = False
+    LOST_TRACK_CELL_SIZE: int = 128
 
 @dataclass
 class ColorConfig:
@@ -62,6 +84,16 @@ class ColorConfig:
     RECALCULATION_INTERVAL: int
     BACKGROUND_IMAGE_PATH: Optional[str]
     COLOR_THRESHOLD: int
+    # "kmeans" (k-means por caixa) ou "histogram" (moda do histograma quantizado, todas as caixas numa passada)
+    COLOR_ENGINE: str = "kmeans"
+    # Máximo de pixels amostrados por caixa (0 = todos os pixels)
+    COLOR_PIXEL_BUDGET: int = 0
+    # Bits por canal na quantização do engine "histogram"
+    COLOR_QUANT_BITS: int = 4
+    # Amostras consecutivas concordantes para congelar a cor do track (0 = recalcula sempre)
+    COLOR_STABLE_SAMPLES: int = 0
+    # Distância BGR máxima entre amostras consideradas concordantes
+    COLOR_STABLE_DISTANCE: float = 30.0
 
 @dataclass
 class AnnotationConfig:
@@ -110,6 +142,47 @@ class GeneralConfig:
     ENABLE_VALIDATION_ZONE: bool = True
     ENABLE_CSV_OUTPUT: bool = True
     ENABLE_ANNOTATED_VIDEO: bool = True
+    # Read-ahead de decodificação (0 = leitura síncrona)
+    VIDEO_PREFETCH_FRAMES: int = 0
+    # Detecção apenas a cada N frames; os demais são previstos pelo Kalman
+    DETECTION_STRIDE: int = 1
+    # Checkpoint a cada N frames para retomada com --resume (0 = desabilitado)
+    CHECKPOINT_INTERVAL_FRAMES: int = 0
+    # Cache de detecções: off | auto | record | replay
+    DETECTION_CACHE_MODE: str = "off"
+    DETECTION_CACHE_DIR: str = "cache/detections"
+    # Inferência apenas no retângulo envolvente de REGIAO_1 (+ margem em pixels)
+    INFERENCE_CROP_TO_REGION: bool = False
+    INFERENCE_CROP_MARGIN: int = 32
+    # Fator de redução do raster de faixas/zonas (1 = resolução do vídeo)
+    ZONE_RASTER_DOWNSAMPLE: int = 1
+    # Limite em bytes dos registros CSV acumulados antes de gravar
+    OUTPUT_BUFFER_MAX_BYTES: int = 4194304
+    # Escrita de CSV/vídeo numa thread dedicada, com fila limitada a N bytes de frames e registros (0 = síncrona)
+    OUTPUT_WRITER_QUEUE_MAX_BYTES: int = 0
+    # Vídeo anotado: "opencv" (cv2.VideoWriter + VIDEO_WRITER_FOURCC) ou "ffmpeg" (processo ffmpeg via pipe)
+    VIDEO_WRITER_BACKEND: str = "opencv"
+    VIDEO_FFMPEG_CODEC: str = "libx264"
+    VIDEO_FFMPEG_PRESET: str = "veryfast"
+    VIDEO_FFMPEG_CRF: Optional[int] = 23
+    VIDEO_FFMPEG_THREADS: int = 0
+    # Somente backend ffmpeg: largura de saída (0 = original) e gravação de 1 a cada N frames
+    VIDEO_OUTPUT_WIDTH: int = 0
+    VIDEO_FRAME_DECIMATION: int = 1
+    # Resultados por frame também em formato colunar (Parquet com pyarrow; senão blocos .npz)
+    ENABLE_COLUMNAR_OUTPUT: bool = False
+    COLUMNAR_ROW_GROUP_SIZE: int = 65536
+    # CSV com uma linha por veículo (entrada/saída, faixas, estatísticas de velocidade, cor e classe)
+    ENABLE_VEHICLE_SUMMARY: bool = False
+
+@dataclass
+class MotionGateConfig:
+    ENABLE_MOTION_GATE: bool = False
+    GATE_RESIZE_WIDTH: int = 160
+    GATE_BLUR_KSIZE: int = 5
+    GATE_PIXEL_THRESHOLD: int = 25
+    GATE_MIN_CHANGED_RATIO: float = 0.002
+    GATE_BACKGROUND_ALPHA: float = 0.05
 
 @dataclass
 class AppConfig:
@@ -122,4 +195,5 @@ class AppConfig:
     COLOR_CONFIG: ColorConfig
     ANNOTATION_CONFIG: AnnotationConfig
     CALCULATION_CONFIG: CalculationConfig
-    GENERAL_CONFIG: GeneralConfig
\ No newline at end of file
+    GENERAL_CONFIG: GeneralConfig
+    MOTION_GATE_CONFIG: MotionGateConfig = field(default_factory=MotionGateConfig)
\ No newline at end of file
@@ -2,7 +2,7 @@ import json
 from src.setup.config import (
     AppConfig, IOConfig, GeometryConfig, CalibrationMeshConfig, ModelConfig,
     ImageProcessingConfig, TrackingConfig, ColorConfig, AnnotationConfig,
-    CalculationConfig, GeneralConfig
+    CalculationConfig, GeneralConfig, MotionGateConfig
 )
 
 class ConfigLoader:
@@ -26,7 +26,8 @@ class ConfigLoader:
             COLOR_CONFIG=ColorConfig(**config_data['COLOR_CONFIG']),
             ANNOTATION_CONFIG=AnnotationConfig(**config_data['ANNOTATION_CONFIG']),
             CALCULATION_CONFIG=CalculationConfig(**config_data['CALCULATION_CONFIG']),
-            GENERAL_CONFIG=GeneralConfig(**config_data['GENERAL_CONFIG'])
+            GENERAL_CONFIG=GeneralConfig(**config_data['GENERAL_CONFIG']),
+            MOTION_GATE_CONFIG=MotionGateConfig(**config_data.get('MOTION_GATE_CONFIG', {}))
         )
 
     def get_config(self) -> AppConfig:
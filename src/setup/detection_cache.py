@@ -0,0 +1,43 @@
+import os
+from typing import Optional, Tuple
+
+from src.adapters.detection_cache_adapter import (
+    DetectionCacheReader, DetectionCacheWriter, build_detection_cache_key, is_cache_complete
+)
+
+CACHE_MODES = ('off', 'auto', 'record', 'replay')
+
+
+class DetectionCacheSetup:
+
+    @staticmethod
+    def setup_detection_cache(
+        app_config, project_root: str, full_run: bool
+    ) -> Tuple[Optional[DetectionCacheReader], Optional[DetectionCacheWriter]]:
+        mode = app_config.GENERAL_CONFIG.DETECTION_CACHE_MODE
+        if mode not in CACHE_MODES:
+            raise ValueError(f"DETECTION_CACHE_MODE inválido: '{mode}'. Opções: {', '.join(CACHE_MODES)}")
+
+        if mode == 'off':
+            return None, None
+
+        print("Calculando chave do cache de detecções...")
+        key = build_detection_cache_key(app_config)
+        cache_dir = os.path.join(project_root, app_config.GENERAL_CONFIG.DETECTION_CACHE_DIR, key)
+
+        if mode in ('auto', 'replay') and is_cache_complete(cache_dir):
+            print(f"Reproduzindo detecções do cache (YOLO não será carregado): {cache_dir}")
+            return DetectionCacheReader(cache_dir), None
+
+        if mode == 'replay':
+            raise FileNotFoundError(
+                f"Nenhum cache de detecções completo para esta configuração: {cache_dir}"
+            )
+
+        if not full_run:
+            # Um cache parcial não pode ser reproduzido; só grava em execuções completas
+            print("[Aviso] Gravação do cache de detecções requer o vídeo completo; cache desabilitado.")
+            return None, None
+
+        print(f"Gravando detecções no cache: {cache_dir}")
+        return None, DetectionCacheWriter(cache_dir, key)
@@ -1,19 +1,25 @@
 import os
-from typing import Tuple
+from typing import Optional, Tuple
 from src.utils.filesystem import criar_diretorio_de_saida
 
 
 class PathManager:
     """Gerencia caminhos de entrada e saída."""
     
-    def __init__(self, project_root: str, io_config):
+    def __init__(self, project_root: str, io_config, output_dir: Optional[str] = None):
         self.project_root = project_root
         self.io_config = io_config
-        self.output_dir = None
+        self.output_dir = output_dir
         
     def setup_paths(self) -> Tuple[str, str, str]:
         """Configura e retorna os caminhos de saída."""
-        if self.io_config.CRIAR_DIRETORIO_SAIDA:
+        if self.output_dir:
+            # Diretório imposto pelo chamador (segmentos, lotes, retomada)
+            os.makedirs(self.output_dir, exist_ok=True)
+            video_path = os.path.join(self.output_dir, self.io_config.VIDEO_OUTPUT)
+            csv_path = os.path.join(self.output_dir, self.io_config.CSV_OUTPUT)
+            malha_path = os.path.join(self.output_dir, self.io_config.MALHA_EXPORT_FILENAME)
+        elif self.io_config.CRIAR_DIRETORIO_SAIDA:
             self.output_dir = criar_diretorio_de_saida(self.project_root)
             video_path = os.path.join(self.output_dir, self.io_config.VIDEO_OUTPUT)
             csv_path = os.path.join(self.output_dir, self.io_config.CSV_OUTPUT)
@@ -7,6 +7,9 @@ class ResourceManager:
         self.output_buffer = None
         self.csv_adapter = None
         self.video_adapter = None
+        self.columnar_adapter = None
+        self.summary_adapter = None
+        self.detection_cache_writer = None
         
     def cleanup(self, app_config=None):
         
@@ -27,6 +30,30 @@ class ResourceManager:
             except Exception as e:
                 print(f"Erro ao fechar vídeo adapter: {e}")
         
+        if self.columnar_adapter is not None:
+            try:
+                self.columnar_adapter.close()
+            except Exception as e:
+                print(f"Erro ao fechar saída colunar: {e}")
+
+        if self.summary_adapter is not None:
+            try:
+                self.summary_adapter.close()
+            except Exception as e:
+                print(f"Erro ao fechar resumo por veículo: {e}")
+
+        if self.video_input is not None:
+            try:
+                self.video_input.close()
+            except Exception as e:
+                print(f"Erro ao fechar input de vídeo: {e}")
+
+        if self.detection_cache_writer is not None:
+            try:
+                self.detection_cache_writer.close()
+            except Exception as e:
+                print(f"Erro ao fechar cache de detecções: {e}")
+
         # Só tenta fechar janelas se elas foram abertas
         if app_config and app_config.GENERAL_CONFIG.SHOW_VIDEO_WINDOW:
             cv2.destroyAllWindows()
\ No newline at end of file
@@ -1,39 +1,59 @@
-from ultralytics import YOLO
 import traceback
 import cv2
 import argparse
 import logging
 import os
+import time
+import numpy as np
+from typing import Callable, List, Optional, Tuple
 
 from src.ui.frame_annotator import FrameAnnotator
 from src.ui.ui import print_progress
 from src.adapters.trackzone_adapter import TrackZoneAdapter
+from src.adapters.cascade_track_adapter import CascadeTrackAdapter
+from src.adapters.native_track_adapter import NativeTrackAdapter
 
 # Imports de adapters de I/O
 from src.adapters.input.video_input_adapter import VideoInputAdapter
 from src.adapters.output.output_buffer import OutputBuffer
+from src.adapters.output.async_writer import AsyncOutputWriter
+from src.adapters.output.columnar_output_adapter import ColumnarOutputAdapter
+from src.adapters.output.vehicle_summary_output_adapter import VehicleSummaryOutputAdapter
 from src.adapters.output.csv_output_adapter import CSVOutputAdapter
 from src.adapters.output.video_output_adapter import VideoOutputAdapter
+from src.adapters.output.ffmpeg_video_output_adapter import FFmpegVideoOutputAdapter
 from src.adapters.csv_saver import exportar_malha_para_csv
 
 # Imports de pipelines e models
 from src.pipelines.tracking_manager import TrackingManager
 from src.pipelines.speed_calculator import SpeedCalculator
 from src.pipelines.track_processor import TrackProcessor
+from src.pipelines.reid_signatures import ReidSignatureExtractor
+from src.pipelines.lost_track_index import LostTrackIndex
 from src.pipelines.track_data_collector import TrackDataCollector
 from src.pipelines.track_lifecycle_manager import TrackLifecycleManager
 from src.pipelines.frame_processor import FramePreprocessor
+from src.pipelines.motion_gate import MotionGate
+from src.pipelines.zone_raster import ZoneRaster
+from src.pipelines.vehicle_summary import VehicleSummaryAggregator
 from src.pipelines import tracking_helpers
-from src.models.data_models import FrameTrackData
+from src.models.data_models import DetectionBatch, FrameTrackData
 
 # Imports de setup e utils
-from src.setup.components import initialize_trackzone, determine_yolo_device
+from src.setup.components import (
+    initialize_trackzone, determine_yolo_device, load_detection_model, TRACKER_ENGINES
+)
+from src.setup.config import AppConfig
 from src.setup.config_loader import ConfigLoader
 from src.setup.background import BackgroundSetup
 from src.setup.calibration import CalibrationSetup
 from src.setup.paths import PathManager
 from src.setup.resources import ResourceManager
+from src.setup.checkpoint import CheckpointManager
+from src.setup.detection_cache import DetectionCacheSetup, CACHE_MODES
 from src.utils.filesystem import verificar_e_criar_diretorios_input
+from src.utils.geometry import calcular_retangulo_recorte
+from src.utils.memory import peak_rss_mb
 
 logging.getLogger("ultralytics").setLevel(logging.WARNING)
 
@@ -59,6 +79,18 @@ Exemplos de uso:
   # Não exibir janela (útil para processamento em background)
   python -m src.tools.analisador_de_video --no-show
   
+  # Detectar apenas a cada 3 frames (demais frames previstos pelo Kalman)
+  python -m src.tools.analisador_de_video --stride 3
+  
+  # Dividir o vídeo em 4 segmentos processados em paralelo (apenas CSV)
+  python -m src.tools.analisador_de_video --segments 4
+  
+  # Retomar uma análise interrompida a partir do último checkpoint
+  python -m src.tools.analisador_de_video --resume output/2025-01-01_12-00-00
+  
+  # Reproduzir detecções gravadas (sem carregar o YOLO) ao reprocessar com outra config
+  python -m src.tools.analisador_de_video --detection-cache auto
+  
   # Combinações
   python -m src.tools.analisador_de_video --only-video --show
   python -m src.tools.analisador_de_video --no-video --no-csv  # Apenas tracking
@@ -94,6 +126,16 @@ Exemplos de uso:
         action='store_true',
         help='Desabilitar geração de vídeo anotado'
     )
+    parser.add_argument(
+        '--no-columnar',
+        action='store_true',
+        help='Desabilitar a saída colunar (sobrescreve ENABLE_COLUMNAR_OUTPUT)'
+    )
+    parser.add_argument(
+        '--no-vehicle-summary',
+        action='store_true',
+        help='Desabilitar o CSV de resumo por veículo (sobrescreve ENABLE_VEHICLE_SUMMARY)'
+    )
 
     display_group = parser.add_mutually_exclusive_group()
     display_group.add_argument(
@@ -106,6 +148,40 @@ Exemplos de uso:
         action='store_true',
         help='Não exibir janela de vídeo'
     )
+
+    parser.add_argument(
+        '--stride',
+        type=int,
+        default=None,
+        help='Executar a detecção apenas a cada N frames (sobrescreve DETECTION_STRIDE)'
+    )
+
+    parser.add_argument(
+        '--segments',
+        type=int,
+        default=1,
+        help='Dividir o vídeo em N segmentos processados em processos paralelos'
+    )
+    parser.add_argument(
+        '--segment-overlap',
+        type=int,
+        default=None,
+        help='Frames de sobreposição entre segmentos para costura dos IDs (padrão: 2s de vídeo)'
+    )
+    parser.add_argument(
+        '--resume',
+        type=str,
+        default=None,
+        metavar='OUTPUT_DIR',
+        help='Retomar a análise a partir do checkpoint salvo no diretório de saída indicado'
+    )
+    parser.add_argument(
+        '--detection-cache',
+        type=str,
+        choices=CACHE_MODES,
+        default=None,
+        help='Modo do cache de detecções (sobrescreve DETECTION_CACHE_MODE)'
+    )
     
     return parser.parse_args()
 
@@ -129,6 +205,14 @@ def apply_cli_overrides(app_config, args):
     if args.no_video:
         app_config.GENERAL_CONFIG.ENABLE_ANNOTATED_VIDEO = False
         print("Modo CLI: Vídeo anotado desabilitado")
+
+    if getattr(args, 'no_columnar', False):
+        app_config.GENERAL_CONFIG.ENABLE_COLUMNAR_OUTPUT = False
+        print("Modo CLI: Saída colunar desabilitada")
+
+    if getattr(args, 'no_vehicle_summary', False):
+        app_config.GENERAL_CONFIG.ENABLE_VEHICLE_SUMMARY = False
+        print("Modo CLI: Resumo por veículo desabilitado")
     
     # Handle display window
     if args.show:
@@ -138,11 +222,30 @@ def apply_cli_overrides(app_config, args):
     elif args.no_show:
         app_config.GENERAL_CONFIG.SHOW_VIDEO_WINDOW = False
         print("Modo CLI: Exibição de janela desabilitada")
+
+    stride = getattr(args, 'stride', None)
+    if stride is not None:
+        app_config.GENERAL_CONFIG.DETECTION_STRIDE = stride
+        print(f"Modo CLI: Detecção a cada {stride} frame(s)")
+
+    cache_mode = getattr(args, 'detection_cache', None)
+    if cache_mode is not None:
+        app_config.GENERAL_CONFIG.DETECTION_CACHE_MODE = cache_mode
+        print(f"Modo CLI: Cache de detecções '{cache_mode}'")
     
     return app_config
 
 
-def initialize_components(project_root: str, config_path: str, cli_args=None) -> dict:
+def initialize_components(
+    project_root: str,
+    config_path: str,
+    cli_args=None,
+    output_dir: Optional[str] = None,
+    frame_range: Optional[Tuple[int, Optional[int]]] = None,
+    video_path: Optional[str] = None,
+    model_provider: Optional[Callable] = None,
+    resume_state: Optional[dict] = None
+) -> dict:
     print("\n" + "="*60)
     print("INICIALIZANDO COMPONENTES DO PIPELINE")
     print("="*60)
@@ -153,33 +256,120 @@ def initialize_components(project_root: str, config_path: str, cli_args=None) ->
     if cli_args:
         app_config = apply_cli_overrides(app_config, cli_args)
 
+    if video_path:
+        app_config.IO_CONFIG.VIDEO_INPUT = video_path
+
     # Torna os caminhos de I/O absolutos
     app_config.IO_CONFIG.VIDEO_INPUT = os.path.join(project_root, app_config.IO_CONFIG.VIDEO_INPUT)
     app_config.MODEL_CONFIG.MODELO_YOLO = os.path.join(project_root, app_config.MODEL_CONFIG.MODELO_YOLO)
+    if app_config.MODEL_CONFIG.CASCADE_LIGHT_MODEL:
+        app_config.MODEL_CONFIG.CASCADE_LIGHT_MODEL = os.path.join(project_root, app_config.MODEL_CONFIG.CASCADE_LIGHT_MODEL)
     if app_config.COLOR_CONFIG.BACKGROUND_IMAGE_PATH:
         app_config.COLOR_CONFIG.BACKGROUND_IMAGE_PATH = os.path.join(project_root, app_config.COLOR_CONFIG.BACKGROUND_IMAGE_PATH)
 
+    if app_config.GENERAL_CONFIG.DETECTION_STRIDE < 1:
+        raise ValueError(
+            f"DETECTION_STRIDE deve ser >= 1, recebido: {app_config.GENERAL_CONFIG.DETECTION_STRIDE}"
+        )
+    if app_config.MODEL_CONFIG.TRACKER_ENGINE not in TRACKER_ENGINES:
+        raise ValueError(
+            f"TRACKER_ENGINE inválido: '{app_config.MODEL_CONFIG.TRACKER_ENGINE}'. "
+            f"Use um de: {', '.join(TRACKER_ENGINES)}"
+        )
+
     resources = ResourceManager()
     if app_config.MODEL_CONFIG.TRACKZONE_DEVICE is None:
         app_config.MODEL_CONFIG.TRACKZONE_DEVICE = determine_yolo_device()
     print(f"Dispositivo YOLO: {app_config.MODEL_CONFIG.TRACKZONE_DEVICE}")
 
-    path_manager = PathManager(project_root, app_config.IO_CONFIG)
+    path_manager = PathManager(project_root, app_config.IO_CONFIG, output_dir=output_dir)
     video_out, csv_out, malha_out = path_manager.setup_paths()
 
+    if resume_state:
+        # O VideoWriter não permite anexar: a retomada grava o vídeo em um novo arquivo
+        base, ext = os.path.splitext(video_out)
+        video_out = f"{base}_retomada_{resume_state['frame_id'] + 1}{ext}"
+        frame_range = (resume_state['frame_id'] + 1, None)
+
+    start_frame, end_frame = frame_range if frame_range else (0, None)
+
     print("\nConfigurando input de vídeo...")
-    video_input = VideoInputAdapter(app_config.IO_CONFIG.VIDEO_INPUT)
+    video_input = VideoInputAdapter(
+        app_config.IO_CONFIG.VIDEO_INPUT,
+        prefetch_size=app_config.GENERAL_CONFIG.VIDEO_PREFETCH_FRAMES,
+        start_frame=start_frame,
+        end_frame=end_frame
+    )
     resources.video_input = video_input
+    if video_input.prefetch_size > 0:
+        print(f"Read-ahead de decodificação habilitado: fila de {video_input.prefetch_size} frames")
     
     props = video_input.get_properties()
     width, height, fps, total_frames = props['width'], props['height'], props['fps'], props['total_frames']
     print(f"Vídeo carregado: {width}x{height}, {fps:.2f} FPS, {total_frames} frames")
+    if frame_range:
+        print(f"Intervalo de processamento: frames [{props['start_frame']}, {props['end_frame']})")
+
+    resize_width = app_config.GENERAL_CONFIG.INFERENCE_RESIZE_WIDTH
+    original_size = (width, height)
+    inference_size = original_size
+    
+    if resize_width > 0 and width > 0:
+        scale = resize_width / width
+        inference_size = (resize_width, int(height * scale))
+        print(f"Redimensionamento para inferência: {original_size} → {inference_size}")
 
-    print("\nCarregando modelo YOLO...")
-    model = YOLO(app_config.MODEL_CONFIG.MODELO_YOLO)
-    trackzone = initialize_trackzone(model, app_config.GEOMETRY_CONFIG, app_config.MODEL_CONFIG)
-    trackzone_adapter = TrackZoneAdapter(trackzone, model)
-    print("Modelo YOLO carregado")
+    crop_rect = None
+    if app_config.GENERAL_CONFIG.INFERENCE_CROP_TO_REGION:
+        crop_rect = calcular_retangulo_recorte(
+            app_config.GEOMETRY_CONFIG.REGIAO_1, original_size,
+            app_config.GENERAL_CONFIG.INFERENCE_CROP_MARGIN
+        )
+        print(f"Recorte para inferência (x, y, w, h): {crop_rect}")
+    
+    frame_preprocessor = FramePreprocessor(
+        original_size=original_size,
+        inference_size=inference_size,
+        image_processing_config=app_config.IMAGE_PROCESSING_CONFIG,
+        crop_rect=crop_rect
+    )
+
+    full_run = start_frame == 0 and end_frame is None
+    detection_cache_reader, detection_cache_writer = DetectionCacheSetup.setup_detection_cache(
+        app_config, project_root, full_run
+    )
+    resources.detection_cache_writer = detection_cache_writer
+
+    trackzone_adapter = None
+    if detection_cache_reader is not None:
+        model = None
+    else:
+        if model_provider is None:
+            print(f"\nCarregando modelo YOLO (backend: {app_config.MODEL_CONFIG.INFERENCE_BACKEND})...")
+            model = load_detection_model(app_config.MODEL_CONFIG)
+        else:
+            # Modelo possivelmente já carregado pelo chamador: descarta o predictor para zerar o estado do tracker
+            print("\nObtendo modelo YOLO do chamador...")
+            model = model_provider(app_config.MODEL_CONFIG)
+            model.predictor = None
+        inference_region = frame_preprocessor.to_inference_coords(app_config.GEOMETRY_CONFIG.REGIAO_1)
+        if app_config.MODEL_CONFIG.CASCADE_LIGHT_MODEL:
+            print(f"Carregando modelo leve da cascata: {app_config.MODEL_CONFIG.CASCADE_LIGHT_MODEL}")
+            if model_provider is None:
+                light_model = load_detection_model(app_config.MODEL_CONFIG, app_config.MODEL_CONFIG.CASCADE_LIGHT_MODEL)
+            else:
+                light_model = model_provider(app_config.MODEL_CONFIG, app_config.MODEL_CONFIG.CASCADE_LIGHT_MODEL)
+                light_model.predictor = None
+            trackzone_adapter = CascadeTrackAdapter(
+                light_model, model, inference_region, app_config.MODEL_CONFIG, fps
+            )
+        elif app_config.MODEL_CONFIG.TRACKER_ENGINE == 'native':
+            print(f"Tracker nativo com detecção em lotes de {app_config.MODEL_CONFIG.DETECTION_BATCH_SIZE} frames")
+            trackzone_adapter = NativeTrackAdapter(model, inference_region, app_config.MODEL_CONFIG)
+        else:
+            trackzone = initialize_trackzone(model, inference_region, app_config.MODEL_CONFIG)
+            trackzone_adapter = TrackZoneAdapter(trackzone, model)
+        print("Modelo YOLO carregado")
 
     print("\n Configurando calibração de perspectiva...")
     matriz_h, malha_pixels = CalibrationSetup.setup_calibration(
@@ -192,15 +382,6 @@ def initialize_components(project_root: str, config_path: str, cli_args=None) ->
     )
     print(f"Malha de calibração exportada: {malha_out}")
 
-    print("\n Inicializando tracking manager...")
-    tracking_manager = TrackingManager(
-        max_frames_lost=app_config.TRACKING_CONFIG.MAX_FRAMES_LOST,
-        iou_threshold=app_config.TRACKING_CONFIG.IOU_THRESHOLD,
-        color_weight=app_config.TRACKING_CONFIG.TRACKING_COLOR_WEIGHT
-    )
-    
-    bg_color = BackgroundSetup.setup_background(app_config.COLOR_CONFIG)
-
     speed_calc = None
     if app_config.GENERAL_CONFIG.ENABLE_SPEED_CALCULATION:
         print("Habilitando cálculo de velocidade...")
@@ -209,6 +390,28 @@ def initialize_components(project_root: str, config_path: str, cli_args=None) ->
             calculation_config=app_config.CALCULATION_CONFIG,
             kalman_config=app_config.TRACKING_CONFIG
         )
+
+    print("\n Inicializando tracking manager...")
+    signature_extractor = None
+    if app_config.TRACKING_CONFIG.ENABLE_REID_SIGNATURES:
+        print("Habilitando assinaturas de cor na reassociação de tracks...")
+        signature_extractor = ReidSignatureExtractor(app_config.TRACKING_CONFIG.REID_HIST_BINS)
+
+    lost_index = None
+    if app_config.TRACKING_CONFIG.ENABLE_LOST_TRACK_INDEX:
+        lost_index = LostTrackIndex(app_config.TRACKING_CONFIG.LOST_TRACK_CELL_SIZE)
+
+    tracking_manager = TrackingManager(
+        max_frames_lost=app_config.TRACKING_CONFIG.MAX_FRAMES_LOST,
+        iou_threshold=app_config.TRACKING_CONFIG.IOU_THRESHOLD,
+        color_weight=app_config.TRACKING_CONFIG.TRACKING_COLOR_WEIGHT,
+        signature_extractor=signature_extractor,
+        max_signatures=app_config.TRACKING_CONFIG.REID_MAX_SIGNATURES,
+        speed_calc=speed_calc,
+        lost_index=lost_index
+    )
+    
+    bg_color = BackgroundSetup.setup_background(app_config.COLOR_CONFIG)
     
     track_processor = None
     if app_config.GENERAL_CONFIG.ENABLE_VALIDATION_ZONE:
@@ -221,15 +424,35 @@ def initialize_components(project_root: str, config_path: str, cli_args=None) ->
         )
     
     track_data_collector = None
-    if app_config.GENERAL_CONFIG.ENABLE_CSV_OUTPUT or app_config.GENERAL_CONFIG.ENABLE_ANNOTATED_VIDEO:
+    if (app_config.GENERAL_CONFIG.ENABLE_CSV_OUTPUT or app_config.GENERAL_CONFIG.ENABLE_ANNOTATED_VIDEO
+            or app_config.GENERAL_CONFIG.ENABLE_COLUMNAR_OUTPUT):
         track_data_collector = TrackDataCollector()
 
+    zone_raster = ZoneRaster(
+        geometry_config=app_config.GEOMETRY_CONFIG,
+        frame_size=(width, height),
+        downsample=app_config.GENERAL_CONFIG.ZONE_RASTER_DOWNSAMPLE
+    )
+
+    summary_adapter, vehicle_summary = None, None
+    if app_config.GENERAL_CONFIG.ENABLE_VEHICLE_SUMMARY:
+        summary_out = f"{os.path.splitext(csv_out)[0]}_veiculos.csv"
+        print(f"Configurando resumo por veículo: {summary_out}")
+        summary_adapter = VehicleSummaryOutputAdapter(
+            filepath=summary_out,
+            resume_offset=resume_state.get('summary_offset') if resume_state else None
+        )
+        resources.summary_adapter = summary_adapter
+        vehicle_summary = VehicleSummaryAggregator(summary_adapter)
+
     track_lifecycle_manager = TrackLifecycleManager(
         tracking_manager=tracking_manager,
         geometry_config=app_config.GEOMETRY_CONFIG,
+        zone_raster=zone_raster,
         speed_calc=speed_calc,
         track_processor=track_processor,
-        track_data_collector=track_data_collector
+        track_data_collector=track_data_collector,
+        vehicle_summary=vehicle_summary
     )
     
     frame_annotator = None
@@ -243,40 +466,57 @@ def initialize_components(project_root: str, config_path: str, cli_args=None) ->
         print(f"Configurando saída CSV: {csv_out}")
         csv_adapter = CSVOutputAdapter(
             filepath=csv_out,
-            batch_size=app_config.CALCULATION_CONFIG.CSV_BATCH_SIZE
+            batch_size=app_config.CALCULATION_CONFIG.CSV_BATCH_SIZE,
+            resume_offset=resume_state['csv_offset'] if resume_state else None
         )
         resources.csv_adapter = csv_adapter
     
     if app_config.GENERAL_CONFIG.ENABLE_ANNOTATED_VIDEO:
         print(f"Configurando saída de vídeo: {video_out}")
-        video_adapter = VideoOutputAdapter(
-            filepath=video_out,
-            fps=fps,
-            frame_size=(width, height),
-            fourcc=app_config.GENERAL_CONFIG.VIDEO_WRITER_FOURCC
-        )
+        video_adapter = create_video_adapter(video_out, fps, (width, height), app_config.GENERAL_CONFIG)
         resources.video_adapter = video_adapter
     
+    columnar_adapter = None
+    if app_config.GENERAL_CONFIG.ENABLE_COLUMNAR_OUTPUT:
+        # Retomada: os resultados a partir do checkpoint vão para um novo diretório _retomada_
+        columnar_adapter = ColumnarOutputAdapter(
+            base_path=os.path.splitext(csv_out)[0],
+            row_group_size=app_config.GENERAL_CONFIG.COLUMNAR_ROW_GROUP_SIZE,
+            resume_frame=resume_state['frame_id'] + 1 if resume_state else None,
+            resume_parts=resume_state['columnar_state'] if resume_state else None
+        )
+        print(f"Configurando saída colunar: {columnar_adapter.filepath}")
+        resources.columnar_adapter = columnar_adapter
+
     output_buffer = OutputBuffer(
         csv_adapter=csv_adapter,
         video_adapter=video_adapter,
-        batch_size=100
+        max_buffer_bytes=app_config.GENERAL_CONFIG.OUTPUT_BUFFER_MAX_BYTES,
+        columnar_adapter=columnar_adapter
     )
+    if app_config.GENERAL_CONFIG.OUTPUT_WRITER_QUEUE_MAX_BYTES > 0:
+        print("Habilitando thread de escrita assíncrona...")
+        output_buffer = AsyncOutputWriter(
+            output_buffer, max_queue_bytes=app_config.GENERAL_CONFIG.OUTPUT_WRITER_QUEUE_MAX_BYTES
+        )
     resources.output_buffer = output_buffer
-    resize_width = app_config.GENERAL_CONFIG.INFERENCE_RESIZE_WIDTH
-    original_size = (width, height)
-    inference_size = original_size
-    
-    if resize_width > 0 and width > 0:
-        scale = resize_width / width
-        inference_size = (resize_width, int(height * scale))
-        print(f"Redimensionamento para inferência: {original_size} → {inference_size}")
-    
-    frame_preprocessor = FramePreprocessor(
-        original_size=original_size,
-        inference_size=inference_size,
-        image_processing_config=app_config.IMAGE_PROCESSING_CONFIG
-    )
+
+    motion_gate = None
+    if app_config.MOTION_GATE_CONFIG.ENABLE_MOTION_GATE and detection_cache_reader is None:
+        print("Habilitando gate de movimento...")
+        motion_gate = MotionGate(
+            region=app_config.GEOMETRY_CONFIG.REGIAO_1,
+            frame_size=original_size,
+            config=app_config.MOTION_GATE_CONFIG
+        )
+
+    checkpoint_manager = None
+    if app_config.GENERAL_CONFIG.CHECKPOINT_INTERVAL_FRAMES > 0:
+        checkpoint_manager = CheckpointManager(
+            output_dir=os.path.dirname(csv_out),
+            interval_frames=app_config.GENERAL_CONFIG.CHECKPOINT_INTERVAL_FRAMES
+        )
+        print(f"Checkpoint a cada {checkpoint_manager.interval_frames} frames: {checkpoint_manager.path}")
     
     print("\n" + "="*60)
     print("TODOS OS COMPONENTES INICIALIZADOS COM SUCESSO")
@@ -289,11 +529,14 @@ def initialize_components(project_root: str, config_path: str, cli_args=None) ->
         'video_props': props,
         'model': model,
         'trackzone_adapter': trackzone_adapter,
+        'detection_cache_reader': detection_cache_reader,
+        'detection_cache_writer': detection_cache_writer,
         'matriz_h': matriz_h,
         'malha_pixels': malha_pixels,
         'tracking_manager': tracking_manager,
         'track_lifecycle_manager': track_lifecycle_manager,
         'frame_preprocessor': frame_preprocessor,
+        'motion_gate': motion_gate,
         'speed_calc': speed_calc,
         'track_processor': track_processor,
         'track_data_collector': track_data_collector,
@@ -301,30 +544,80 @@ def initialize_components(project_root: str, config_path: str, cli_args=None) ->
         'output_buffer': output_buffer,
         'csv_adapter': csv_adapter,
         'video_adapter': video_adapter,
+        'columnar_adapter': columnar_adapter,
+        'summary_adapter': summary_adapter,
         'video_out': video_out,
         'csv_out': csv_out,
-        'malha_out': malha_out
+        'malha_out': malha_out,
+        'checkpoint_manager': checkpoint_manager
     }
 
 
-def process_frame(frame_id: int, frame, components: dict) -> FrameTrackData:
+def create_video_adapter(video_out: str, fps: float, frame_size: Tuple[int, int], general_config):
+    backend = general_config.VIDEO_WRITER_BACKEND
+    if backend == "ffmpeg":
+        return FFmpegVideoOutputAdapter(
+            filepath=video_out,
+            fps=fps,
+            frame_size=frame_size,
+            codec=general_config.VIDEO_FFMPEG_CODEC,
+            preset=general_config.VIDEO_FFMPEG_PRESET,
+            crf=general_config.VIDEO_FFMPEG_CRF,
+            threads=general_config.VIDEO_FFMPEG_THREADS,
+            output_width=general_config.VIDEO_OUTPUT_WIDTH,
+            decimation=general_config.VIDEO_FRAME_DECIMATION
+        )
+    if backend != "opencv":
+        raise ValueError(f"VIDEO_WRITER_BACKEND inválido: '{backend}'. Use 'opencv' ou 'ffmpeg'.")
+    return VideoOutputAdapter(
+        filepath=video_out,
+        fps=fps,
+        frame_size=frame_size,
+        fourcc=general_config.VIDEO_WRITER_FOURCC
+    )
+
+
+def needs_detection(frame_id: int, config: AppConfig) -> bool:
+    stride = config.GENERAL_CONFIG.DETECTION_STRIDE
+    return stride <= 1 or frame_id % stride == 0
+
+
+def prepare_annotation_frame(frame, components: dict) -> Optional[np.ndarray]:
+    # Sem vídeo anotado e sem janela, a cópia do frame para anotação é dispensada
     config = components['app_config']
-    
-    inference_frame = components['frame_preprocessor'].prepare_for_inference(frame)
-    frame_anotado = components['frame_preprocessor'].prepare_for_annotation(
+    if not (config.GENERAL_CONFIG.ENABLE_ANNOTATED_VIDEO or config.GENERAL_CONFIG.SHOW_VIDEO_WINDOW):
+        return None
+    return components['frame_preprocessor'].prepare_for_annotation(
         frame, show_filters=config.IMAGE_PROCESSING_CONFIG.SHOW_FILTERS_IN_OUTPUT
     )
+
+
+def process_frame(
+    frame_id: int,
+    frame,
+    components: dict,
+    detections: Optional[DetectionBatch] = None
+) -> FrameTrackData:
+    config = components['app_config']
+
+    if not needs_detection(frame_id, config):
+        return process_predicted_frame(frame_id, frame, components)
+    
+    frame_anotado = prepare_annotation_frame(frame, components)
     
-    detections = components['trackzone_adapter'].track(inference_frame.copy())
+    if detections is None:
+        detections = detect_objects(frame_id, frame, components)
     scaled_detections = tracking_helpers.scale_detections(
-        detections, components['frame_preprocessor'].scale_factor
+        detections,
+        components['frame_preprocessor'].scale_factor,
+        components['frame_preprocessor'].offset
     )
     
     current_tracks, histogram_map = tracking_helpers.prepare_tracking_data(
         scaled_detections, frame
     )
     
-    components['tracking_manager'].update_tracks(current_tracks, frame_id)
+    components['tracking_manager'].update_tracks(current_tracks, frame_id, frame)
     
     csv_records, annotation_data = components['track_lifecycle_manager'].process_all_tracks(
         scaled_detections=scaled_detections,
@@ -350,38 +643,237 @@ def process_frame(frame_id: int, frame, components: dict) -> FrameTrackData:
     )
 
 
-def run_processing_loop(components: dict) -> None:
+def detect_objects(frame_id: int, frame, components: dict) -> DetectionBatch:
+    return detect_objects_batch([(frame_id, frame)], components)[0]
+
+
+def detect_objects_batch(frames: List[Tuple[int, np.ndarray]], components: dict) -> List[DetectionBatch]:
+    # Retorna as detecções em coordenadas do frame de inferência, na ordem dos frames
+    if components['detection_cache_reader']:
+        return [components['detection_cache_reader'].read(frame_id) for frame_id, _ in frames]
+
+    results: List[Optional[DetectionBatch]] = [None] * len(frames)
+    motion_gate = components['motion_gate']
+    has_active_tracks = bool(components['tracking_manager'].previous_tracks)
+    pending = []
+    for i, (_, frame) in enumerate(frames):
+        if motion_gate and motion_gate.should_skip(frame, has_active_tracks):
+            # Cena estática e nenhum track ativo: o YOLO não é executado
+            results[i] = DetectionBatch.empty()
+        else:
+            pending.append(i)
+
+    adapter = components['trackzone_adapter']
+    inference_frames = [components['frame_preprocessor'].prepare_for_inference(frames[i][1]) for i in pending]
+    if hasattr(adapter, 'track_batch'):
+        tracked = adapter.track_batch(inference_frames)
+    else:
+        tracked = [adapter.track(inference_frame.copy()) for inference_frame in inference_frames]
+    for i, detections in zip(pending, tracked):
+        results[i] = detections
+
+    if components['detection_cache_writer']:
+        for (frame_id, _), detections in zip(frames, results):
+            components['detection_cache_writer'].record(frame_id, detections)
+    return results
+
+
+def iter_frames_with_detections(components: dict):
+    """
+    Percorre o vídeo em ordem, agrupando os frames de detecção em lotes de
+    DETECTION_BATCH_SIZE. Gera (frame_id, frame, detecções); frames previstos
+    pelo stride recebem None.
+    """
     config = components['app_config']
-    total_frames = components['video_props']['total_frames']
+    batch_size = max(1, config.MODEL_CONFIG.DETECTION_BATCH_SIZE)
+    buffered, pending = [], 0
+
+    for frame_id, frame in components['video_input']:
+        if not pending and not needs_detection(frame_id, config):
+            yield frame_id, frame, None
+            continue
+
+        buffered.append((frame_id, frame))
+        if needs_detection(frame_id, config):
+            pending += 1
+        if pending >= batch_size:
+            yield from _resolve_detections(buffered, components)
+            buffered, pending = [], 0
+
+    if buffered:
+        yield from _resolve_detections(buffered, components)
+
+
+def _resolve_detections(frames: List[Tuple[int, np.ndarray]], components: dict):
+    config = components['app_config']
+    to_detect = [(frame_id, frame) for frame_id, frame in frames if needs_detection(frame_id, config)]
+    detections = dict(zip(
+        (frame_id for frame_id, _ in to_detect),
+        detect_objects_batch(to_detect, components)
+    ))
+    for frame_id, frame in frames:
+        yield frame_id, frame, detections.get(frame_id)
+
+
+def process_predicted_frame(frame_id: int, frame, components: dict) -> FrameTrackData:
+    config = components['app_config']
+
+    frame_anotado = prepare_annotation_frame(frame, components)
+
+    csv_records, annotation_data = components['track_lifecycle_manager'].predict_all_tracks(frame_id)
+
+    if components['frame_annotator']:
+        for data in annotation_data:
+            components['frame_annotator'].desenhar_track(frame_anotado, **data)
+        frame_anotado = components['frame_annotator'].draw_video_timer(
+            frame_anotado, frame_id, components['video_props']['fps']
+        )
+
+    return FrameTrackData(
+        frame_id=frame_id,
+        frame_anotado=frame_anotado,
+        registros_csv=csv_records,
+        fps=components['video_props']['fps']
+    )
+
+
+def run_processing_loop(components: dict, show_progress: bool = True) -> dict:
+    config = components['app_config']
+    start_frame = components['video_props']['start_frame']
+    total_frames = components['video_props']['end_frame'] - start_frame
     fps = components['video_props']['fps']
+    stats = {'processed_frames': 0, 'interrupted': False, 'elapsed_s': 0.0}
+    inicio = time.time()
     
     print("INICIANDO PROCESSAMENTO DE VÍDEO")
     print("=" * 60)
     print(f"Total de frames: {total_frames}")
     print(f"FPS: {fps:.2f}")
+    if config.GENERAL_CONFIG.DETECTION_STRIDE > 1:
+        print(f"Detecção a cada {config.GENERAL_CONFIG.DETECTION_STRIDE} frames (demais previstos pelo Kalman)")
     print("Pressione 'q' para interromper\n")
     
     try:
-        for frame_id, frame in components['video_input']:
-            frame_data = process_frame(frame_id, frame, components)
+        for frame_id, frame, detections in iter_frames_with_detections(components):
+            frame_data = process_frame(frame_id, frame, components, detections)
             components['output_buffer'].add(frame_data)
-            num_unique = components['csv_adapter'].get_unique_track_count() if components['csv_adapter'] else 0
-            print_progress(
-                frame_id, total_frames, fps, num_unique,
-                config.GENERAL_CONFIG.PROGRESS_BAR_LENGTH
-            )
+            stats['processed_frames'] += 1
+            if components['checkpoint_manager']:
+                components['checkpoint_manager'].maybe_save(frame_id, components)
+            if show_progress:
+                num_unique = components['csv_adapter'].get_unique_track_count() if components['csv_adapter'] else 0
+                print_progress(
+                    frame_id - start_frame, total_frames, fps, num_unique,
+                    config.GENERAL_CONFIG.PROGRESS_BAR_LENGTH
+                )
             if config.GENERAL_CONFIG.SHOW_VIDEO_WINDOW:
                 cv2.imshow("Frame Processado", frame_data.frame_anotado)
                 if cv2.waitKey(1) & 0xFF == ord('q'):
                     print("\n\n Processamento interrompido pelo usuário (tecla 'q').")
+                    stats['interrupted'] = True
                     break
         
         print("\n Processamento concluído com sucesso!")
+        if components['detection_cache_writer'] and not stats['interrupted']:
+            components['detection_cache_writer'].mark_complete()
         
     except KeyboardInterrupt:
         print("\n\n Processamento interrompido pelo usuário (Ctrl+C).")
+        stats['interrupted'] = True
         raise
 
+    finally:
+        stats['elapsed_s'] = time.time() - inicio
+        print_decode_stats(components['video_input'].get_stats())
+        if isinstance(components['trackzone_adapter'], CascadeTrackAdapter):
+            stats['cascade'] = components['trackzone_adapter'].get_stats()
+            print_cascade_stats(stats['cascade'])
+        if components['motion_gate']:
+            stats['motion_gate'] = components['motion_gate'].get_stats()
+            print_motion_gate_stats(stats['motion_gate'])
+        if components['track_processor'] and components['app_config'].COLOR_CONFIG.COLOR_STABLE_SAMPLES > 0:
+            stats['color'] = components['track_processor'].get_color_stats()
+            print_color_stats(stats['color'])
+        stats['tracking_memory'] = components['tracking_manager'].get_resident_counts()
+        print_tracking_memory_stats(stats['tracking_memory'])
+        stats['output'] = components['output_buffer'].get_stats()
+        stats['output']['peak_rss_mb'] = peak_rss_mb()
+        print_output_stats(stats['output'])
+
+    if components['csv_adapter']:
+        # Registros ainda na fila/buffer de escrita entram na contagem
+        components['output_buffer'].flush()
+        stats['unique_tracks'] = components['csv_adapter'].get_unique_track_count()
+    return stats
+
+
+def print_decode_stats(stats: dict) -> None:
+    print("\nEstatísticas de decodificação:")
+    print(f"  Frames decodificados: {stats['decoded_frames']}")
+    print(f"  Decodificação: {stats['decode_time_s']:.1f}s ({stats['decode_ms_per_frame']:.2f} ms/frame)")
+    if stats['prefetch_size'] > 0:
+        print(f"  Espera pelo decoder: {stats['consumer_wait_s']:.1f}s")
+        print(
+            f"  Ocupação da fila: média {stats['queue_occupancy_avg']:.1f} / "
+            f"máx {stats['queue_occupancy_max']} de {stats['prefetch_size']}"
+        )
+
+
+def print_cascade_stats(stats: dict) -> None:
+    print("\nCascata de detectores:")
+    print(
+        f"  Frames com modelo pesado: {stats['heavy_frames']} de {stats['total_frames']} "
+        f"({stats['heavy_ratio']:.1%})"
+    )
+    motivos = stats['heavy_reasons']
+    print(
+        f"  Motivos: periódico {motivos['periodic']}, baixa confiança {motivos['low_conf']}, "
+        f"objeto novo {motivos['new_object']}"
+    )
+
+
+def print_motion_gate_stats(stats: dict) -> None:
+    print("\nGate de movimento:")
+    print(
+        f"  Frames sem inferência: {stats['skipped_frames']} de {stats['evaluated_frames']} "
+        f"({stats['skipped_ratio']:.1%})"
+    )
+
+
+def print_color_stats(stats: dict) -> None:
+    print("\nCor dominante:")
+    print(f"  Extrações realizadas: {stats['color_computations']}")
+    print(
+        f"  Extrações evitadas (cor estável): {stats['color_skipped_frozen']} "
+        f"({stats['skipped_ratio']:.1%})"
+    )
+    print(f"  Tracks com cor congelada: {stats['frozen_tracks']}")
+
+
+def print_tracking_memory_stats(stats: dict) -> None:
+    print("\nEstado residente do tracking manager:")
+    print(
+        f"  Mapa de identidades: {stats['id_map']} | Classes: {stats['track_class_map']} | "
+        f"Histogramas: {stats['track_histogram_map']} | Tracks perdidos: {stats['lost_tracks']}"
+    )
+
+
+def print_output_stats(stats: dict) -> None:
+    print("\nSaída e memória:")
+    print(
+        f"  Pico do buffer de registros: {stats['peak_buffered_bytes'] / 1024:.0f} KB "
+        f"(limite {stats['max_buffer_bytes'] / 1024:.0f} KB)"
+    )
+    if 'queue_max_bytes' in stats:
+        print(
+            f"  Escrita assíncrona: {stats['write_time_s']:.1f}s na thread de escrita, "
+            f"espera do loop principal {stats['producer_wait_s']:.1f}s "
+            f"(fila máx {stats['queue_peak_bytes'] / 1024 / 1024:.1f} MB "
+            f"de {stats['queue_max_bytes'] / 1024 / 1024:.1f} MB)"
+        )
+    if stats['peak_rss_mb'] is not None:
+        print(f"  Pico de memória residente (RSS): {stats['peak_rss_mb']:.0f} MB")
+
 
 def main():
     components = None
@@ -397,11 +889,32 @@ def main():
         if not os.path.isabs(config_path):
             config_path = os.path.join(PROJECT_ROOT, config_path)
 
+        if args.segments > 1:
+            from src.tools.segment_runner import run_segmented_analysis
+            run_segmented_analysis(
+                project_root=PROJECT_ROOT,
+                config_path=config_path,
+                cli_args=args,
+                num_segments=args.segments,
+                overlap_frames=args.segment_overlap
+            )
+            return
+
+        resume_state, resume_dir = None, None
+        if args.resume:
+            resume_dir = args.resume if os.path.isabs(args.resume) else os.path.join(PROJECT_ROOT, args.resume)
+            resume_state = CheckpointManager.load(resume_dir)
+            print(f"Retomando a partir do checkpoint do frame {resume_state['frame_id']}")
+
         components = initialize_components(
             project_root=PROJECT_ROOT,
             config_path=config_path, 
-            cli_args=args
+            cli_args=args,
+            output_dir=resume_dir,
+            resume_state=resume_state
         )
+        if resume_state:
+            CheckpointManager.restore(components, resume_state)
 
         run_processing_loop(components)
         
@@ -417,14 +930,18 @@ def main():
         
     finally:
         if components:
-            print("\n🧹 Liberando recursos...")
+            release_components(components)
+
+
+def release_components(components: dict) -> None:
+    print("\n🧹 Liberando recursos...")
+
+    if components['track_lifecycle_manager']:
+        components['track_lifecycle_manager'].cleanup_all_tracking()
 
-            if components['track_lifecycle_manager']:
-                components['track_lifecycle_manager'].cleanup_all_tracking()
+    components['resources'].cleanup(components.get('app_config'))
 
-            components['resources'].cleanup(components.get('app_config'))
-            
-            print("Recursos liberados com sucesso")
+    print("Recursos liberados com sucesso")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,244 @@
+"""
+VisionTools - Processamento em Lote
+Executa o analisador de vídeo, sem interação, sobre uma lista de vídeos
+distribuída num pool de processos.
+"""
+
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import time
+import traceback
+from argparse import Namespace
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import List, Optional
+
+from src.setup.components import configure_worker_threads, load_detection_model
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+MANIFEST_FILENAME = "manifest.json"
+
+# Modelos carregados neste processo worker, por pesos, backend e tamanho de entrada
+_MODEL_CACHE = {}
+
+
+def parse_cli_arguments():
+    parser = argparse.ArgumentParser(
+        description="VisionTools - Processamento em lote de vídeos",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Exemplos de uso:
+  # Todos os vídeos de um diretório, 4 jobs simultâneos
+  python -m src.tools.batch_runner "input/videos/*.mp4" --workers 4
+
+  # Lista de jobs com config própria por vídeo
+  python -m src.tools.batch_runner --jobs-file jobs.json
+
+Formato do jobs-file:
+  [{"video": "input/videos/cam01.mp4", "config": "configs/cam01.json"},
+   {"video": "input/videos/cam02.mp4"}]
+        """
+    )
+    parser.add_argument(
+        'videos',
+        nargs='*',
+        help='Caminhos ou padrões glob de vídeos a processar'
+    )
+    parser.add_argument(
+        '--jobs-file',
+        type=str,
+        default=None,
+        help='Arquivo JSON com a lista de jobs ({"video": ..., "config": ...})'
+    )
+    parser.add_argument(
+        '--config',
+        type=str,
+        default='config.json',
+        help='Configuração padrão para jobs sem config própria (padrão: config.json)'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=max(1, (os.cpu_count() or 1) // 4),
+        help='Número máximo de vídeos processados simultaneamente'
+    )
+    parser.add_argument(
+        '--output-dir',
+        type=str,
+        default=None,
+        help='Diretório do lote (padrão: output/lote_<timestamp>)'
+    )
+    parser.add_argument(
+        '--only-csv',
+        action='store_true',
+        help='Gerar apenas CSV (desabilita vídeo anotado)'
+    )
+    return parser.parse_args()
+
+
+def _resolver_caminho(caminho: str) -> str:
+    return caminho if os.path.isabs(caminho) else os.path.join(PROJECT_ROOT, caminho)
+
+
+def build_jobs(videos: List[str], jobs_file: Optional[str], default_config: str) -> List[dict]:
+    jobs = []
+
+    if jobs_file:
+        with open(_resolver_caminho(jobs_file), 'r') as f:
+            for entrada in json.load(f):
+                if 'video' not in entrada:
+                    raise ValueError(f"Job sem campo 'video' em {jobs_file}: {entrada}")
+                jobs.append({
+                    'video': _resolver_caminho(entrada['video']),
+                    'config': _resolver_caminho(entrada.get('config', default_config))
+                })
+
+    for padrao in videos:
+        encontrados = sorted(glob.glob(_resolver_caminho(padrao)))
+        if not encontrados:
+            print(f"⚠️ Aviso: nenhum vídeo encontrado para '{padrao}'")
+        for video in encontrados:
+            jobs.append({'video': video, 'config': _resolver_caminho(default_config)})
+
+    for i, job in enumerate(jobs):
+        nome = os.path.splitext(os.path.basename(job['video']))[0]
+        job.update({'id': i, 'name': f"{i:04d}_{nome}", 'status': 'pendente'})
+    return jobs
+
+
+def _obter_modelo(model_config, weights: Optional[str] = None):
+    # weights: pesos alternativos (ex.: modelo leve da cascata); padrão MODELO_YOLO
+    chave = (weights or model_config.MODELO_YOLO, model_config.INFERENCE_BACKEND, model_config.INFERENCE_IMGSZ)
+    if chave not in _MODEL_CACHE:
+        print(f"[worker {os.getpid()}] Carregando pesos: {chave[0]} ({chave[1]})")
+        _MODEL_CACHE[chave] = load_detection_model(model_config, weights)
+    return _MODEL_CACHE[chave]
+
+
+def _executar_job(job: dict, output_dir: str, only_csv: bool) -> dict:
+    from src.tools.analisador_de_video import (
+        initialize_components, run_processing_loop, release_components
+    )
+
+    resultado = {**job, 'output_dir': output_dir, 'pid': os.getpid()}
+    cli_args = Namespace(
+        only_csv=only_csv, only_video=False, no_csv=False, no_video=False,
+        show=False, no_show=True
+    )
+
+    inicio = time.time()
+    components = None
+    try:
+        components = initialize_components(
+            project_root=PROJECT_ROOT,
+            config_path=job['config'],
+            cli_args=cli_args,
+            output_dir=output_dir,
+            video_path=job['video'],
+            model_provider=_obter_modelo
+        )
+        stats = run_processing_loop(components, show_progress=False)
+        release_components(components)
+        components = None
+
+        resultado.update({
+            'status': 'interrompido' if stats['interrupted'] else 'ok',
+            'processed_frames': stats['processed_frames'],
+            'unique_tracks': stats.get('unique_tracks'),
+        })
+    except Exception as e:
+        resultado.update({
+            'status': 'erro',
+            'error': f"{type(e).__name__}: {e}",
+            'traceback': traceback.format_exc()
+        })
+    finally:
+        if components:
+            release_components(components)
+        resultado['elapsed_s'] = round(time.time() - inicio, 2)
+
+    return resultado
+
+
+def write_manifest(path: str, manifest: dict) -> None:
+    # Escrita atômica: o manifesto nunca fica truncado se o lote for interrompido
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def run_batch(jobs: List[dict], batch_dir: str, workers: int, only_csv: bool = False) -> dict:
+    os.makedirs(batch_dir, exist_ok=True)
+    manifest_path = os.path.join(batch_dir, MANIFEST_FILENAME)
+    manifest = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'workers': workers,
+        'jobs': jobs
+    }
+    write_manifest(manifest_path, manifest)
+
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    contexto = multiprocessing.get_context('spawn')
+    inicio = time.time()
+
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=contexto,
+        initializer=configure_worker_threads, initargs=(threads,)
+    ) as pool:
+        futures = {
+            pool.submit(_executar_job, job, os.path.join(batch_dir, job['name']), only_csv): job['id']
+            for job in jobs
+        }
+        for future in as_completed(futures):
+            job_id = futures[future]
+            try:
+                resultado = future.result()
+            except Exception as e:
+                # Falha do próprio worker (ex.: processo encerrado)
+                resultado = {**jobs[job_id], 'status': 'erro', 'error': f"{type(e).__name__}: {e}"}
+
+            jobs[job_id] = resultado
+            write_manifest(manifest_path, manifest)
+            print(f"[{resultado['status'].upper()}] {resultado['name']} ({resultado.get('elapsed_s', 0)}s)")
+
+    manifest['finished_at'] = datetime.now().isoformat(timespec='seconds')
+    manifest['elapsed_s'] = round(time.time() - inicio, 2)
+    manifest['summary'] = {
+        status: sum(1 for job in jobs if job['status'] == status)
+        for status in ('ok', 'interrompido', 'erro')
+    }
+    write_manifest(manifest_path, manifest)
+    return manifest
+
+
+def main():
+    args = parse_cli_arguments()
+    jobs = build_jobs(args.videos, args.jobs_file, args.config)
+    if not jobs:
+        print("Nenhum vídeo para processar.")
+        return
+
+    batch_dir = args.output_dir or os.path.join(
+        PROJECT_ROOT, "output", f"lote_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}"
+    )
+    workers = max(1, min(args.workers, len(jobs)))
+
+    print("\n" + "="*60)
+    print(f"PROCESSAMENTO EM LOTE: {len(jobs)} vídeos, {workers} workers")
+    print(f"Diretório do lote: {batch_dir}")
+    print("="*60 + "\n")
+
+    manifest = run_batch(jobs, _resolver_caminho(batch_dir), workers, only_csv=args.only_csv)
+
+    resumo = manifest['summary']
+    print(f"\nLote concluído em {manifest['elapsed_s']:.1f}s: "
+          f"{resumo['ok']} ok, {resumo['interrompido']} interrompidos, {resumo['erro']} com erro")
+    print(f"Manifesto: {os.path.join(batch_dir, MANIFEST_FILENAME)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+import multiprocessing
+import os
+import time
+from argparse import Namespace
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import numpy as np
+
+from src.adapters.input.video_input_adapter import VideoInputAdapter
+from src.pipelines.segment_stitcher import SegmentStitcher
+from src.setup.components import configure_worker_threads
+from src.setup.config_loader import ConfigLoader
+from src.setup.paths import PathManager
+
+# Cada segmento recebe uma faixa própria de IDs de track
+SEGMENT_TRACK_ID_OFFSET = 1_000_000
+DEFAULT_OVERLAP_SECONDS = 2.0
+
+
+def split_frame_ranges(total_frames: int, num_segments: int, overlap_frames: int) -> list[dict]:
+    if total_frames <= 0:
+        raise ValueError("Número total de frames desconhecido; não é possível segmentar o vídeo.")
+
+    num_segments = max(1, min(num_segments, total_frames))
+    limites = np.linspace(0, total_frames, num_segments + 1).astype(int)
+
+    segmentos = []
+    for i in range(num_segments):
+        nominal_start, end_frame = int(limites[i]), int(limites[i + 1])
+        start_frame = max(0, nominal_start - overlap_frames) if i > 0 else 0
+        segmentos.append({
+            'index': i,
+            'start_frame': start_frame,
+            'nominal_start': nominal_start,
+            'end_frame': end_frame
+        })
+    return segmentos
+
+
+def _processar_segmento(tarefa: dict) -> dict:
+    from src.tools.analisador_de_video import (
+        initialize_components, run_processing_loop, release_components
+    )
+
+    configure_worker_threads(tarefa['threads'])
+    components = None
+    try:
+        components = initialize_components(
+            project_root=tarefa['project_root'],
+            config_path=tarefa['config_path'],
+            cli_args=Namespace(**tarefa['cli_args']),
+            output_dir=tarefa['output_dir'],
+            frame_range=(tarefa['start_frame'], tarefa['end_frame'])
+        )
+        if components['trackzone_adapter']:
+            components['trackzone_adapter'].track_id_offset = tarefa['index'] * SEGMENT_TRACK_ID_OFFSET
+        stats = run_processing_loop(components, show_progress=False)
+        csv_path = components['csv_out']
+    finally:
+        if components:
+            release_components(components)
+
+    return {**tarefa, 'csv_path': csv_path, 'stats': stats}
+
+
+def _segment_cli_args(cli_args) -> dict:
+    args = dict(vars(cli_args)) if cli_args is not None else {}
+    # Segmentos geram apenas CSV, sem janela; o vídeo anotado, a saída colunar e o
+    # resumo por veículo não são unificados pelo SegmentStitcher
+    args.update({
+        'only_csv': True, 'only_video': False,
+        'no_csv': False, 'no_video': True,
+        'no_columnar': True, 'no_vehicle_summary': True,
+        'show': False, 'no_show': True
+    })
+    return args
+
+
+def run_segmented_analysis(
+    project_root: str,
+    config_path: str,
+    cli_args=None,
+    num_segments: int = 2,
+    overlap_frames: Optional[int] = None
+) -> dict:
+    app_config = ConfigLoader(config_path=config_path).get_config()
+
+    video_path = os.path.join(project_root, app_config.IO_CONFIG.VIDEO_INPUT)
+    video_input = VideoInputAdapter(video_path)
+    props = video_input.get_properties()
+    video_input.close()
+
+    if overlap_frames is None:
+        overlap_frames = int(round(props['fps'] * DEFAULT_OVERLAP_SECONDS))
+
+    _, csv_out, _ = PathManager(project_root, app_config.IO_CONFIG).setup_paths()
+    output_dir = os.path.dirname(csv_out)
+
+    segmentos = split_frame_ranges(props['total_frames'], num_segments, overlap_frames)
+    threads = max(1, (os.cpu_count() or 1) // len(segmentos))
+    args = _segment_cli_args(cli_args)
+
+    tarefas = [
+        {
+            **segmento,
+            'project_root': project_root,
+            'config_path': config_path,
+            'cli_args': args,
+            'output_dir': os.path.join(output_dir, 'segmentos', f"segmento_{segmento['index']:02d}"),
+            'threads': threads
+        }
+        for segmento in segmentos
+    ]
+
+    print("\n" + "="*60)
+    print(f"PROCESSAMENTO SEGMENTADO: {len(tarefas)} segmentos, sobreposição de {overlap_frames} frames")
+    print("="*60)
+    for tarefa in tarefas:
+        print(f"  Segmento {tarefa['index']:02d}: frames [{tarefa['start_frame']}, {tarefa['end_frame']})")
+    print("  Vídeo anotado, saída colunar e resumo por veículo desabilitados no modo segmentado\n")
+
+    inicio = time.time()
+    # spawn: cada worker carrega seu próprio modelo sem herdar estado do torch
+    contexto = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=len(tarefas), mp_context=contexto) as pool:
+        resultados = list(pool.map(_processar_segmento, tarefas))
+
+    print("\nUnindo resultados dos segmentos...")
+    stitcher = SegmentStitcher(iou_threshold=app_config.TRACKING_CONFIG.IOU_THRESHOLD)
+    merged, stitched = stitcher.stitch(sorted(resultados, key=lambda r: r['index']))
+    merged.to_csv(csv_out, index=False)
+
+    resumo = {
+        'csv_path': csv_out,
+        'segments': len(resultados),
+        'stitched_tracks': stitched,
+        'rows': len(merged),
+        'unique_tracks': int(merged['track_id'].nunique()) if not merged.empty else 0,
+        'elapsed_s': time.time() - inicio
+    }
+    print(f"📄 CSV unificado salvo: {csv_out}")
+    print(
+        f"  {resumo['rows']} registros, {resumo['unique_tracks']} objetos, "
+        f"{stitched} tracks costurados entre segmentos, {resumo['elapsed_s']:.1f}s"
+    )
+    return resumo
@@ -1,5 +1,7 @@
 import os
+import hashlib
 from datetime import datetime
+from typing import Optional
 
 def verificar_e_criar_diretorios_input(project_root: str, base_dir_name="input", subdirs=["videos", "models"]):
 
@@ -30,3 +32,25 @@ def criar_diretorio_de_saida(project_root: str, base_dir_name="output"):
     os.makedirs(output_dir, exist_ok=True)
     print(f"\nDiretório de saída criado em: {output_dir}")
     return output_dir
+
+def calcular_hash_arquivo(caminho: str, amostra_bytes: Optional[int] = None) -> str:
+    """
+    Calcula o SHA-256 de um arquivo.
+
+    Com amostra_bytes, arquivos maiores que 2x a amostra são identificados apenas
+    pelo tamanho e pelos blocos inicial e final (impressão digital rápida para
+    vídeos de vários GB).
+    """
+    tamanho = os.path.getsize(caminho)
+    sha = hashlib.sha256(str(tamanho).encode())
+
+    with open(caminho, 'rb') as f:
+        if amostra_bytes and tamanho > 2 * amostra_bytes:
+            sha.update(f.read(amostra_bytes))
+            f.seek(-amostra_bytes, os.SEEK_END)
+            sha.update(f.read(amostra_bytes))
+        else:
+            for bloco in iter(lambda: f.read(1 << 20), b''):
+                sha.update(bloco)
+
+    return sha.hexdigest()
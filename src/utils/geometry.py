@@ -1,39 +1,21 @@
 import cv2
 import numpy as np
 
-def check_bbox_in_masks(bbox, masks):
-
-    x1, y1, x2, y2 = map(float, bbox)
-    
-    center_x = (x1 + x2) / 2
-    center_y = (y1 + y2) / 2
-    center = (center_x, center_y)
-
-    for mask_name, mask_coords in masks.items():
-        mask_np = np.array(mask_coords, np.int32)
-        mask_np = mask_np.reshape((-1, 1, 2))
-        if cv2.pointPolygonTest(mask_np, center, False) > 0:
-            return mask_name
-    return None
-
-def calcular_iou(box_a, box_b) -> float:
-
-    x1 = max(box_a[0], box_b[0])
-    y1 = max(box_a[1], box_b[1])
-    x2 = min(box_a[2], box_b[2])
-    y2 = min(box_a[3], box_b[3])
-
-    intersection_area = max(0, x2 - x1) * max(0, y2 - y1)
-
-    box_a_area = (box_a[2] - box_a[0]) * (box_a[3] - box_a[1])
-    box_b_area = (box_b[2] - box_b[0]) * (box_b[3] - box_b[1])
-
-    union_area = box_a_area + box_b_area - intersection_area
-
-    if union_area == 0:
-        return 0.0
-
-    return intersection_area / union_area
+def calcular_iou_matriz(boxes_a: np.ndarray, boxes_b: np.ndarray) -> np.ndarray:
+    """IoU entre todas as caixas (N, 4) x (M, 4) no formato xyxy, por broadcasting."""
+    boxes_a = np.asarray(boxes_a, dtype=np.float32).reshape(-1, 4)
+    boxes_b = np.asarray(boxes_b, dtype=np.float32).reshape(-1, 4)
+
+    x1 = np.maximum(boxes_a[:, None, 0], boxes_b[None, :, 0])
+    y1 = np.maximum(boxes_a[:, None, 1], boxes_b[None, :, 1])
+    x2 = np.minimum(boxes_a[:, None, 2], boxes_b[None, :, 2])
+    y2 = np.minimum(boxes_a[:, None, 3], boxes_b[None, :, 3])
+    intersection = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+
+    area_a = (boxes_a[:, 2] - boxes_a[:, 0]) * (boxes_a[:, 3] - boxes_a[:, 1])
+    area_b = (boxes_b[:, 2] - boxes_b[:, 0]) * (boxes_b[:, 3] - boxes_b[:, 1])
+    union = area_a[:, None] + area_b[None, :] - intersection
+    return np.where(union > 0, intersection / np.maximum(union, 1e-9), 0.0)
 
 def scale_bounding_box(box: np.ndarray, scale_factor: float) -> np.ndarray:
 
@@ -43,4 +25,12 @@ def scale_bounding_box(box: np.ndarray, scale_factor: float) -> np.ndarray:
     scaled = box.copy()
     scaled[[0, 2]] /= scale_factor
     scaled[[1, 3]] /= scale_factor
-    return scaled
\ No newline at end of file
+    return scaled
+
+def calcular_retangulo_recorte(region, frame_size, margin: int) -> tuple[int, int, int, int]:
+    """Retângulo (x, y, w, h) que envolve o polígono com margem, limitado ao frame."""
+    width, height = frame_size
+    x, y, w, h = cv2.boundingRect(np.array(region, dtype=np.int32))
+    x1, y1 = max(0, x - margin), max(0, y - margin)
+    x2, y2 = min(width, x + w + margin), min(height, y + h + margin)
+    return x1, y1, x2 - x1, y2 - y1